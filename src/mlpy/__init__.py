@@ -0,0 +1,4 @@
+'''
+Shared helpers for the ML-py scripts (dataset cache, ...).
+Add the "src" folder to PYTHONPATH to import it from the scripts.
+'''
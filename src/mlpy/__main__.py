@@ -0,0 +1,36 @@
+import sys
+import argparse
+from mlpy import runner
+
+'''
+python -m mlpy run [pattern] [-j JOBS] [-o REPORT] [--timeout SECONDS] [--no-bench] [--trace FILE]
+python -m mlpy trace <script> (with MLPY_TRACE=<file.jsonl>)
+'''
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy")
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  run_parser = commands.add_parser("run", help="execute the scripts in parallel and write a JSON report")
+  run_parser.add_argument("pattern", nargs="?", default="*", help="glob on the path relative to src, e.g. '*/multiclass/*'")
+  run_parser.add_argument("-j", "--jobs", type=int, default=None, help="max num of processes (default: num of CPUs)")
+  run_parser.add_argument("-o", "--output", default=None, help="JSON report file (default: stdout)")
+  run_parser.add_argument("--timeout", type=float, default=None, help="seconds before a script is killed")
+  run_parser.add_argument("--no-bench", dest="bench", action="store_false", help="run also EDA and plots (MLPY_BENCH unset)")
+  run_parser.add_argument("--trace", default=None, help="JSON lines file of the stages of all the scripts (MLPY_TRACE)")
+
+  trace_parser = commands.add_parser("trace", help="execute a script recording the sklearn stages in MLPY_TRACE")
+  trace_parser.add_argument("script", help="path of the script")
+  trace_parser.add_argument("arguments", nargs=argparse.REMAINDER)
+
+  args = parser.parse_args(argv)
+  if args.command == "run":
+    report = runner.run(args.pattern, jobs=args.jobs, bench=args.bench, timeout=args.timeout, trace=args.trace)
+    runner.write_report(report, args.output)
+    return 1 if report["failed"] else 0
+  if args.command == "trace":
+    from mlpy import instrument
+    instrument.run_script(args.script, args.arguments)
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,33 @@
+import os
+import importlib
+
+'''
+Headless "bench" mode (MLPY_BENCH=1).
+The scripts skip the exploratory analysis (if not BENCH: ...) and import seaborn/matplotlib
+with sns/plt of this module: they are imported only at the first use, and in bench mode
+they are never imported and every plotting function does nothing.
+Then in bench mode a script only runs load, preprocess, fit, predict and score.
+'''
+
+BENCH = os.environ.get("MLPY_BENCH", "0") not in ("", "0")
+
+def _no_op(*args, **kwargs):
+  return None
+
+class LazyModule:
+  '''
+  Module imported at the first access of one of its attributes.
+  '''
+  def __init__(self, name):
+    self._name = name
+    self._module = None
+
+  def __getattr__(self, attribute):
+    if BENCH:
+      return _no_op
+    if self._module is None:
+      self._module = importlib.import_module(self._name)
+    return getattr(self._module, attribute)
+
+sns = LazyModule("seaborn")
+plt = LazyModule("matplotlib.pyplot")
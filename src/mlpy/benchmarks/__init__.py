@@ -0,0 +1,3 @@
+'''
+Benchmarks of the estimators used by the scripts, run them with python -m mlpy.benchmarks.<name>.
+'''
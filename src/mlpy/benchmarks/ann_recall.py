@@ -0,0 +1,118 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from sklearn.datasets import load_digits, load_breast_cancer
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score
+from mlpy.neighbors import kneighbors_sweep, BlockedNearestNeighbors, IVFNearestNeighbors, QuantizedNearestNeighbors
+
+'''
+Recall/latency benchmark of the approximate K-NN indexes (mlpy.neighbors.ivf, mlpy.neighbors.quantized)
+against the exact blocked search. For every dataset and every setting of the index (n_probe, PQ, dtype, rerank) the record has
+- recall: fraction of the exact K nearest neighbors found by the approximate search
+- query_latency: seconds per query
+- index_bytes: memory of the arrays of the index (without the training points only referenced for rerank)
+- accuracy/exact_accuracy: test accuracy of the K-NN classifier with the approximate/exact neighbors
+The datasets are the ones of the K-NN scripts (same split and scaling), and optionally a synthetic one (--synthetic N)
+where the exact search starts to be expensive.
+
+python -m mlpy.benchmarks.ann_recall -o ann_recall.jsonl --synthetic 200000
+'''
+
+def load_dataset(name, random_state=0):
+  if name == "digits":
+    X, Y = load_digits(return_X_y=True)
+    scaler = MinMaxScaler()
+  elif name == "breast_cancer":
+    X, Y = load_breast_cancer(return_X_y=True)
+    scaler = StandardScaler()
+  else: #synthetic:N, gaussian clusters in 64 features
+    num_points = int(float(name.split(":")[1]))
+    random_generator = np.random.default_rng(random_state)
+    centers = random_generator.standard_normal((10, 64)) * 3
+    Y = random_generator.integers(0, 10, num_points)
+    X = centers[Y] + random_generator.standard_normal((num_points, 64))
+    scaler = StandardScaler()
+  X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.1, random_state=random_state)
+  scaler.fit(X_train)
+  return scaler.transform(X_train), scaler.transform(X_test), Y_train, Y_test
+
+def settings(num_features):
+  '''
+  (name, class, parameters) of the index tried for every dataset
+  '''
+  pq_subvectors = next(m for m in (8, 4, 2, 1) if num_features % m == 0)
+  for n_probe in (1, 2, 4, 8, 16):
+    yield "ivf", IVFNearestNeighbors, {"n_probe": n_probe}
+  for n_probe in (4, 16):
+    yield "ivf_pq", IVFNearestNeighbors, {"n_probe": n_probe, "pq_subvectors": pq_subvectors, "rerank": False}
+    yield "ivf_pq_rerank", IVFNearestNeighbors, {"n_probe": n_probe, "pq_subvectors": pq_subvectors, "rerank": True}
+  for dtype in ("uint8", "int8", "float16"):
+    yield "quantized", QuantizedNearestNeighbors, {"dtype": dtype, "rerank": False}
+    yield "quantized_rerank", QuantizedNearestNeighbors, {"dtype": dtype, "rerank": True}
+
+def index_bytes(neighbors, X_train=None):
+  #the arrays that share memory with X_train are the training points only referenced by the index
+  arrays = [value for key, value in vars(neighbors).items() if key.endswith("_") and isinstance(value, np.ndarray)]
+  return int(sum(array.nbytes for array in arrays if X_train is None or not np.shares_memory(array, X_train)))
+
+def _timed_kneighbors(neighbors, X, n_neighbors):
+  start = time.perf_counter()
+  indexes = neighbors.kneighbors(X, n_neighbors, return_distance=False)
+  return indexes, time.perf_counter() - start
+
+def recall(approximate_indexes, exact_indexes):
+  found = [len(np.intersect1d(approximate, exact)) for approximate, exact in zip(approximate_indexes, exact_indexes)]
+  return float(np.sum(found)) / exact_indexes.size
+
+def run(datasets, n_neighbors, output):
+  '''
+  Measure every setting on every dataset, write the records as JSON lines in output.
+  '''
+  for dataset in datasets:
+    X_train, X_test, Y_train, Y_test = load_dataset(dataset)
+    exact = BlockedNearestNeighbors().fit(X_train)
+    exact_indexes, exact_time = _timed_kneighbors(exact, X_test, n_neighbors)
+    exact_accuracy = accuracy_score(Y_test, kneighbors_sweep(X_train, Y_train, X_test, [n_neighbors], neighbors=exact)[n_neighbors])
+    for name, model, parameters in settings(X_train.shape[1]):
+      start = time.perf_counter()
+      approximate = model(**parameters).fit(X_train)
+      fit_time = time.perf_counter() - start
+      indexes, query_time = _timed_kneighbors(approximate, X_test, n_neighbors)
+      accuracy = accuracy_score(Y_test, kneighbors_sweep(X_train, Y_train, X_test, [n_neighbors], neighbors=approximate)[n_neighbors])
+      record = {
+        "dataset": dataset, "n_train": len(X_train), "n_queries": len(X_test), "n_neighbors": n_neighbors,
+        "index": name, "parameters": parameters, "fit_time": fit_time,
+        "index_bytes": index_bytes(approximate, X_train), "exact_index_bytes": index_bytes(exact),
+        "recall": recall(indexes, exact_indexes), "query_latency": query_time / len(X_test),
+        "exact_query_latency": exact_time / len(X_test), "accuracy": accuracy, "exact_accuracy": exact_accuracy
+      }
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.ann_recall")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--datasets", default="digits,breast_cancer", help="comma separated: digits, breast_cancer")
+  parser.add_argument("--synthetic", type=float, default=None, help="num of points of an additional synthetic dataset")
+  parser.add_argument("-k", "--n-neighbors", type=int, default=10)
+  args = parser.parse_args(argv)
+
+  datasets = args.datasets.split(",")
+  unknown = [name for name in datasets if name not in ("digits", "breast_cancer")]
+  if unknown:
+    parser.error("unknown datasets: %s" % ", ".join(unknown))
+  if args.synthetic:
+    datasets.append("synthetic:%d" % args.synthetic)
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(datasets, args.n_neighbors, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.bitpacked import pack_bits, BitPackedBernoulliNB
+
+'''
+Benchmark of BernoulliNB on bit-packed documents (mlpy.bitpacked) against the CSR path of bernoulli-nb.py.
+The IMDB reviews (or synthetic texts when the CSV is missing) are vectorized by CountVectorizer(binary=True)
+with every max_features, then BernoulliNB is fitted and scored on the CSR matrices and on their bitsets.
+Every record has the bytes of the train matrix, fit and predict time, documents per second of predict, accuracy,
+and for the bitsets the agreement with the predictions of CSR.
+The bitsets win when the documents set more than ~1/96 of the features (smaller vocabularies),
+CSR wins on the full vocabulary of long texts.
+
+python -m mlpy.benchmarks.bitpacked_nb --max-features 1000,10000,0
+'''
+
+def load_texts(path, num_texts, random_state=0):
+  if path and os.path.exists(path):
+    reviews = pd.read_csv(path, nrows=num_texts)
+    return list(reviews["review"]), reviews["sentiment"].to_numpy()
+  random_generator = np.random.default_rng(random_state)
+  vocabulary = np.array(["w%d" % i for i in range(50000)])
+  targets = random_generator.integers(0, 2, num_texts)
+  texts = [" ".join(vocabulary[(random_generator.zipf(1.3, 200) + 1000 * target) % len(vocabulary)]) for target in targets]
+  return texts, targets
+
+def csr_bytes(X):
+  return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+def timed(function, *args):
+  start = time.perf_counter()
+  result = function(*args)
+  return result, time.perf_counter() - start
+
+def run(path, num_texts, max_features_list, n_bits, output):
+  texts, targets = load_texts(path, num_texts)
+  texts_train, texts_test, Y_train, Y_test = train_test_split(texts, targets, test_size=0.3, random_state=42)
+  for max_features in max_features_list:
+    vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True, max_features=max_features or None)
+    X_train = vectorizer.fit_transform(texts_train)
+    X_test = vectorizer.transform(texts_test)
+    base = {"max_features": max_features, "n_features": X_train.shape[1], "train_documents": X_train.shape[0],
+      "density": X_train.nnz / np.prod(X_train.shape)}
+
+    bernoulli, fit_time = timed(BernoulliNB().fit, X_train, Y_train)
+    Y_predicted, predict_time = timed(bernoulli.predict, X_test)
+    records = [dict(base, format="csr", train_bytes=csr_bytes(X_train), pack_time=0.0, fit_time=fit_time, predict_time=predict_time,
+      accuracy=float(np.mean(Y_predicted == Y_test)))]
+
+    (bits_train, pack_train_time), (bits_test, pack_test_time) = timed(pack_bits, X_train), timed(pack_bits, X_test)
+    packed, fit_time = timed(BitPackedBernoulliNB(n_bits=n_bits).fit, bits_train, Y_train)
+    Y_packed, predict_time = timed(packed.predict, bits_test)
+    records.append(dict(base, format="bits", n_bits=n_bits, train_bytes=bits_train.nbytes, pack_time=pack_train_time + pack_test_time,
+      fit_time=fit_time, predict_time=predict_time, accuracy=float(np.mean(Y_packed == Y_test)),
+      agreement=float(np.mean(Y_packed == Y_predicted))))
+
+    for record in records:
+      record["documents_per_second"] = len(texts_test) / record["predict_time"]
+      output.write(json.dumps(record) + "\n")
+    output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.bitpacked_nb")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--data", default="data/movie_review_imdb.csv", help="CSV with the reviews (synthetic texts if missing)")
+  parser.add_argument("--texts", type=int, default=50000, help="num of texts")
+  parser.add_argument("--max-features", default="1000,10000,0", help="comma separated max_features of CountVectorizer (0 = all)")
+  parser.add_argument("--n-bits", type=int, default=16, help="bits of the quantized weights")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.data, args.texts, [int(value) for value in args.max_features.split(",")], args.n_bits, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,77 @@
+import sys
+import json
+import time
+import argparse
+from sklearn.datasets import load_digits, make_classification
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.ensemble import EarlyStoppingForest
+
+'''
+Benchmark of the early stopped forest (mlpy.ensemble) against RandomForestClassifier with a fixed n_estimators.
+For every dataset: a record for every batch of the OOB curve of EarlyStoppingForest ("curve"),
+then one record for each forest ("summary") with trees, fit time, OOB accuracy and test accuracy.
+The trees are the ones of random-decision-forest.py (gini, max_depth) with max_features="sqrt" like RandomForestClassifier.
+
+python -m mlpy.benchmarks.forest_growth --datasets digits,synthetic:20000:50 --fixed-estimators 500
+'''
+
+def load_dataset(name, random_state=0):
+  if name == "digits":
+    X, Y = load_digits(return_X_y=True)
+  else: #synthetic:N:F
+    _, num_samples, num_features = name.split(":")
+    X, Y = make_classification(int(float(num_samples)), int(num_features), n_informative=int(num_features) // 2,
+      n_classes=4, random_state=random_state)
+  return train_test_split(X, Y, test_size=0.1, random_state=random_state)
+
+def run(datasets, max_depth, fixed_estimators, batch_size, patience, tol, n_jobs, output):
+  for dataset in datasets:
+    X_train, X_test, Y_train, Y_test = load_dataset(dataset)
+    records = []
+
+    start = time.perf_counter()
+    forest = EarlyStoppingForest(DecisionTreeClassifier(criterion="gini", max_depth=max_depth, max_features="sqrt"),
+      batch_size=batch_size, max_estimators=fixed_estimators, patience=patience, tol=tol, n_jobs=n_jobs, random_state=0)
+    forest.fit(X_train, Y_train)
+    fit_time = time.perf_counter() - start
+    for point in forest.oob_curve_:
+      records.append(dict(point, dataset=dataset, kind="curve"))
+    records.append({"dataset": dataset, "kind": "summary", "model": "early_stopping", "n_estimators": forest.n_estimators_,
+      "fit_time": fit_time, "oob_accuracy": forest.oob_score_, "accuracy": accuracy_score(Y_test, forest.predict(X_test))})
+
+    start = time.perf_counter()
+    fixed = RandomForestClassifier(n_estimators=fixed_estimators, criterion="gini", max_depth=max_depth, oob_score=True,
+      n_jobs=n_jobs, random_state=0)
+    fixed.fit(X_train, Y_train)
+    fit_time = time.perf_counter() - start
+    records.append({"dataset": dataset, "kind": "summary", "model": "fixed", "n_estimators": fixed_estimators,
+      "fit_time": fit_time, "oob_accuracy": fixed.oob_score_, "accuracy": accuracy_score(Y_test, fixed.predict(X_test))})
+
+    for record in records:
+      output.write(json.dumps(record) + "\n")
+    output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.forest_growth")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--datasets", default="digits,synthetic:20000:50", help="comma separated: digits, synthetic:N:F")
+  parser.add_argument("--max-depth", type=int, default=10)
+  parser.add_argument("--fixed-estimators", type=int, default=500, help="n_estimators of RandomForestClassifier (and max of the early stopped forest)")
+  parser.add_argument("--batch-size", type=int, default=16)
+  parser.add_argument("--patience", type=int, default=3)
+  parser.add_argument("--tol", type=float, default=1e-3)
+  parser.add_argument("--n-jobs", type=int, default=None, help="processes (default: num of CPUs)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.datasets.split(","), args.max_depth, args.fixed_estimators, args.batch_size, args.patience, args.tol, args.n_jobs, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
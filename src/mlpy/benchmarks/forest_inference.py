@@ -0,0 +1,76 @@
+import sys
+import json
+import time
+import pickle
+import argparse
+import numpy as np
+from sklearn.datasets import load_digits
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from mlpy.flatforest import flatten_forest
+
+'''
+Benchmark of the flattened forest (mlpy.flatforest) against RandomForestClassifier.predict_proba on the digits forest
+of multiclass/random-decision-forest.py (gini, max_depth=10) with --estimators trees.
+The test rows are repeated up to --rows rows, then for every batch size the rows are predicted in batches:
+the record has rows per second, the median/p99 latency of a batch, the max difference of the probabilities
+and the agreement of the predictions; the first record has the bytes of the model (pickle of the forest, arrays of the flat forest).
+
+python -m mlpy.benchmarks.forest_inference --estimators 100 --batch-sizes 1,16,256,4096,65536 --rows 200000
+'''
+
+def run(num_estimators, batch_sizes, num_rows, min_time, output):
+  X, Y = load_digits(return_X_y=True)
+  X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.1, random_state=0)
+  forest = RandomForestClassifier(n_estimators=num_estimators, criterion="gini", max_depth=10, random_state=0).fit(X_train, Y_train)
+  start = time.perf_counter()
+  flat_forest = flatten_forest(forest, fallback_rows=None) #only the flat arrays, also for the large batches
+  flatten_time = time.perf_counter() - start
+  output.write(json.dumps({"estimators": num_estimators, "nodes": len(flat_forest.children_), "max_depth": flat_forest.max_depth_,
+    "flatten_time": flatten_time, "pickle_bytes": len(pickle.dumps(forest, protocol=pickle.HIGHEST_PROTOCOL)),
+    "flat_bytes": flat_forest.nbytes}) + "\n")
+
+  rows = np.tile(X_test, (-(-num_rows // len(X_test)), 1))[:num_rows]
+  for batch_size in batch_sizes:
+    batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+    for engine, predict_proba in (("sklearn", forest.predict_proba), ("flat", flat_forest.predict_proba)):
+      latencies = []
+      probabilities = []
+      begin = time.perf_counter()
+      for batch in batches: #stops after min_time seconds for the small batches
+        start = time.perf_counter()
+        probabilities.append(predict_proba(batch))
+        latencies.append(time.perf_counter() - start)
+        if start - begin > min_time:
+          break
+      total = time.perf_counter() - begin
+      probabilities = np.vstack(probabilities)
+      expected = forest.predict_proba(rows[:len(probabilities)]) if engine == "flat" else probabilities
+      record = {
+        "engine": engine, "estimators": num_estimators, "batch_size": batch_size, "rows": len(probabilities),
+        "rows_per_second": len(probabilities) / total,
+        "p50": float(np.percentile(latencies, 50)), "p99": float(np.percentile(latencies, 99)),
+        "max_difference": float(np.abs(probabilities - expected).max()),
+        "agreement": float(np.mean(probabilities.argmax(axis=1) == expected.argmax(axis=1)))
+      }
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.forest_inference")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--estimators", type=int, default=100, help="trees of the forest")
+  parser.add_argument("--batch-sizes", default="1,16,256,4096,65536", help="comma separated rows per batch")
+  parser.add_argument("--rows", type=int, default=200000, help="rows to predict for every batch size")
+  parser.add_argument("--min-time", type=float, default=5.0, help="max seconds for a batch size (the small batches stop before the end)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.estimators, [int(value) for value in args.batch_sizes.split(",")], args.rows, args.min_time, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import pickle
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+from mlpy.neighbors import BlockedNearestNeighbors
+from mlpy.neighbors.store import save_knn
+
+'''
+Cold start benchmark of a fitted K-NN model: pickle against the flat file loaded by memory map (mlpy.neighbors.store).
+The model is fitted on synthetic data and saved in both formats, then for every format a new process
+loads it and answers one query; the record has the load time, the time of the first query, and the anonymous memory of that process
+(the max RSS is not meaningful: the child starts from the one of the parent).
+With mmap the load doesn't depend on the size of the model, and the pages of the model are shared
+with the page cache (and the other processes) instead of being a private copy: they aren't anonymous memory.
+
+python -m mlpy.benchmarks.knn_cold_start --rows 1e6 --features 64
+'''
+
+#Code of the child process: load, one query, print the timings as JSON
+CHILD = '''
+import sys, json, time, pickle
+import numpy as np
+from mlpy.neighbors.store import load_knn #the import of the classes is the same for both formats, it isn't timed
+start = time.perf_counter()
+if sys.argv[1] == "pickle":
+  with open(sys.argv[2], "rb") as f:
+    neighbors, labels = pickle.load(f)
+else:
+  neighbors, labels = load_knn(sys.argv[2])
+load_time = time.perf_counter() - start
+query = np.zeros((1, int(sys.argv[3])))
+start = time.perf_counter()
+neighbors.kneighbors(query, 5)
+first_query_time = time.perf_counter() - start
+record = {"load_time": load_time, "first_query_time": first_query_time}
+try: #anonymous memory is private to the process, the pages mapped from the file are shared (Linux only)
+  with open("/proc/self/smaps_rollup") as f:
+    record["anonymous_memory"] = next(int(line.split()[1]) * 1024 for line in f if line.startswith("Anonymous:"))
+except OSError:
+  pass
+print(json.dumps(record))
+'''
+
+def measure(file_format, path, num_features):
+  output = subprocess.run([sys.executable, "-c", CHILD, file_format, path, str(num_features)],
+    check=True, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+  return json.loads(output.stdout)
+
+def run(num_rows, num_features, output, folder=None, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  X = random_generator.standard_normal((num_rows, num_features))
+  Y = random_generator.integers(0, 10, num_rows)
+  neighbors = BlockedNearestNeighbors().fit(X)
+  with tempfile.TemporaryDirectory(dir=folder) as tmp_folder:
+    paths = {"pickle": os.path.join(tmp_folder, "knn.pkl"), "mmap": os.path.join(tmp_folder, "knn.bin")}
+    with open(paths["pickle"], "wb") as f:
+      pickle.dump((neighbors, Y), f, protocol=pickle.HIGHEST_PROTOCOL)
+    save_knn(paths["mmap"], neighbors, Y)
+    for file_format, path in paths.items():
+      record = {"format": file_format, "n_rows": num_rows, "n_features": num_features, "file_size": os.path.getsize(path)}
+      record.update(measure(file_format, path, num_features))
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.knn_cold_start")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--rows", type=float, default=1e6)
+  parser.add_argument("--features", type=int, default=64)
+  parser.add_argument("--folder", default=None, help="folder of the model files (default: system temp folder)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(int(args.rows), args.features, output, args.folder)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.online import OnlineBernoulliNB, save_online, load_online
+
+'''
+Benchmark of the online update of the sentiment model of bernoulli-nb.py (mlpy.online) against the full refit.
+The IMDB reviews (or synthetic texts when the CSV is missing) arrive in batches: after the first fit on --initial reviews,
+for every new batch the saved online model is loaded, updated with the batch only (partial_fit) and saved,
+while the full refit fits CountVectorizer(binary=True) + BernoulliNB on all the reviews until then.
+Every record has the times of both, the size of the saved state, the accuracy of both on the held out reviews
+and the agreement of their predictions (1.0 with unseen="grow").
+
+python -m mlpy.benchmarks.online_nb --initial 20000 --batch-size 1000 --batches 10
+'''
+
+def load_texts(path, num_texts, random_state=0):
+  if path and os.path.exists(path):
+    reviews = pd.read_csv(path, nrows=num_texts)
+    return list(reviews["review"]), reviews["sentiment"].to_numpy()
+  random_generator = np.random.default_rng(random_state)
+  vocabulary = np.array(["w%d" % i for i in range(200000)])
+  targets = np.where(random_generator.integers(0, 2, num_texts) == 1, "positive", "negative")
+  texts = [" ".join(vocabulary[(random_generator.zipf(1.2, 200) + 1000 * (target == "positive")) % len(vocabulary)]) for target in targets]
+  return texts, targets
+
+def timed(function, *args):
+  start = time.perf_counter()
+  result = function(*args)
+  return result, time.perf_counter() - start
+
+def run(path, initial, batch_size, num_batches, num_test, unseen, output, folder=None):
+  texts, targets = load_texts(path, initial + batch_size * num_batches + num_test)
+  texts_test, Y_test = texts[-num_test:], targets[-num_test:]
+  with tempfile.TemporaryDirectory(dir=folder) as tmp_folder:
+    state_path = os.path.join(tmp_folder, "online.onb")
+    online = OnlineBernoulliNB(unseen=unseen).partial_fit(texts[:initial], targets[:initial])
+    save_online(state_path, online)
+    for batch in range(num_batches):
+      stop = initial + (batch + 1) * batch_size
+      batch_texts, batch_targets = texts[stop - batch_size:stop], targets[stop - batch_size:stop]
+      online, load_time = timed(load_online, state_path)
+      _, update_time = timed(online.partial_fit, batch_texts, batch_targets)
+      _, save_time = timed(save_online, state_path, online)
+
+      start = time.perf_counter()
+      vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True)
+      model = BernoulliNB().fit(vectorizer.fit_transform(texts[:stop]), targets[:stop])
+      refit_time = time.perf_counter() - start
+
+      Y_online = online.predict(texts_test)
+      Y_refit = model.predict(vectorizer.transform(texts_test))
+      record = {
+        "batch": batch, "documents": stop, "batch_size": batch_size, "unseen": unseen, "terms": len(online.terms_),
+        "load_time": load_time, "update_time": update_time, "save_time": save_time,
+        "incremental_time": load_time + update_time + save_time, "refit_time": refit_time,
+        "state_bytes": os.path.getsize(state_path),
+        "online_accuracy": float(np.mean(Y_online == Y_test)), "refit_accuracy": float(np.mean(Y_refit == Y_test)),
+        "agreement": float(np.mean(Y_online == Y_refit))
+      }
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.online_nb")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--data", default="data/movie_review_imdb.csv", help="CSV with the reviews (synthetic texts if missing)")
+  parser.add_argument("--initial", type=int, default=20000, help="num of reviews of the first fit")
+  parser.add_argument("--batch-size", type=int, default=1000, help="num of reviews of every new batch")
+  parser.add_argument("--batches", type=int, default=10, help="num of new batches")
+  parser.add_argument("--test", type=int, default=5000, help="num of held out reviews")
+  parser.add_argument("--unseen", choices=["grow", "ignore"], default="grow", help="policy for the new terms")
+  parser.add_argument("--folder", default=None, help="folder of the saved state (default: system temp folder)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.data, args.initial, args.batch_size, args.batches, args.test, args.unseen, output, args.folder)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
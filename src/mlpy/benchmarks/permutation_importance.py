@@ -0,0 +1,59 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from sklearn.datasets import load_digits
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.inspection import permutation_importance as sklearn_permutation_importance
+from mlpy.inspection import permutation_importance
+
+'''
+Benchmark of the parallel permutation importance (mlpy.inspection) against sklearn.inspection.permutation_importance
+on the digits forest of features-selection/random-forest-importance.py (64 features, gini, max_depth=10)
+with --estimators trees, scored on the test rows.
+For every n_jobs: a record with the time of every engine, the baseline score, the correlation of the mean importances
+of the two engines and the ranks of the 10 most important features of each.
+
+python -m mlpy.benchmarks.permutation_importance --estimators 100 --repeats 5 --n-jobs 1,4
+'''
+
+def run(num_estimators, num_repeats, n_jobs_list, output):
+  X, Y = load_digits(return_X_y=True)
+  X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=0)
+  forest = RandomForestClassifier(n_estimators=num_estimators, criterion="gini", max_depth=10, random_state=0).fit(X_train, Y_train)
+  for n_jobs in n_jobs_list:
+    start = time.perf_counter()
+    expected = sklearn_permutation_importance(forest, X_test, Y_test, scoring="accuracy", n_repeats=num_repeats, n_jobs=n_jobs, random_state=0)
+    sklearn_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = permutation_importance(forest, X_test, Y_test, n_repeats=num_repeats, n_jobs=n_jobs, random_state=0)
+    mlpy_time = time.perf_counter() - start
+    record = {
+      "estimators": num_estimators, "repeats": num_repeats, "n_jobs": n_jobs, "features": X.shape[1],
+      "sklearn_time": sklearn_time, "mlpy_time": mlpy_time, "baseline_score": result.baseline_score,
+      "correlation": float(np.corrcoef(result.importances_mean, expected.importances_mean)[0, 1]),
+      "top_sklearn": np.argsort(-expected.importances_mean)[:10].tolist(),
+      "top_mlpy": np.argsort(-result.importances_mean)[:10].tolist()
+    }
+    output.write(json.dumps(record) + "\n")
+    output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.permutation_importance")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--estimators", type=int, default=100, help="trees of the forest")
+  parser.add_argument("--repeats", type=int, default=5, help="permutations of every feature")
+  parser.add_argument("--n-jobs", default="1,4", help="comma separated processes")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.estimators, args.repeats, [int(value) for value in args.n_jobs.split(",")], output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
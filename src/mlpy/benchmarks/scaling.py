@@ -0,0 +1,176 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier, LinearRegression, Lasso, Ridge, SGDRegressor
+from sklearn.svm import LinearSVC, SVC
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.naive_bayes import BernoulliNB, MultinomialNB
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering
+from sklearn.decomposition import PCA
+
+'''
+Scaling benchmark: fit and predict latency/throughput of every estimator used by the scripts,
+on synthetic data growing geometrically in rows (1e3..1e7) and features (10..1000).
+For every (estimator, num of features) the sizes are tried in increasing order, and a size is skipped when
+- the estimated memory is bigger than max_bytes: X and a copy, plus the working memory of the estimators
+  that are quadratic in the rows (MEMORY, e.g. the pairwise distances of AgglomerativeClustering),
+  since they would be killed by the OS before raising MemoryError
+- the previous size, scaled linearly to the new one, already took more than max_seconds
+  (the algorithm is at least linear, then it could only be slower)
+- a size with fewer (or as many) rows and features already failed with MemoryError
+so the output shows where each curve breaks.
+Every result is a JSON line in the output file, written as soon as it is measured.
+
+python -m mlpy.benchmarks.scaling -o scaling.jsonl --estimators KMeans,Ridge --max-rows 1e6
+'''
+
+#name: (task, factory), with the parameters of the scripts where possible
+ESTIMATORS = {
+  "LogisticRegression": ("classification", lambda: LogisticRegression(max_iter=1000)),
+  "LinearSVC": ("classification", lambda: LinearSVC()),
+  "SVC": ("classification", lambda: SVC(kernel="rbf")),
+  "SGDClassifier": ("classification", lambda: SGDClassifier(loss="hinge")),
+  "LinearDiscriminantAnalysis": ("classification", lambda: LinearDiscriminantAnalysis()),
+  "KNeighborsClassifier": ("classification", lambda: KNeighborsClassifier(n_neighbors=5, metric="minkowski")),
+  "DecisionTreeClassifier": ("classification", lambda: DecisionTreeClassifier(criterion="gini", max_depth=6)),
+  "RandomForestClassifier": ("classification", lambda: RandomForestClassifier(n_estimators=10, criterion="gini", max_depth=10)),
+  "MLPClassifier": ("classification", lambda: MLPClassifier(hidden_layer_sizes=(200, 200, 200), alpha=0.01, early_stopping=True)),
+  "BernoulliNB": ("classification", lambda: BernoulliNB()),
+  "MultinomialNB": ("counts", lambda: MultinomialNB()),
+  "LinearRegression": ("regression", lambda: LinearRegression()),
+  "Ridge": ("regression", lambda: Ridge(alpha=1.0)),
+  "Lasso": ("regression", lambda: Lasso(alpha=0.1)),
+  "SGDRegressor": ("regression", lambda: SGDRegressor()),
+  "KMeans": ("clustering", lambda: KMeans(n_clusters=4, n_init=1)),
+  "DBSCAN": ("clustering", lambda: DBSCAN(eps=0.5, min_samples=5)),
+  "AgglomerativeClustering": ("clustering", lambda: AgglomerativeClustering(n_clusters=4)),
+  "PCA": ("clustering", lambda: PCA(n_components=2))
+}
+
+#name: bytes of working memory for (n_rows, n_features), for the estimators not linear in the rows (worst case)
+MEMORY = {
+  "AgglomerativeClustering": lambda n_rows, n_features: 4 * n_rows * (n_rows - 1), #ward: condensed float64 distance matrix
+  "DBSCAN": lambda n_rows, n_features: 8 * n_rows * n_rows, #neighborhoods: up to n_rows intp indexes for every row
+  "SVC": lambda n_rows, n_features: 200 * 2**20 #kernel cache (cache_size=200 MB)
+}
+
+def estimated_bytes(name, n_rows, n_features):
+  '''
+  Estimated peak memory of fit: X (float64) and a copy, plus the working memory of the estimator (MEMORY).
+  '''
+  data = 2 * 8 * n_rows * n_features
+  return data + MEMORY[name](n_rows, n_features) if name in MEMORY else data
+
+def make_data(task, n_rows, n_features, random_state=0):
+  '''
+  Synthetic data: X standard normal (float64), Y from a random linear function
+  (sign for classification, value for regression, none for clustering), counts for MultinomialNB.
+  '''
+  random_generator = np.random.default_rng(random_state)
+  X = random_generator.standard_normal((n_rows, n_features))
+  weights = random_generator.standard_normal(n_features)
+  Y = X @ weights + random_generator.standard_normal(n_rows)
+  if task == "counts":
+    return np.floor(np.abs(X) * 3), (Y > 0).astype(np.int64)
+  if task == "classification":
+    return X, (Y > 0).astype(np.int64)
+  if task == "regression":
+    return X, Y
+  return X, None
+
+def _timed(function, *args):
+  wall_start, cpu_start = time.perf_counter(), time.process_time()
+  result = function(*args)
+  return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+def measure(name, n_rows, n_features, predict_rows=10000):
+  '''
+  One record: fit on n_rows, predict (or transform) on min(n_rows, predict_rows) rows.
+  The estimators without predict (DBSCAN, AgglomerativeClustering) have only the fit_predict time.
+  '''
+  task, factory = ESTIMATORS[name]
+  X, Y = make_data(task, n_rows, n_features)
+  estimator = factory()
+  _, fit_time, fit_cpu_time = _timed(estimator.fit, X, Y) if Y is not None else _timed(estimator.fit, X)
+  record = {
+    "estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "ok",
+    "fit_time": fit_time, "fit_cpu_time": fit_cpu_time, "fit_throughput": n_rows / fit_time
+  }
+  predict = getattr(estimator, "predict", None) or getattr(estimator, "transform", None)
+  if predict is not None:
+    X_predict = X[:predict_rows]
+    _, predict_time, predict_cpu_time = _timed(predict, X_predict)
+    record.update({
+      "predict_rows": len(X_predict), "predict_time": predict_time, "predict_cpu_time": predict_cpu_time,
+      "predict_latency": predict_time / len(X_predict), "predict_throughput": len(X_predict) / predict_time
+    })
+  return record
+
+def geometric_sizes(minimum, maximum, factor):
+  sizes = []
+  size = minimum
+  while size <= maximum:
+    sizes.append(int(size))
+    size *= factor
+  return sizes
+
+def run(estimators, rows, features, output, max_seconds=60.0, max_bytes=4e9, predict_rows=10000):
+  '''
+  Measure every estimator on every (rows, features), write the records as JSON lines in output.
+  '''
+  for name in estimators:
+    failures = [] #(n_rows, n_features) of the MemoryErrors of the estimator
+    for n_features in features:
+      previous = None
+      for n_rows in rows:
+        if estimated_bytes(name, n_rows, n_features) > max_bytes:
+          record = {"estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "skipped: max_bytes"}
+        elif any(n_rows >= failed_rows and n_features >= failed_features for failed_rows, failed_features in failures):
+          record = {"estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "skipped: MemoryError"}
+        elif previous is not None and "fit_time" in previous and \
+            max(previous["fit_time"], previous.get("predict_time", 0)) * n_rows / previous["n_rows"] > max_seconds:
+          record = {"estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "skipped: max_seconds"}
+        else:
+          try:
+            record = measure(name, n_rows, n_features, predict_rows)
+          except MemoryError:
+            record = {"estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "failed: MemoryError"}
+            failures.append((n_rows, n_features))
+          previous = record
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.scaling")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--estimators", default=",".join(ESTIMATORS), help="comma separated names")
+  parser.add_argument("--min-rows", type=float, default=1e3)
+  parser.add_argument("--max-rows", type=float, default=1e7)
+  parser.add_argument("--row-factor", type=float, default=10, help="geometric growth of the rows")
+  parser.add_argument("--features", default="10,100,1000", help="comma separated num of features")
+  parser.add_argument("--max-seconds", type=float, default=60.0, help="time budget of a single fit/predict")
+  parser.add_argument("--max-bytes", type=float, default=4e9, help="memory budget of a fit (X and its copy, plus the working memory of the quadratic estimators)")
+  parser.add_argument("--predict-rows", type=int, default=10000, help="max num of rows to predict")
+  args = parser.parse_args(argv)
+
+  estimators = args.estimators.split(",")
+  unknown = [name for name in estimators if name not in ESTIMATORS]
+  if unknown:
+    parser.error("unknown estimators: %s" % ", ".join(unknown))
+  rows = geometric_sizes(args.min_rows, args.max_rows, args.row_factor)
+  features = [int(value) for value in args.features.split(",")]
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(estimators, rows, features, output, args.max_seconds, args.max_bytes, args.predict_rows)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
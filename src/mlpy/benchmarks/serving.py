@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.naive_bayes import BernoulliNB, MultinomialNB
+from mlpy.serving import NaiveBayesScorer, MicroBatcher, serve
+
+'''
+Load generator for the micro-batched inference service (mlpy.serving).
+The model of bernoulli-nb.py (CountVectorizer binary + BernoulliNB) or of multinomial-nb.py (TfidfVectorizer + MultinomialNB)
+is fitted on the IMDB reviews (or on synthetic texts when the CSV is missing), then for every
+(max_batch_size, concurrency) a closed loop of clients (every client sends the next request after the answer)
+sends the requests, in process or on TCP (--tcp). max_batch_size=1 is the service without batching.
+Every record has throughput, latency percentiles seen by the clients (p50/p99) and by the service (service_p50/service_p99),
+and the mean size of the batches.
+
+python -m mlpy.benchmarks.serving --model bernoulli --concurrency 1,16,128 --max-batch-sizes 1,64
+'''
+
+def load_texts(path, num_texts, random_state=0):
+  if path and os.path.exists(path):
+    reviews = pd.read_csv(path, nrows=num_texts)
+    return list(reviews["review"]), reviews["sentiment"].to_numpy()
+  random_generator = np.random.default_rng(random_state)
+  vocabulary = np.array(["w%d" % i for i in range(20000)])
+  targets = random_generator.integers(0, 2, num_texts)
+  texts = [" ".join(vocabulary[(random_generator.zipf(1.3, 200) + 1000 * target) % len(vocabulary)]) for target in targets]
+  return texts, targets
+
+def fit_model(name, texts, targets):
+  if name == "bernoulli":
+    vectorizer, model = CountVectorizer(lowercase=True, stop_words='english', binary=True), BernoulliNB()
+  else:
+    vectorizer, model = TfidfVectorizer(lowercase=True, stop_words='english'), MultinomialNB()
+  model.fit(vectorizer.fit_transform(texts), targets)
+  return NaiveBayesScorer(vectorizer, model)
+
+async def _client_in_process(batcher, requests, latencies):
+  for text in requests:
+    start = time.perf_counter()
+    await batcher.predict(text)
+    latencies.append(time.perf_counter() - start)
+
+async def _client_tcp(port, requests, latencies):
+  reader, writer = await asyncio.open_connection("127.0.0.1", port)
+  try:
+    for text in requests:
+      start = time.perf_counter()
+      writer.write((text.replace("\n", " ") + "\n").encode("utf-8"))
+      await writer.drain()
+      await reader.readline()
+      latencies.append(time.perf_counter() - start)
+  finally:
+    writer.close()
+
+async def measure(scorer, texts, num_requests, concurrency, max_batch_size, max_delay, tcp=False, port=8765):
+  batcher = await MicroBatcher(scorer, max_batch_size=max_batch_size, max_delay=max_delay).start()
+  server = await serve(batcher, port=port) if tcp else None
+  latencies = []
+  #the requests of every client are consecutive texts of the corpus
+  requests = [[texts[(client * num_requests // concurrency + i) % len(texts)] for i in range(num_requests // concurrency)] for client in range(concurrency)]
+  start = time.perf_counter()
+  if tcp:
+    await asyncio.gather(*[_client_tcp(port, client_requests, latencies) for client_requests in requests])
+  else:
+    await asyncio.gather(*[_client_in_process(batcher, client_requests, latencies) for client_requests in requests])
+  seconds = time.perf_counter() - start
+  if server is not None:
+    server.close()
+    await server.wait_closed()
+  await batcher.stop()
+  p50, p99 = np.percentile(latencies, [50, 99])
+  service = batcher.latency_percentiles() #from the arrival in the queue to the answer, without the client and the network
+  return {
+    "requests": len(latencies), "concurrency": concurrency, "max_batch_size": max_batch_size, "max_delay": max_delay,
+    "tcp": tcp, "seconds": seconds, "throughput": len(latencies) / seconds, "p50": float(p50), "p99": float(p99),
+    "service_p50": service["p50"], "service_p99": service["p99"], "mean_batch_size": float(np.mean(batcher.batch_sizes))
+  }
+
+def run(model, path, num_texts, num_requests, concurrencies, max_batch_sizes, max_delay, tcp, output):
+  texts, targets = load_texts(path, num_texts)
+  scorer = fit_model(model, texts, targets)
+  for max_batch_size in max_batch_sizes:
+    for concurrency in concurrencies:
+      record = asyncio.run(measure(scorer, texts, num_requests, concurrency, max_batch_size, max_delay, tcp))
+      record["model"] = model
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.serving")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--model", choices=["bernoulli", "multinomial"], default="bernoulli")
+  parser.add_argument("--data", default="data/movie_review_imdb.csv", help="CSV with review/sentiment (synthetic texts if missing)")
+  parser.add_argument("--texts", type=int, default=20000, help="num of texts to fit the model")
+  parser.add_argument("--requests", type=int, default=5000, help="num of requests of every measure")
+  parser.add_argument("--concurrency", default="1,16,128", help="comma separated num of concurrent clients")
+  parser.add_argument("--max-batch-sizes", default="1,64", help="comma separated max sizes of the micro-batches")
+  parser.add_argument("--max-delay", type=float, default=0.0, help="seconds the first request of a batch waits for others")
+  parser.add_argument("--tcp", action="store_true", help="the clients connect to the TCP service")
+  args = parser.parse_args(argv)
+
+  concurrencies = [int(value) for value in args.concurrency.split(",")]
+  max_batch_sizes = [int(value) for value in args.max_batch_sizes.split(",")]
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.model, args.data, args.texts, args.requests, concurrencies, max_batch_sizes, args.max_delay, args.tcp, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,64 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from mlpy.tokenizers import LemmaStemTokenizer, tokenize_documents, CACHE_SIZE
+
+'''
+Throughput of the lemmatize/stem tokenizer (mlpy.tokenizers) in documents per second,
+for every num of processes and every size of the LRU of the normalized words (0 = no cache).
+The corpus is 20newsgroups (train) when it's already downloaded, else a synthetic corpus
+with a Zipf distribution of the words like a natural language.
+
+python -m mlpy.benchmarks.tokenizer_throughput --jobs 1,2,4 --cache-sizes 0,65536
+'''
+
+def load_corpus(num_documents, random_state=0):
+  try:
+    from sklearn.datasets import fetch_20newsgroups
+    return "20newsgroups", fetch_20newsgroups(subset="train", download_if_missing=False).data[:num_documents]
+  except OSError:
+    random_generator = np.random.default_rng(random_state)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocabulary = ["".join(random_generator.choice(letters, length)) + suffix
+      for length, suffix in zip(random_generator.integers(3, 9, 50000), random_generator.choice(["", "s", "ed", "ing"], 50000))]
+    ranks = np.minimum(random_generator.zipf(1.2, (num_documents, 300)), len(vocabulary)) - 1
+    return "synthetic", [" ".join(vocabulary[rank] for rank in document) for document in ranks]
+
+def run(num_documents, jobs, cache_sizes, lemmatize, output):
+  corpus, texts = load_corpus(num_documents)
+  for cache_size in cache_sizes:
+    for n_jobs in jobs:
+      tokenizer = LemmaStemTokenizer(cache_size=cache_size, lemmatize=lemmatize)
+      start = time.perf_counter()
+      documents = tokenize_documents(texts, tokenizer, n_jobs=n_jobs)
+      seconds = time.perf_counter() - start
+      num_tokens = sum(len(tokens) for tokens in documents)
+      record = {
+        "corpus": corpus, "documents": len(texts), "tokens": num_tokens, "n_jobs": n_jobs, "cache_size": cache_size,
+        "lemmatize": lemmatize, "seconds": seconds, "docs_per_second": len(texts) / seconds, "tokens_per_second": num_tokens / seconds
+      }
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.tokenizer_throughput")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--documents", type=int, default=11314, help="num of documents (20newsgroups train has 11314)")
+  parser.add_argument("--jobs", default="1,2,4", help="comma separated num of processes")
+  parser.add_argument("--cache-sizes", default="0,%d" % CACHE_SIZE, help="comma separated sizes of the LRU")
+  parser.add_argument("--no-lemmatize", action="store_true", help="only the stemmer (without the WordNet corpus)")
+  args = parser.parse_args(argv)
+
+  jobs = [int(value) for value in args.jobs.split(",")]
+  cache_sizes = [int(value) for value in args.cache_sizes.split(",")]
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.documents, jobs, cache_sizes, not args.no_lemmatize, output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
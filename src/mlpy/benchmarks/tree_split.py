@@ -0,0 +1,80 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from sklearn.datasets import load_digits, make_classification
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.tree import Binner, HistogramTreeClassifier
+
+'''
+Benchmark of the histogram decision tree (mlpy.tree) against DecisionTreeClassifier (sorted values at every node).
+For every dataset and max_depth the record has fit time (with the binning, whose time is also reported alone),
+predict time, test accuracy, nodes and depth of:
+- sorted: DecisionTreeClassifier(criterion="gini") of the decision-tree.py scripts
+- histogram: HistogramTreeClassifier with sibling subtraction
+- histogram_no_subtract: HistogramTreeClassifier counting the histograms of both children
+The datasets are digits (64 pixels with 17 values, the one of multiclass/decision-tree.py)
+and synthetic:N:F (make_classification, N samples and F continuous features, the wide tabular case).
+
+python -m mlpy.benchmarks.tree_split --datasets digits,synthetic:200000:100 --max-depths 6,12
+'''
+
+def load_dataset(name, random_state=0):
+  if name == "digits":
+    X, Y = load_digits(return_X_y=True)
+  else: #synthetic:N:F
+    _, num_samples, num_features = name.split(":")
+    X, Y = make_classification(int(float(num_samples)), int(num_features), n_informative=int(num_features) // 2,
+      n_classes=2, random_state=random_state)
+  return train_test_split(X, Y, test_size=0.1, random_state=random_state)
+
+def models(max_depth):
+  yield "sorted", DecisionTreeClassifier(criterion="gini", max_depth=max_depth, random_state=0)
+  yield "histogram", HistogramTreeClassifier(criterion="gini", max_depth=max_depth)
+  yield "histogram_no_subtract", HistogramTreeClassifier(criterion="gini", max_depth=max_depth, subtract=False)
+
+def run(datasets, max_depths, output):
+  for dataset in datasets:
+    X_train, X_test, Y_train, Y_test = load_dataset(dataset)
+    start = time.perf_counter()
+    Binner().fit_transform(X_train)
+    bin_time = time.perf_counter() - start
+    for max_depth in max_depths:
+      for name, model in models(max_depth):
+        start = time.perf_counter()
+        model.fit(X_train, Y_train)
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        Y_predicted = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+        if name == "sorted":
+          nodes, depth = model.tree_.node_count, model.get_depth()
+        else:
+          nodes, depth = model.node_count, model.get_depth()
+        record = {
+          "dataset": dataset, "samples": len(X_train), "features": X_train.shape[1], "max_depth": max_depth, "model": name,
+          "fit_time": fit_time, "bin_time": bin_time if name != "sorted" else 0.0, "predict_time": predict_time,
+          "accuracy": accuracy_score(Y_test, Y_predicted), "nodes": int(nodes), "depth": int(depth)
+        }
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.tree_split")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--datasets", default="digits,synthetic:200000:100", help="comma separated: digits, synthetic:N:F")
+  parser.add_argument("--max-depths", default="6,12", help="comma separated max_depth (0 = unlimited)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.datasets.split(","), [int(value) or None for value in args.max_depths.split(",")], output)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import pickle
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from mlpy.vocabulary import save_vectorizer
+
+'''
+Cold start benchmark of a fitted text vectorizer: pickle against the compact file loaded by memory map (mlpy.vocabulary).
+The vectorizer of bernoulli-nb.py (CountVectorizer binary) or of multinomial-nb.py (TfidfVectorizer) is fitted
+on the IMDB reviews (or on a synthetic corpus with a large vocabulary when the CSV is missing) and saved in both formats,
+then for every format a new process loads it and transforms a batch of documents; the record has the load time,
+the time of the transform, and the anonymous memory of that process
+(the max RSS is not meaningful: the child starts from the one of the parent).
+
+python -m mlpy.benchmarks.vectorizer_cold_start --vectorizer tfidf --ngrams 2
+'''
+
+#Code of the child process: load, one transform, print the timings as JSON
+CHILD = '''
+import sys, json, time, pickle
+from mlpy.vocabulary import load_vectorizer #the imports are the same for both formats, they aren't timed
+import sklearn.feature_extraction.text
+with open(sys.argv[3]) as f:
+  texts = json.load(f)
+start = time.perf_counter()
+if sys.argv[1] == "pickle":
+  with open(sys.argv[2], "rb") as f:
+    vectorizer = pickle.load(f)
+else:
+  vectorizer = load_vectorizer(sys.argv[2])
+load_time = time.perf_counter() - start
+start = time.perf_counter()
+vectorizer.transform(texts)
+transform_time = time.perf_counter() - start
+record = {"load_time": load_time, "transform_time": transform_time}
+try: #anonymous memory is private to the process, the pages mapped from the file are shared (Linux only)
+  with open("/proc/self/smaps_rollup") as f:
+    record["anonymous_memory"] = next(int(line.split()[1]) * 1024 for line in f if line.startswith("Anonymous:"))
+except OSError:
+  pass
+print(json.dumps(record))
+'''
+
+def load_texts(path, num_texts, random_state=0):
+  if path and os.path.exists(path):
+    return list(pd.read_csv(path, nrows=num_texts)["review"])
+  random_generator = np.random.default_rng(random_state)
+  letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+  vocabulary = np.array(["".join(random_generator.choice(letters, length)) for length in random_generator.integers(3, 12, 200000)])
+  return [" ".join(vocabulary[np.minimum(random_generator.zipf(1.1, 200), len(vocabulary)) - 1]) for _ in range(num_texts)]
+
+def run(vectorizer_name, path, num_texts, ngrams, batch_size, output, folder=None):
+  texts = load_texts(path, num_texts)
+  if vectorizer_name == "count":
+    vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True, ngram_range=(1, ngrams))
+  else:
+    vectorizer = TfidfVectorizer(lowercase=True, stop_words='english', ngram_range=(1, ngrams))
+  vectorizer.fit(texts)
+  with tempfile.TemporaryDirectory(dir=folder) as tmp_folder:
+    paths = {"pickle": os.path.join(tmp_folder, "vectorizer.pkl"), "mmap": os.path.join(tmp_folder, "vectorizer.voc")}
+    with open(paths["pickle"], "wb") as f:
+      pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    save_vectorizer(paths["mmap"], vectorizer)
+    texts_path = os.path.join(tmp_folder, "texts.json")
+    with open(texts_path, "w") as f:
+      json.dump(texts[:batch_size], f)
+    for file_format, file_path in paths.items():
+      child = subprocess.run([sys.executable, "-c", CHILD, file_format, file_path, texts_path],
+        check=True, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+      record = {
+        "format": file_format, "vectorizer": vectorizer_name, "ngrams": ngrams, "terms": len(vectorizer.vocabulary_),
+        "batch_size": batch_size, "file_size": os.path.getsize(file_path)
+      }
+      record.update(json.loads(child.stdout))
+      output.write(json.dumps(record) + "\n")
+      output.flush()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python -m mlpy.benchmarks.vectorizer_cold_start")
+  parser.add_argument("-o", "--output", default=None, help="JSON lines file (default: stdout)")
+  parser.add_argument("--vectorizer", choices=["count", "tfidf"], default="tfidf")
+  parser.add_argument("--data", default="data/movie_review_imdb.csv", help="CSV with the reviews (synthetic texts if missing)")
+  parser.add_argument("--texts", type=int, default=50000, help="num of texts to fit the vectorizer")
+  parser.add_argument("--ngrams", type=int, default=1, help="max n of the n-grams (2 = words and pairs of words)")
+  parser.add_argument("--batch-size", type=int, default=100, help="num of texts transformed after the load")
+  parser.add_argument("--folder", default=None, help="folder of the files (default: system temp folder)")
+  args = parser.parse_args(argv)
+
+  output = open(args.output, "w") if args.output else sys.stdout
+  try:
+    run(args.vectorizer, args.data, args.texts, args.ngrams, args.batch_size, output, args.folder)
+  finally:
+    if output is not sys.stdout:
+      output.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,158 @@
+import numpy as np
+import scipy.sparse as sp
+
+'''
+Bit-packed binary features for BernoulliNB.
+With CountVectorizer(binary=True) every feature is 0/1, but the CSR matrix keeps an int64 value and an int32 index
+for every non zero (96 bits); here a document is a bitset, one bit for every feature in uint64 words (PackedBits).
+The bitsets are smaller than CSR when more than 1/96 of the features of a document are set
+(a vocabulary limited by max_features, or short n-gram/char features), else CSR is smaller.
+
+BitPackedBernoulliNB is BernoulliNB on the bitsets:
+- fit counts the documents of every class with every feature set (unpacking blocks of rows)
+- the joint log likelihood log P(c) + Σ x log p + (1 − x) log(1 − p) = bias + Σ x·w, with w = log p − log(1 − p),
+  is computed without unpacking: the weights of every class are quantized to n_bits unsigned integers
+  q = (w − offset) / step and stored as n_bits bitsets (bit k of q of every feature), then
+  Σ x·w = offset·popcount(x) + step·Σ_k 2^k popcount(x AND plane_k)
+  that is n_bits AND + popcount of the words of the document for every class.
+The quantization error is at most step/2 for every feature set, with n_bits=16 the predictions are the ones
+of BernoulliNB except for ties.
+'''
+
+WORD_BITS = 64
+
+#Popcount of every uint64 (numpy >= 2.0 has it, else by bytes)
+if hasattr(np, "bitwise_count"):
+  def _popcount(words, out=None):
+    return np.bitwise_count(words, out=out)
+else:
+  _BYTE_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+  def _popcount(words, out=None):
+    return _BYTE_COUNTS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8, out=out)
+
+class PackedBits:
+  '''
+  Binary matrix as bitsets: words is (num of rows, num of words) uint64, bit j % 64 of the word j // 64 is the feature j.
+  '''
+  def __init__(self, words, n_features):
+    self.words = words
+    self.n_features = n_features
+
+  @property
+  def shape(self):
+    return (len(self.words), self.n_features)
+
+  @property
+  def nbytes(self):
+    return self.words.nbytes
+
+  def __len__(self):
+    return len(self.words)
+
+  def __getitem__(self, rows):
+    return PackedBits(self.words[rows], self.n_features)
+
+  def unpack(self, rows=slice(None)):
+    '''
+    Dense uint8 0/1 matrix of the rows.
+    '''
+    return np.unpackbits(self.words[rows].view(np.uint8), axis=1, count=self.n_features, bitorder="little")
+
+def pack_bits(X, threshold=0.0, block_rows=4096):
+  '''
+  PackedBits of X > threshold (X scipy sparse matrix or dense array), by blocks of rows.
+  '''
+  n_samples, n_features = X.shape
+  num_words = -(-n_features // WORD_BITS)
+  words = np.zeros((n_samples, num_words), dtype=np.uint64)
+  bytes_view = words.view(np.uint8)
+  if sp.issparse(X):
+    X = sp.csr_matrix(X)
+    for start in range(0, n_samples, block_rows):
+      block = X[start:start + block_rows]
+      block.sum_duplicates()
+      rows = np.repeat(np.arange(block.shape[0]), np.diff(block.indptr))
+      keep = block.data > threshold
+      rows, columns = rows[keep], block.indices[keep]
+      #(row, column) are unique, so summing the bits of a byte is the same as OR
+      bytes_index = rows * bytes_view.shape[1] + (columns >> 3)
+      values = np.bincount(bytes_index, weights=np.left_shift(1, columns & 7), minlength=block.shape[0] * bytes_view.shape[1])
+      bytes_view[start:start + block.shape[0]] = values.astype(np.uint8).reshape(block.shape[0], -1)
+  else:
+    X = np.asarray(X)
+    for start in range(0, n_samples, block_rows):
+      packed = np.packbits(X[start:start + block_rows] > threshold, axis=1, bitorder="little")
+      bytes_view[start:start + len(packed), :packed.shape[1]] = packed
+  return PackedBits(words, n_features)
+
+class BitPackedBernoulliNB:
+  '''
+  BernoulliNB (same alpha, fit_prior, class_prior and the same fitted counts) for PackedBits.
+  '''
+  def __init__(self, alpha=1.0, fit_prior=True, class_prior=None, n_bits=16, block_bytes=2**26):
+    self.alpha = alpha
+    self.fit_prior = fit_prior
+    self.class_prior = class_prior
+    self.n_bits = n_bits #bits of the quantized weights (at most 32)
+    self.block_bytes = block_bytes #max bytes of the unpacked rows of a block in fit
+
+  def fit(self, X, y):
+    self.classes_, classes = np.unique(y, return_inverse=True)
+    self.n_features_in_ = X.n_features
+    self.class_count_ = np.bincount(classes, minlength=len(self.classes_)).astype(np.float64)
+    self.feature_count_ = np.zeros((len(self.classes_), X.n_features), dtype=np.float64)
+    block_rows = max(1, self.block_bytes // max(1, X.n_features))
+    for index in range(len(self.classes_)):
+      rows = np.nonzero(classes == index)[0]
+      for start in range(0, len(rows), block_rows):
+        self.feature_count_[index] += X.unpack(rows[start:start + block_rows]).sum(axis=0)
+    self._update_log_probabilities()
+    return self
+
+  def _update_log_probabilities(self):
+    #the same smoothing and priors of BernoulliNB
+    self.feature_log_prob_ = np.log(self.feature_count_ + self.alpha) - np.log(self.class_count_ + 2 * self.alpha)[:, None]
+    if self.class_prior is not None:
+      self.class_log_prior_ = np.log(np.asarray(self.class_prior, dtype=np.float64))
+    elif self.fit_prior:
+      self.class_log_prior_ = np.log(self.class_count_) - np.log(self.class_count_.sum())
+    else:
+      self.class_log_prior_ = np.full(len(self.classes_), -np.log(len(self.classes_)))
+
+    #weight tables: bias + Σ x·w, w quantized and split in bit planes
+    negative = np.log1p(-np.exp(self.feature_log_prob_))
+    weights = self.feature_log_prob_ - negative
+    self.bias_ = self.class_log_prior_ + negative.sum(axis=1)
+    self.weight_offset_ = weights.min(axis=1)
+    self.weight_step_ = np.maximum(weights.max(axis=1) - self.weight_offset_, np.finfo(np.float64).tiny) / (2**self.n_bits - 1)
+    quantized = np.rint((weights - self.weight_offset_[:, None]) / self.weight_step_[:, None]).astype(np.uint32)
+    self.weight_planes_ = np.stack([
+      pack_bits(((quantized >> bit) & 1).astype(np.uint8)).words for bit in range(self.n_bits)
+    ], axis=1) #(classes, n_bits, words)
+
+  def joint_log_likelihood(self, X, block_rows=4096):
+    num_classes, n_bits, _ = self.weight_planes_.shape
+    jll = np.empty((len(X), num_classes), dtype=np.float64)
+    for start in range(0, len(X), block_rows):
+      words = X.words[start:start + block_rows]
+      anded = np.empty_like(words) #buffers reused by every plane
+      counts = np.empty(words.shape, dtype=np.uint8)
+      set_features = _popcount(words).sum(axis=1, dtype=np.int64)
+      for index in range(num_classes):
+        total = np.zeros(len(words), dtype=np.int64)
+        for bit in range(n_bits):
+          np.bitwise_and(words, self.weight_planes_[index, bit], out=anded)
+          total += _popcount(anded, out=counts).sum(axis=1, dtype=np.int64) << bit
+        jll[start:start + len(words), index] = self.bias_[index] + self.weight_offset_[index] * set_features + self.weight_step_[index] * total
+    return jll
+
+  def predict(self, X):
+    return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
+
+  def predict_log_proba(self, X):
+    jll = self.joint_log_likelihood(X)
+    maximum = jll.max(axis=1, keepdims=True)
+    return jll - (maximum + np.log(np.exp(jll - maximum).sum(axis=1, keepdims=True)))
+
+  def predict_proba(self, X):
+    return np.exp(self.predict_log_proba(X))
@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn import datasets
+from sklearn.utils import Bunch
+from mlpy.instrument import stage
+
+'''
+Local dataset cache.
+A CSV is fetched (or imported from a local path) only once, than every column is stored
+as a typed .npy file with a columns.json sidecar. Later loads read only the requested columns
+and never parse the CSV or go to the network again.
+The sklearn built-in datasets are converted once in a X.npy/y.npy pair with a meta.json sidecar,
+and opened with memory map: no parsing at startup, and the processes on the same node share the same pages.
+'''
+
+TITANIC_URL = "https://web.stanford.edu/class/archive/cs/cs109/cs109.1166/stuff/titanic.csv"
+
+def get_data_home(data_home=None):
+  '''
+  Folder of the local cache: data_home, else MLPY_DATA_HOME, else ~/mlpy_data (created if missing).
+  '''
+  if data_home is None:
+    data_home = os.environ.get("MLPY_DATA_HOME", os.path.join("~", "mlpy_data"))
+  data_home = os.path.expanduser(data_home)
+  os.makedirs(data_home, exist_ok=True)
+  return data_home
+
+def _publish(tmp_folder, folder):
+  #The cache is written in a temporary folder and renamed, so a concurrent job never sees a partial cache
+  try:
+    os.rename(tmp_folder, folder)
+  except OSError: #another process has already written the cache
+    shutil.rmtree(tmp_folder, ignore_errors=True)
+
+def _write_columns(df, folder):
+  tmp_folder = tempfile.mkdtemp(dir=os.path.dirname(folder))
+  columns = []
+  for i, name in enumerate(df.columns):
+    values = df[name].to_numpy()
+    if values.dtype.kind == 'O':
+      values = values.astype(str) #fixed width unicode, it doesn't need pickle
+    file_name = "col_%d.npy" % i
+    np.save(os.path.join(tmp_folder, file_name), values)
+    columns.append({"name": name, "file": file_name, "dtype": values.dtype.str})
+  with open(os.path.join(tmp_folder, "columns.json"), "w") as f:
+    json.dump({"rows": len(df), "columns": columns}, f)
+  _publish(tmp_folder, folder)
+
+def load_columns(folder, columns=None, mmap_mode=None):
+  '''
+  Load a cached dataset as DataFrame, reading only the files of the requested columns.
+  '''
+  with open(os.path.join(folder, "columns.json")) as f:
+    meta = json.load(f)
+  files = {column["name"]: column["file"] for column in meta["columns"]}
+  if columns is None:
+    columns = list(files)
+  missing = [name for name in columns if name not in files]
+  if missing:
+    raise KeyError("Columns not in cache %s: %s" % (folder, missing))
+  data = {name: np.load(os.path.join(folder, files[name]), mmap_mode=mmap_mode) for name in columns}
+  return pd.DataFrame(data, columns=columns)
+
+def cache_csv(name, source, columns=None, data_home=None):
+  '''
+  Return the CSV source (URL or local path) as DataFrame, through the local columnar cache "name".
+  '''
+  folder = os.path.join(get_data_home(data_home), name)
+  with stage("load", dataset=name):
+    if not os.path.exists(os.path.join(folder, "columns.json")):
+      _write_columns(pd.read_csv(source), folder)
+    return load_columns(folder, columns)
+
+def load_titanic(columns=None, data_home=None, csv_path=None):
+  '''
+  Titanic passengers (Survived, Pclass, Name, Sex, Age, ...).
+  On machines without network set csv_path (or MLPY_TITANIC_CSV) to a local copy of titanic.csv.
+  '''
+  source = csv_path or os.environ.get("MLPY_TITANIC_CSV", TITANIC_URL)
+  return cache_csv("titanic", source, columns=columns, data_home=data_home)
+
+def _write_bunch(bunch, folder):
+  tmp_folder = tempfile.mkdtemp(dir=os.path.dirname(folder))
+  np.save(os.path.join(tmp_folder, "X.npy"), np.ascontiguousarray(bunch.data))
+  np.save(os.path.join(tmp_folder, "y.npy"), np.ascontiguousarray(bunch.target))
+  meta = {"DESCR": bunch.get("DESCR")}
+  for key in ("feature_names", "target_names"):
+    if key in bunch:
+      meta[key] = np.asarray(bunch[key]).tolist()
+  with open(os.path.join(tmp_folder, "meta.json"), "w") as f:
+    json.dump(meta, f)
+  _publish(tmp_folder, folder)
+
+def load_bunch(name, data_home=None, mmap_mode="r"):
+  '''
+  Same Bunch (data, target, feature_names, target_names, DESCR) of sklearn.datasets.load_<name>,
+  but data and target are read-only memory maps of the local cache (zero-copy).
+  '''
+  cache_home = os.path.join(get_data_home(data_home), "sklearn")
+  os.makedirs(cache_home, exist_ok=True)
+  folder = os.path.join(cache_home, name)
+  with stage("load", dataset=name):
+    if not os.path.exists(os.path.join(folder, "meta.json")):
+      _write_bunch(getattr(datasets, "load_" + name)(), folder)
+    with open(os.path.join(folder, "meta.json")) as f:
+      meta = json.load(f)
+    bunch = Bunch(
+      data=np.load(os.path.join(folder, "X.npy"), mmap_mode=mmap_mode),
+      target=np.load(os.path.join(folder, "y.npy"), mmap_mode=mmap_mode),
+      DESCR=meta["DESCR"]
+    )
+  if "feature_names" in meta:
+    bunch.feature_names = meta["feature_names"]
+  if "target_names" in meta:
+    bunch.target_names = np.array(meta["target_names"])
+  return bunch
+
+#Drop-in replacements of the sklearn loaders used by the scripts
+
+def load_digits(data_home=None):
+  return load_bunch("digits", data_home)
+
+def load_breast_cancer(data_home=None):
+  return load_bunch("breast_cancer", data_home)
+
+def load_wine(data_home=None):
+  return load_bunch("wine", data_home)
+
+def load_iris(data_home=None):
+  return load_bunch("iris", data_home)
+
+def load_diabetes(data_home=None):
+  return load_bunch("diabetes", data_home)
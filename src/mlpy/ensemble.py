@@ -0,0 +1,112 @@
+import copy
+import contextlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.pool import process_context, effective_n_jobs, sharing, init_worker, shared
+
+'''
+Random forest grown in batches until the out-of-bag accuracy stops improving.
+RandomForestClassifier trains n_estimators trees chosen up front, one after another;
+here the trees are added in batches of batch_size, trained in parallel by a pool of processes
+(X and Y copied once in shared memory, like mlpy.model_selection.cross_validate_parallel), and after every batch
+the out-of-bag accuracy is updated: every tree votes (predict_proba) for the samples not in its bootstrap sample,
+the votes are summed, so a batch costs only its new trees.
+The growth stops when the best OOB accuracy has not improved by more than tol for patience batches
+(or at max_estimators), and oob_curve_ has the OOB accuracy after every batch.
+The seed of every tree is fixed by random_state, then the trees are the same for any batch_size/n_jobs.
+'''
+
+def _fit_tree(estimator, seed, X=None, Y=None):
+  #fit on a bootstrap sample, returns (tree, out-of-bag rows, predict_proba of the out-of-bag rows)
+  if X is None:
+    X, Y = shared["X"][1], shared["Y"][1]
+  random_generator = np.random.default_rng(seed)
+  rows = random_generator.integers(0, len(X), len(X))
+  out_of_bag = np.setdiff1d(np.arange(len(X)), rows, assume_unique=True)
+  if hasattr(estimator, "random_state"):
+    estimator.random_state = int(random_generator.integers(2**31 - 1)) #random features of the splits
+  estimator.fit(X[rows], Y[rows])
+  return estimator, out_of_bag, estimator.predict_proba(X[out_of_bag]) if len(out_of_bag) else None
+
+class EarlyStoppingForest:
+  '''
+  Forest of copies of estimator (default: the trees of RandomForestClassifier, max_features="sqrt"),
+  with fit(X, Y), predict(X), predict_proba(X), feature_importances_ (when the trees have it),
+  n_estimators_ (trees when it stopped), oob_score_ and oob_curve_ ([{"n_estimators", "oob_accuracy", "oob_coverage"}, ...]).
+  '''
+  def __init__(self, estimator=None, batch_size=16, max_estimators=500, min_estimators=32, patience=3, tol=1e-3,
+    n_jobs=None, random_state=None):
+    self.estimator = estimator
+    self.batch_size = batch_size
+    self.max_estimators = max_estimators
+    self.min_estimators = min_estimators #the OOB accuracy of few trees has only part of the samples
+    self.patience = patience #batches without an improvement > tol before stopping
+    self.tol = tol
+    self.n_jobs = n_jobs #default: num of CPUs (-1 all, like joblib), 1 trains in this process
+    self.random_state = random_state
+
+  def _add(self, tree, out_of_bag, probabilities):
+    self.estimators_.append(tree)
+    if probabilities is not None:
+      #the bootstrap sample of a tree can miss some classes: its columns go in the ones of the forest
+      columns = np.searchsorted(self.classes_, tree.classes_)
+      self._oob_votes[np.ix_(out_of_bag, columns)] += probabilities
+
+  def _batches(self, X, Y, seeds, executor):
+    estimator = self.estimator if self.estimator is not None else DecisionTreeClassifier(max_features="sqrt")
+    for start in range(0, len(seeds), self.batch_size):
+      batch = seeds[start:start + self.batch_size]
+      if executor is None:
+        yield [_fit_tree(copy.deepcopy(estimator), seed, X, Y) for seed in batch]
+      else:
+        yield list(executor.map(_fit_tree, [copy.deepcopy(estimator) for _ in batch], batch))
+
+  def fit(self, X, Y):
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    self.classes_ = np.unique(Y)
+    self.n_features_in_ = X.shape[1]
+    labels = np.searchsorted(self.classes_, Y)
+    seeds = np.random.default_rng(self.random_state).integers(2**31 - 1, size=self.max_estimators)
+    self.estimators_ = []
+    self.oob_curve_ = []
+    self._oob_votes = np.zeros((len(X), len(self.classes_)))
+    best, waiting = -np.inf, 0
+    n_jobs = effective_n_jobs(self.n_jobs, self.batch_size)
+    with contextlib.ExitStack() as stack:
+      executor = None
+      if n_jobs > 1:
+        X_spec, Y_spec = stack.enter_context(sharing(X, Y))
+        executor = stack.enter_context(ProcessPoolExecutor(n_jobs, mp_context=process_context(), initializer=init_worker,
+          initargs=(X_spec, Y_spec)))
+      for batch in self._batches(X, Y, seeds, executor):
+        for tree, out_of_bag, probabilities in batch:
+          self._add(tree, out_of_bag, probabilities)
+        voted = self._oob_votes.sum(axis=1) > 0
+        accuracy = float(np.mean(np.argmax(self._oob_votes[voted], axis=1) == labels[voted])) if voted.any() else 0.0
+        self.oob_curve_.append({"n_estimators": len(self.estimators_), "oob_accuracy": accuracy, "oob_coverage": float(voted.mean())})
+        if accuracy > best + self.tol:
+          best, waiting = accuracy, 0
+        else:
+          waiting += 1
+        if len(self.estimators_) >= self.min_estimators and waiting >= self.patience:
+          break
+    self.n_estimators_ = len(self.estimators_)
+    self.oob_score_ = self.oob_curve_[-1]["oob_accuracy"]
+    del self._oob_votes
+    return self
+
+  def predict_proba(self, X):
+    probabilities = np.zeros((len(X), len(self.classes_)))
+    for tree in self.estimators_:
+      probabilities[:, np.searchsorted(self.classes_, tree.classes_)] += tree.predict_proba(X)
+    return probabilities / len(self.estimators_)
+
+  def predict(self, X):
+    return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+  @property
+  def feature_importances_(self):
+    importances = np.mean([tree.feature_importances_ for tree in self.estimators_], axis=0)
+    return importances / importances.sum() if importances.sum() > 0 else importances
@@ -0,0 +1,72 @@
+import os
+import json
+import mmap
+import tempfile
+import numpy as np
+
+'''
+Flat binary file of named numpy arrays, loaded by memory map.
+  MAGIC (8 bytes) | header length (8 bytes, little endian) | header (JSON) | arrays
+The header is a JSON object of the caller, plus "arrays": (dtype, shape, offset) of every array;
+every array is raw C-order data aligned to 64 bytes, then it can be a view of the file mapped in memory:
+loading reads only the header, the OS reads the pages of an array when they are touched,
+and all the processes on the same node share the same physical pages.
+'''
+
+ALIGNMENT = 64
+
+def _aligned(offset):
+  return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def write_arrays(path, magic, header, arrays):
+  '''
+  Write header (JSON serializable dict) and arrays ({name: numpy.ndarray}) in path.
+  The file is written in a temporary file and renamed, so a process loading it never sees a partial file.
+  '''
+  header = dict(header, arrays={})
+  offset = 0 #relative to the start of the data, that is aligned after the header
+  for key, value in arrays.items():
+    if value.dtype.hasobject:
+      raise TypeError("array %s of dtype object can't be saved" % key)
+    header["arrays"][key] = {"dtype": value.dtype.str, "shape": list(value.shape), "offset": offset}
+    offset = _aligned(offset + value.nbytes)
+  header_bytes = json.dumps(header).encode("utf-8")
+  data_start = _aligned(len(magic) + 8 + len(header_bytes))
+
+  folder = os.path.dirname(os.path.abspath(path))
+  file_descriptor, tmp_path = tempfile.mkstemp(dir=folder)
+  try:
+    with os.fdopen(file_descriptor, "wb") as f:
+      f.write(magic)
+      f.write(len(header_bytes).to_bytes(8, "little"))
+      f.write(header_bytes)
+      for key, value in arrays.items():
+        f.seek(data_start + header["arrays"][key]["offset"])
+        f.write(np.ascontiguousarray(value).data)
+      f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+  except BaseException:
+    os.unlink(tmp_path)
+    raise
+
+def read_arrays(path, magic, mmap_mode=True):
+  '''
+  (header, {name: numpy.ndarray}) of a file written by write_arrays with the same magic.
+  With mmap_mode the arrays are read-only views of the file mapped in memory, else they are read in memory.
+  '''
+  with open(path, "rb") as f:
+    if f.read(len(magic)) != magic:
+      raise ValueError("%s is not a %s file" % (path, magic.decode("ascii", "replace")))
+    header_length = int.from_bytes(f.read(8), "little")
+    header = json.loads(f.read(header_length).decode("utf-8"))
+    data_start = _aligned(len(magic) + 8 + header_length)
+    if mmap_mode:
+      buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) #the mapping stays valid after the file is closed
+    else:
+      f.seek(0)
+      buffer = bytearray(f.read())
+  arrays = {}
+  for key, spec in header.pop("arrays").items():
+    count = int(np.prod(spec["shape"]))
+    arrays[key] = np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=count, offset=data_start + spec["offset"]).reshape(spec["shape"])
+  return header, arrays
@@ -0,0 +1,166 @@
+import numpy as np
+import scipy.sparse as sp
+from mlpy.flatfile import write_arrays, read_arrays
+
+'''
+Forest flattened in contiguous arrays, for batch predictions.
+RandomForestClassifier.predict_proba calls predict_proba of every tree (a Python call for every tree, then the sum);
+flatten_forest exports the nodes of all the trees in the same arrays (node ids of the forest):
+- feature_: int16 (int32 with more than 32767 features) feature of the split
+- threshold_: float32, x <= threshold goes left (rounded down from the float64 thresholds of sklearn,
+  so for float32 x, as sklearn compares, the result is the same)
+- children_: int32 left child, the right one is the next node (the nodes of every tree are in breadth first order,
+  with the two children of a node one after the other); a leaf is its own child with threshold +inf
+- value_: float32 class fractions of the node (in the columns of the classes of the forest)
+- roots_: int32 root of every tree
+Then FlatForest.predict_proba moves all the trees one level down at a time for a block of rows:
+nodes is (rows, trees), and every level is nodes = children_[nodes] + (x[feature_[nodes]] > threshold_[nodes]),
+a few gathers without branches; after max_depth_ levels all the rows are in a leaf (the leaves stay where they are)
+and the mean of the values of the leaves (a sparse matrix product) is the probability of the forest.
+It's faster for single rows and small batches (no Python call for every tree): on the digits forest of 100 trees
+~25x for 1 row, ~4x for 256 rows, the same around 2048 rows, and slower for larger batches, where the trees of sklearn
+(a compiled loop for every tree) are faster. Then the FlatForest of flatten_forest keeps the forest and calls
+forest.predict_proba for the batches over fallback_rows rows (default 2048).
+The arrays can be saved in a flat file and loaded by memory map (save_forest/load_forest): a loaded FlatForest
+has no forest, and it's better used for latency and small batches.
+'''
+
+MAGIC = b"MLPYRFF1"
+ARRAYS = ("feature_", "threshold_", "children_", "value_", "roots_", "depths_")
+
+def _tree_arrays(tree):
+  #(feature, threshold, left, right, value) of a fitted DecisionTreeClassifier or mlpy.tree.HistogramTreeClassifier
+  if hasattr(tree, "tree_"):
+    structure = tree.tree_
+    value = structure.value[:, 0, :]
+    return structure.feature, structure.threshold, structure.children_left, structure.children_right, value
+  return tree.feature_, tree.threshold_, tree.children_left_, tree.children_right_, tree.value_
+
+def _float32_below(threshold):
+  #largest float32 <= threshold: for float32 x, x <= threshold ⇔ x <= this one
+  rounded = threshold.astype(np.float32)
+  above = rounded.astype(np.float64) > threshold
+  rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+  return rounded
+
+def _breadth_first(left, right):
+  #order of the nodes by levels, with the two children of a node one after the other (root 0)
+  order = [np.zeros(1, dtype=np.intp)]
+  while True:
+    parents = order[-1][left[order[-1]] >= 0]
+    if not len(parents):
+      break
+    order.append(np.stack([left[parents], right[parents]], axis=1).ravel())
+  return np.concatenate(order)
+
+class FlatForest:
+  '''
+  predict_proba(X)/predict(X) of the flattened forest (same results of the forest).
+  With forest, the batches over fallback_rows rows are predicted by forest.predict_proba.
+  '''
+  def __init__(self, classes, n_features, arrays, forest=None, fallback_rows=None):
+    self.classes_ = classes
+    self.n_features_in_ = n_features
+    self.forest = forest
+    self.fallback_rows = fallback_rows
+    for key, value in arrays.items():
+      setattr(self, key, value)
+    self.max_depth_ = int(self.depths_.max()) if len(self.depths_) else 0
+
+  @property
+  def n_estimators(self):
+    return len(self.roots_)
+
+  @property
+  def nbytes(self):
+    return sum(getattr(self, key).nbytes for key in ARRAYS)
+
+  def apply(self, X, block_rows=256):
+    '''
+    (rows, trees) leaf of every row in every tree.
+    '''
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    leaves = np.empty((len(X), self.n_estimators), dtype=np.int32)
+    for start in range(0, len(X), block_rows):
+      leaves[start:start + block_rows] = self._apply_block(X[start:start + block_rows])
+    return leaves
+
+  def _apply_block(self, X):
+    #small blocks: the (rows, trees) arrays of every level stay in the CPU cache
+    nodes = np.broadcast_to(self.roots_.astype(np.intp), (len(X), self.n_estimators)).copy() #intp, no cast in take
+    values = X.ravel()
+    row_offsets = (np.arange(len(X), dtype=np.intp) * X.shape[1])[:, None] #x[feature] of every row in the flat X
+    for _ in range(self.max_depth_):
+      goes_right = values.take(row_offsets + self.feature_.take(nodes)) > self.threshold_.take(nodes)
+      np.add(self.children_.take(nodes), goes_right, out=nodes)
+    return nodes
+
+  def predict_proba(self, X, block_rows=4096):
+    if self.forest is not None and self.fallback_rows is not None and len(X) > self.fallback_rows:
+      return self.forest.predict_proba(X)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    probabilities = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+    for start in range(0, len(X), block_rows):
+      leaves = self.apply(X[start:start + block_rows])
+      #sum of the values of the leaves of every row: (rows, nodes) matrix with a 1 for every leaf @ value_
+      leaf_matrix = sp.csr_matrix((np.ones(leaves.size), leaves.ravel(), np.arange(0, leaves.size + 1, self.n_estimators)),
+        shape=(len(leaves), len(self.value_)))
+      probabilities[start:start + len(leaves)] = leaf_matrix @ self.value_
+    return probabilities / self.n_estimators
+
+  def predict(self, X):
+    return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+def flatten_forest(forest, fallback_rows=2048):
+  '''
+  FlatForest of a fitted forest of classification trees: RandomForestClassifier, ExtraTreesClassifier,
+  mlpy.ensemble.EarlyStoppingForest (of DecisionTreeClassifier or HistogramTreeClassifier).
+  The batches over fallback_rows rows are predicted by the forest (None: always by the flat arrays).
+  '''
+  classes = np.asarray(forest.classes_)
+  parts = {"feature_": [], "threshold_": [], "children_": [], "value_": [], "roots_": [], "depths_": []}
+  offset = 0
+  for tree in forest.estimators_:
+    feature, threshold, left, right, value = _tree_arrays(tree)
+    order = _breadth_first(left, right)
+    positions = np.empty(len(order), dtype=np.intp)
+    positions[order] = np.arange(len(order))
+    leaf = left[order] < 0
+    parts["feature_"].append(np.where(leaf, 0, feature[order]))
+    parts["threshold_"].append(np.where(leaf, np.inf, threshold[order]))
+    parts["children_"].append(np.where(leaf, np.arange(len(order)), positions[left[order]]) + offset)
+    #the fractions of the classes of the tree in the columns of the forest: the trees of the sklearn forests are fitted
+    #on the encoded labels (classes_ 0..k-1, columns already in the order of forest.classes_), the ones of EarlyStoppingForest
+    #on the labels of a bootstrap sample (real classes_, some can be missing)
+    tree_value = np.zeros((len(order), len(classes)))
+    columns = np.arange(len(classes)) if len(tree.classes_) == len(classes) else np.searchsorted(classes, tree.classes_)
+    tree_value[:, columns] = value[order] / value[order].sum(axis=1, keepdims=True)
+    parts["value_"].append(tree_value)
+    parts["roots_"].append(offset)
+    parts["depths_"].append(tree.get_depth())
+    offset += len(order)
+  n_features = forest.n_features_in_
+  arrays = {
+    "feature_": np.concatenate(parts["feature_"]).astype(np.int16 if n_features <= np.iinfo(np.int16).max else np.int32),
+    "threshold_": _float32_below(np.concatenate(parts["threshold_"]).astype(np.float64)),
+    "children_": np.concatenate(parts["children_"]).astype(np.int32),
+    "value_": np.concatenate(parts["value_"]).astype(np.float32),
+    "roots_": np.array(parts["roots_"], dtype=np.int32),
+    "depths_": np.array(parts["depths_"], dtype=np.int32)
+  }
+  return FlatForest(classes, n_features, arrays, forest, fallback_rows)
+
+def save_forest(path, flat_forest):
+  '''
+  Save a FlatForest in path (mlpy.flatfile format).
+  '''
+  arrays = {key: getattr(flat_forest, key) for key in ARRAYS}
+  arrays["classes"] = flat_forest.classes_
+  write_arrays(path, MAGIC, {"n_features": flat_forest.n_features_in_}, arrays)
+
+def load_forest(path, mmap_mode=True):
+  '''
+  FlatForest saved by save_forest, with the arrays mapped in memory (mmap_mode) or read.
+  '''
+  header, arrays = read_arrays(path, MAGIC, mmap_mode)
+  return FlatForest(arrays.pop("classes"), header["n_features"], arrays)
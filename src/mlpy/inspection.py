@@ -0,0 +1,64 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.metrics import accuracy_score
+from sklearn.utils import Bunch
+from mlpy.pool import process_context, effective_n_jobs, sharing, attach
+
+'''
+Parallel permutation importance: how much the score of a fitted model drops when the values of a feature are shuffled
+(not biased toward the features with many distinct values, as the impurity importance of the trees).
+- the baseline score (the model on X not permuted) is computed once
+- the features are scored in parallel by a pool of processes: X and Y are copied once in shared memory,
+  every worker makes its own copy of X once, then for every permutation it writes only the shuffled column
+  and puts back the original one after the predictions (no copy of X for every permutation)
+- every (feature, repeat) has its own random generator, spawned from random_state by numpy.random.SeedSequence:
+  independent permutations, and the same results for any n_jobs
+'''
+
+_worker = {} #in the worker: estimator, scoring, private copy of X, Y
+
+def _init_worker(estimator, scoring, X_spec, Y_spec):
+  memories = [attach(X_spec), attach(Y_spec)]
+  _worker.update(estimator=estimator, scoring=scoring, X=memories[0][1].copy(), Y=memories[1][1].copy())
+  for memory, _ in memories:
+    memory.close()
+
+def _permuted_scores(feature, seeds, estimator=None, scoring=None, X=None, Y=None):
+  #scores of the model with the column feature shuffled, one for every seed
+  if X is None:
+    estimator, scoring, X, Y = _worker["estimator"], _worker["scoring"], _worker["X"], _worker["Y"]
+  column = X[:, feature].copy()
+  scores = []
+  try:
+    for seed in seeds:
+      X[:, feature] = column[np.random.default_rng(seed).permutation(len(column))]
+      scores.append(scoring(Y, estimator.predict(X)))
+  finally:
+    X[:, feature] = column
+  return scores
+
+def permutation_importance(estimator, X, Y, scoring=accuracy_score, n_repeats=5, n_jobs=None, random_state=None):
+  '''
+  Permutation importance of every feature for the fitted estimator, scoring(Y, Y_predicted) the higher the better.
+  Returns a Bunch like sklearn.inspection.permutation_importance: importances (features, repeats) =
+  baseline_score − permuted score, importances_mean, importances_std, and baseline_score.
+  n_jobs: processes like joblib (default: num of CPUs, -1 all the CPUs), 1 runs in this process.
+  '''
+  X = np.array(X) #own copy, the columns are permuted in place
+  Y = np.asarray(Y)
+  num_features = X.shape[1]
+  baseline_score = scoring(Y, estimator.predict(X))
+  seeds = np.random.SeedSequence(random_state).spawn(num_features * n_repeats)
+  seeds = [seeds[feature * n_repeats:(feature + 1) * n_repeats] for feature in range(num_features)]
+
+  n_jobs = effective_n_jobs(n_jobs, num_features)
+  if n_jobs == 1:
+    scores = [_permuted_scores(feature, seeds[feature], estimator, scoring, X, Y) for feature in range(num_features)]
+  else:
+    with sharing(X, Y) as (X_spec, Y_spec):
+      with ProcessPoolExecutor(n_jobs, mp_context=process_context(), initializer=_init_worker,
+        initargs=(estimator, scoring, X_spec, Y_spec)) as executor:
+        scores = list(executor.map(_permuted_scores, range(num_features), seeds))
+  importances = baseline_score - np.array(scores)
+  return Bunch(importances=importances, importances_mean=importances.mean(axis=1), importances_std=importances.std(axis=1),
+    baseline_score=baseline_score)
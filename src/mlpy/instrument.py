@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import runpy
+import inspect
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+'''
+Per-stage instrumentation (load, split, scale, vectorize, fit, predict, predict_proba, metric, ...).
+It is enabled by MLPY_TRACE=<file.jsonl>: every stage appends to the file a JSON line with
+wall time, CPU time and tracemalloc peak (bytes allocated over the start of the stage).
+When MLPY_TRACE is not set stage() does nothing, and tracemalloc (that slows down python) is never started.
+
+with stage("fit", model="MultinomialNB"):
+  multinomial.fit(X_train_vector, Y_train)
+
+The steps of a stage are given as info, e.g. stage("vectorize", step="tokenize").
+
+The scripts without stage() are instrumented by instrument_sklearn, that wraps train_test_split ("split"),
+the metrics of sklearn.metrics ("metric"), the cross validations ("cross_validate") and fit/predict/transform/...
+of all the sklearn estimators (and of the estimators of mlpy), recording only the calls that are not already inside a stage (RandomForestClassifier.fit is one "fit",
+not one for every tree). python -m mlpy trace <script> runs a script with them:
+
+MLPY_TRACE=trace.jsonl PYTHONPATH=src python -m mlpy trace src/supervised-learning/regression/linear/ridge-regression.py
+'''
+
+TRACE = os.environ.get("MLPY_TRACE")
+
+_stack = [] #open stages, for the peaks of nested stages
+
+def _write(record):
+  #one write in append mode for every line, then more processes can use the same file
+  with open(TRACE, "a") as f:
+    f.write(json.dumps(record) + "\n")
+
+@contextmanager
+def stage(name, **info):
+  '''
+  Measure the block as stage "name", info is added to the record (e.g. model, rows).
+  '''
+  if not TRACE:
+    yield
+    return
+  if not tracemalloc.is_tracing():
+    tracemalloc.start()
+  current, peak = tracemalloc.get_traced_memory()
+  if _stack: #the peak of the parent until now, before the reset
+    _stack[-1]["peak"] = max(_stack[-1]["peak"], peak)
+  tracemalloc.reset_peak()
+  frame = {"base": current, "peak": current}
+  _stack.append(frame)
+  wall_start, cpu_start = time.perf_counter(), time.process_time()
+  try:
+    yield
+  finally:
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+    _stack.pop()
+    peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+    if _stack:
+      _stack[-1]["peak"] = max(_stack[-1]["peak"], peak)
+    tracemalloc.reset_peak()
+    record = {
+      "script": os.path.basename(sys.argv[0]),
+      "pid": os.getpid(),
+      "stage": name,
+      "wall_time": wall_time,
+      "cpu_time": cpu_time,
+      "peak_memory": peak - frame["base"]
+    }
+    record.update(info)
+    _write(record)
+
+#Methods of the estimators => stage (the fit of the vectorizers and of the scalers is "vectorize"/"scale", like the stages of the scripts)
+METHODS = ("fit", "partial_fit", "fit_transform", "fit_predict", "transform", "predict", "predict_proba", "predict_log_proba",
+  "decision_function", "score", "kneighbors")
+
+#Modules of mlpy with estimators
+MLPY_MODULES = ("mlpy.ensemble", "mlpy.tree", "mlpy.flatforest", "mlpy.bitpacked", "mlpy.online", "mlpy.text", "mlpy.vocabulary",
+  "mlpy.neighbors.brute", "mlpy.neighbors.ivf", "mlpy.neighbors.quantized")
+
+#module: {function: stage}, the functions that run many fits/predictions are one stage (cross validation, ...)
+FUNCTIONS = {
+  "sklearn.model_selection": {"train_test_split": "split", "cross_val_score": "cross_validate", "cross_validate": "cross_validate",
+    "cross_val_predict": "cross_validate"},
+  "sklearn.inspection": {"permutation_importance": "importance"},
+  "sklearn.feature_selection": {"mutual_info_classif": "feature_selection", "mutual_info_regression": "feature_selection"},
+  "mlpy.model_selection": {"cross_validate_parallel": "cross_validate", "cross_validate_gram": "cross_validate"},
+  "mlpy.inspection": {"permutation_importance": "importance"},
+  "mlpy.neighbors": {"kneighbors_sweep": "kneighbors"}
+}
+
+def _estimator_stage(estimator, method):
+  module = type(estimator).__module__
+  if method in ("fit", "partial_fit", "fit_transform", "transform"):
+    if module.startswith(("sklearn.feature_extraction", "mlpy.text", "mlpy.vocabulary")):
+      return "vectorize"
+    if module.startswith("sklearn.preprocessing"):
+      return "scale"
+  return "fit" if method in ("fit", "partial_fit", "fit_predict") else method
+
+def _num_rows(args):
+  shape = getattr(args[0], "shape", None) if args else None
+  return int(shape[0]) if shape else None
+
+def _traced(function, stage_name=None, method=None):
+  #function recorded as a stage, when it is not called inside another stage
+  @functools.wraps(function)
+  def traced(*args, **kwargs):
+    if _stack or not TRACE:
+      return function(*args, **kwargs)
+    if method is not None:
+      info = {"model": type(args[0]).__name__}
+      rows = _num_rows(args[1:])
+      name = _estimator_stage(args[0], method)
+    else:
+      info = {"metric": function.__name__} if stage_name == "metric" else {"function": function.__name__}
+      rows = _num_rows(args)
+      name = stage_name
+    if rows is not None:
+      info["rows"] = rows
+    with stage(name, **info):
+      return function(*args, **kwargs)
+  traced.__mlpy_traced__ = True
+  return traced
+
+def _trace_function(module, name, stage_name):
+  #the wrapper replaces the function also in the module that defines it, so pickle (e.g. a scoring sent to a pool) finds it
+  function = getattr(module, name)
+  if getattr(function, "__mlpy_traced__", False):
+    return
+  traced = _traced(function, stage_name)
+  setattr(module, name, traced)
+  defining_module = sys.modules.get(function.__module__)
+  if defining_module is not None and getattr(defining_module, function.__name__, None) is function:
+    setattr(defining_module, function.__name__, traced)
+
+def instrument_sklearn():
+  '''
+  Record train_test_split, the metrics, the cross validations and the methods of the sklearn (and mlpy) estimators
+  as stages (once per process).
+  It must be called before the script imports them (from sklearn.metrics import accuracy_score copies the function).
+  '''
+  import importlib
+  import sklearn.metrics
+  from sklearn.utils import all_estimators
+  for module_name, functions in FUNCTIONS.items():
+    module = importlib.import_module(module_name)
+    for name, stage_name in functions.items():
+      _trace_function(module, name, stage_name)
+  for name in sklearn.metrics.__all__:
+    if inspect.isfunction(getattr(sklearn.metrics, name)) and not name.startswith(("get_", "make_", "check_", "pairwise", "euclidean", "nan_euclidean")):
+      _trace_function(sklearn.metrics, name, "metric")
+  #Every method is wrapped once, in the class that defines it (the subclasses inherit the wrapper)
+  estimators = [estimator for _, estimator in all_estimators()]
+  for module in map(importlib.import_module, MLPY_MODULES):
+    estimators += [value for value in vars(module).values() if inspect.isclass(value) and value.__module__ == module.__name__]
+  classes = {klass for estimator in estimators for klass in estimator.__mro__ if klass.__module__.startswith(("sklearn.", "mlpy."))}
+  for klass in classes:
+    for method in METHODS:
+      value = klass.__dict__.get(method)
+      if inspect.isfunction(value) and not getattr(value, "__mlpy_traced__", False):
+        setattr(klass, method, _traced(value, method=method))
+      elif inspect.isfunction(getattr(value, "fn", None)) and not getattr(value.fn, "__mlpy_traced__", False):
+        value.fn = _traced(value.fn, method=method) #available_if (e.g. SVC.predict_proba)
+
+def run_script(path, argv=()):
+  '''
+  Execute the script at path as __main__ (like python path argv...) with the sklearn stages recorded.
+  '''
+  instrument_sklearn()
+  sys.argv = [path] + list(argv)
+  sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+  runpy.run_path(path, run_name="__main__")
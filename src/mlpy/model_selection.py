@@ -0,0 +1,162 @@
+import numpy as np
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression, Ridge
+from mlpy.pool import process_context, effective_n_jobs, sharing, init_worker, shared
+
+'''
+Parallel K-fold cross validation.
+X and Y are copied once in shared memory, than every fold is executed by a process of the pool:
+the worker attaches to the shared memory and takes the rows of the fold from the indexes
+(a view when the indexes are a contiguous range, e.g. the validation folder of KFold without shuffle,
+else a copy, the train rows in a buffer of the worker reused by all its folds),
+and it sends back only the score and the fitted model of the fold.
+
+Closed-form K-fold cross validation for LinearRegression and Ridge.
+The least squares solution depends only on XᵀX and Xᵀy: they are computed once on all rows,
+than for every fold the rows of the validation folder are subtracted (downdating) and the result is centered
+on the mean of the train rows, and the fold costs a p×p solve instead of a n×p decomposition.
+'''
+
+def _is_range(indexes):
+  return len(indexes) and indexes[-1] - indexes[0] + 1 == len(indexes) and np.all(np.diff(indexes) == 1)
+
+def take_rows(array, indexes):
+  '''
+  array[indexes], but a view (no copy) when the indexes are a contiguous increasing range.
+  '''
+  if _is_range(indexes):
+    return array[indexes[0]:indexes[-1] + 1]
+  return array[indexes]
+
+_buffers = {} #in the worker: name => buffer of the train rows, reused by all the folds of the worker
+
+def _train_rows(name, array, indexes):
+  #array[indexes] copied in the buffer of the worker (allocated at the first fold), a view when the indexes are a range
+  if _is_range(indexes):
+    return take_rows(array, indexes)
+  buffer = _buffers.get(name)
+  if buffer is None or len(buffer) < len(indexes) or buffer.shape[1:] != array.shape[1:] or buffer.dtype != array.dtype:
+    buffer = _buffers[name] = np.empty((len(indexes),) + array.shape[1:], dtype=array.dtype)
+  return np.take(array, indexes, axis=0, out=buffer[:len(indexes)])
+
+def _run_fold(estimator, train_indexes, validation_indexes, scoring):
+  X = shared["X"][1]
+  Y = shared["Y"][1]
+  #the model is sent back (pickled) before the next fold overwrites the buffer, also when it keeps a reference to X
+  estimator.fit(_train_rows("X", X, train_indexes), _train_rows("Y", Y, train_indexes))
+  Y_validation_predicted = estimator.predict(take_rows(X, validation_indexes))
+  return scoring(take_rows(Y, validation_indexes), Y_validation_predicted), estimator
+
+def cross_validate_parallel(estimator, X, Y, cv, scoring, n_jobs=None, memory_budget=2**30):
+  '''
+  Fit a clone of estimator on every fold of cv.split(X) in a pool of n_jobs processes (default: num of CPUs).
+  Returns (scores, models) in the order of the folds, score is scoring(y_validation, y_validation_predicted).
+  The train rows of KFold are never one contiguous range (with shuffle they are scattered, without shuffle they are
+  the rows before and after the validation folder), and the estimators need them in one array: every worker gathers
+  them in a buffer allocated once and reused by all its folds, (k-1)/k of X (about 90% with 10 folds).
+  The workers are at most memory_budget / bytes of a buffer (at least 1), then the peak memory is X in shared memory
+  plus at most memory_budget of buffers, instead of a new copy for every fold.
+  '''
+  folds = list(cv.split(X))
+  n_jobs = effective_n_jobs(n_jobs, len(folds))
+  if memory_budget is not None:
+    max_train_rows = max(len(train_indexes) for train_indexes, _ in folds)
+    row_bytes = (np.asarray(X).nbytes + np.asarray(Y).nbytes) / max(len(X), 1)
+    n_jobs = max(1, min(n_jobs, int(memory_budget // max(max_train_rows * row_bytes, 1))))
+  with sharing(X, Y) as (X_spec, Y_spec):
+    with ProcessPoolExecutor(n_jobs, mp_context=process_context(), initializer=init_worker, initargs=(X_spec, Y_spec)) as executor:
+      futures = [
+        executor.submit(_run_fold, clone(estimator), train_indexes, validation_indexes, scoring)
+        for train_indexes, validation_indexes in folds
+      ]
+      results = [future.result() for future in futures]
+  scores = np.array([score for score, _ in results])
+  models = [model for _, model in results]
+  return scores, models
+
+def _solve(A, b, alpha):
+  if alpha > 0: #Ridge: A is positive definite
+    try:
+      return np.linalg.solve(A, b)
+    except np.linalg.LinAlgError:
+      pass
+  #LinearRegression (or singular A): minimum norm solution of the centered problem, like LinearRegression
+  return np.linalg.lstsq(A, b, rcond=None)[0]
+
+def _moments(X, Y, rows, X_mean, Y_mean, block_size=65536):
+  #XᵀX, Xᵀy and the column sums of X and y of the rows, centered on X_mean/Y_mean, computed in blocks of rows
+  num_features = X.shape[1]
+  gram = np.zeros((num_features, num_features))
+  moment = np.zeros(num_features)
+  X_sum = np.zeros(num_features)
+  Y_sum = 0.0
+  for start in range(0, len(rows), block_size):
+    block = rows[start:start + block_size]
+    X_block = take_rows(X, block) - X_mean
+    Y_block = take_rows(Y, block) - Y_mean
+    gram += X_block.T @ X_block
+    moment += X_block.T @ Y_block
+    X_sum += X_block.sum(axis=0)
+    Y_sum += Y_block.sum()
+  return gram, moment, X_sum, Y_sum
+
+def _gram_supported(estimator, X, Y):
+  #The closed form is the exact solution only for dense X, 1-D y, scalar alpha and no constraints on the coefficients
+  return not sparse.issparse(X) and np.ndim(Y) == 1 and np.ndim(getattr(estimator, "alpha", 0.0)) == 0 \
+    and not getattr(estimator, "positive", False)
+
+def _cross_validate_fits(estimator, X, Y, cv, scoring):
+  #Generic path: a clone of estimator fitted on the train rows of every fold
+  scores = []
+  models = []
+  for train_indexes, validation_indexes in cv.split(X):
+    model = clone(estimator).fit(take_rows(X, train_indexes), take_rows(Y, train_indexes))
+    scores.append(scoring(take_rows(Y, validation_indexes), model.predict(take_rows(X, validation_indexes))))
+    models.append(model)
+  return np.array(scores), models
+
+def cross_validate_gram(estimator, X, Y, cv, scoring):
+  '''
+  Same scores of fitting estimator (LinearRegression or Ridge, with their alpha/fit_intercept) on every fold of cv.split(X),
+  from the sufficient statistics XᵀX and Xᵀy. Returns (scores, models) in the order of the folds.
+  The estimators that the closed form can't reproduce (positive=True, alpha for every target, sparse X, 2-D Y)
+  are fitted on every fold like cross_validate, the solver parameters are ignored (the solution is the same).
+  '''
+  if not isinstance(estimator, (LinearRegression, Ridge)):
+    raise TypeError("cross_validate_gram supports only LinearRegression and Ridge, not %s" % type(estimator).__name__)
+  if not _gram_supported(estimator, X, Y):
+    return _cross_validate_fits(estimator, X, Y, cv, scoring)
+  alpha = float(getattr(estimator, "alpha", 0.0))
+  fit_intercept = estimator.fit_intercept
+  X = np.asarray(X, dtype=np.float64)
+  Y = np.asarray(Y, dtype=np.float64)
+  num_rows, num_features = X.shape
+  #Centering on the mean of all rows improves the conditioning of XᵀX, then every fold is centered on the mean of its
+  #train rows (the intercept is not regularized): XᵀX - n·d·dᵀ and Xᵀy - n·d·e, d and e the shifts of the means
+  X_mean = X.mean(axis=0) if fit_intercept else np.zeros(num_features)
+  Y_mean = Y.mean() if fit_intercept else 0.0
+  gram, moment, X_sum, Y_sum = _moments(X, Y, np.arange(num_rows), X_mean, Y_mean)
+  penalty = alpha * np.eye(num_features)
+  scores = []
+  models = []
+  for train_indexes, validation_indexes in cv.split(X):
+    if len(train_indexes) + len(validation_indexes) == num_rows: #train = all rows - validation rows
+      validation_gram, validation_moment, validation_X_sum, validation_Y_sum = _moments(X, Y, validation_indexes, X_mean, Y_mean)
+      train_gram, train_moment = gram - validation_gram, moment - validation_moment
+      train_X_sum, train_Y_sum = X_sum - validation_X_sum, Y_sum - validation_Y_sum
+    else: #e.g. ShuffleSplit with train_size, the rows of the fold are not all the rows
+      train_gram, train_moment, train_X_sum, train_Y_sum = _moments(X, Y, train_indexes, X_mean, Y_mean)
+    num_train = len(train_indexes)
+    X_shift = train_X_sum / num_train if fit_intercept else np.zeros(num_features)
+    Y_shift = train_Y_sum / num_train if fit_intercept else 0.0
+    train_gram = train_gram - num_train * np.outer(X_shift, X_shift)
+    train_moment = train_moment - num_train * X_shift * Y_shift
+    model = clone(estimator)
+    model.coef_ = _solve(train_gram + penalty, train_moment, alpha)
+    model.intercept_ = float(Y_mean + Y_shift - (X_mean + X_shift) @ model.coef_) if fit_intercept else 0.0
+    model.n_features_in_ = num_features
+    scores.append(scoring(take_rows(Y, validation_indexes), model.predict(take_rows(X, validation_indexes))))
+    models.append(model)
+  return np.array(scores), models
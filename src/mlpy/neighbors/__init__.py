@@ -0,0 +1,10 @@
+'''
+Nearest neighbors helpers for the K-NN scripts.
+'''
+from mlpy.neighbors.sweep import kneighbors_sweep, vote
+from mlpy.neighbors.brute import BlockedNearestNeighbors
+from mlpy.neighbors.ivf import IVFNearestNeighbors
+from mlpy.neighbors.quantized import QuantizedNearestNeighbors
+from mlpy.neighbors.store import save_knn, load_knn
+
+__all__ = ["kneighbors_sweep", "vote", "BlockedNearestNeighbors", "IVFNearestNeighbors", "QuantizedNearestNeighbors", "save_knn", "load_knn"]
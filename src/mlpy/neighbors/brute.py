@@ -0,0 +1,106 @@
+import numpy as np
+
+'''
+Brute-force K-NN engine in blocks, for euclidean distance (minkowski with p=2).
+The squared distances of a tile of query rows × reference rows are computed with
+‖x‖² − 2x·y + ‖y‖² (the product x·y is a matrix product on BLAS), and every query row
+keeps a running top-K merged tile by tile. The size of the tiles comes from memory_budget,
+so the memory doesn't grow with num of queries × num of references.
+'''
+
+def exclude_self(distances, indexes, return_distance=True):
+  '''
+  The K+1 neighbors of every reference point (kneighbors of the reference points themselves) without the point,
+  like sklearn kneighbors(X=None): the column of its own index is removed, or the first column when a duplicate
+  point at distance 0 took its place in the top K+1.
+  '''
+  keep = indexes != np.arange(len(indexes))[:, None]
+  keep[keep.all(axis=1), 0] = False
+  shape = (len(indexes), indexes.shape[1] - 1)
+  indexes = indexes[keep].reshape(shape)
+  return (distances[keep].reshape(shape), indexes) if return_distance else indexes
+
+class BlockedNearestNeighbors:
+  '''
+  fit(X) stores the reference points, kneighbors(X, n_neighbors) returns (distances, indexes) sorted by distance,
+  like sklearn NearestNeighbors(metric='minkowski'). Without X the neighbors of every reference point exclude the point itself.
+  '''
+  def __init__(self, n_neighbors=5, memory_budget=256 * 2**20):
+    self.n_neighbors = n_neighbors
+    self.memory_budget = memory_budget #bytes for a tile of distances (and its temporary arrays)
+
+  def fit(self, X, y=None):
+    self.X_fit_ = np.ascontiguousarray(X, dtype=np.float64)
+    self.norms_fit_ = np.einsum("ij,ij->i", self.X_fit_, self.X_fit_)
+    return self
+
+  def tile_shape(self, num_queries, n_neighbors):
+    '''
+    (query rows, reference rows) of a tile: every element of the tile costs 8 bytes of distance
+    and 8 bytes of index for the partition, plus the running top-K of the query rows.
+    '''
+    num_references = len(self.norms_fit_)
+    tile_elements = max(self.memory_budget // 16, 2 * n_neighbors)
+    reference_rows = min(num_references, max(2 * n_neighbors, int(np.sqrt(tile_elements))))
+    query_rows = min(num_queries, max(1, tile_elements // (reference_rows + 2 * n_neighbors)))
+    return query_rows, reference_rows
+
+  @staticmethod
+  def _top_k(distances, indexes, n_neighbors):
+    #the n_neighbors smallest distances of every row (not sorted)
+    if distances.shape[1] <= n_neighbors:
+      return distances, indexes
+    part = np.argpartition(distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+    return np.take_along_axis(distances, part, axis=1), np.take_along_axis(indexes, part, axis=1)
+
+  def _prepare_queries(self, queries):
+    #(−2x, ‖x‖²): the tile is −2x·y + ‖y‖², ‖x‖² is the same for all the row, it's added only to the final top-K
+    return -2 * queries, np.einsum("ij,ij->i", queries, queries)[:, None]
+
+  def _references(self, start, stop):
+    return self.X_fit_[start:stop]
+
+  def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+    n_neighbors = n_neighbors or self.n_neighbors
+    if X is None: #the reference points themselves, every one without itself
+      return exclude_self(*self.kneighbors(self.X_fit_, n_neighbors + 1), return_distance)
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    num_references = len(self.norms_fit_)
+    if n_neighbors > num_references:
+      raise ValueError("n_neighbors=%d is greater than the num of reference points %d" % (n_neighbors, num_references))
+    query_rows, reference_rows = self.tile_shape(X.shape[0], n_neighbors)
+    distances = np.empty((X.shape[0], n_neighbors))
+    indexes = np.empty((X.shape[0], n_neighbors), dtype=np.intp)
+    for query_start in range(0, X.shape[0], query_rows):
+      queries = X[query_start:query_start + query_rows]
+      queries_scaled, query_norms = self._prepare_queries(queries)
+      best_distances = np.full((len(queries), 0), np.inf)
+      best_indexes = np.empty((len(queries), 0), dtype=np.intp)
+      for reference_start in range(0, num_references, reference_rows):
+        references = self._references(reference_start, reference_start + reference_rows)
+        tile = queries_scaled @ references.T
+        tile += self.norms_fit_[reference_start:reference_start + reference_rows]
+        if best_distances.shape[1] < n_neighbors: #the top-K is not full yet, all the tile is a candidate
+          tile_indexes = np.broadcast_to(np.arange(reference_start, reference_start + len(references)), tile.shape)
+          best_distances, best_indexes = self._top_k(np.hstack([best_distances, tile]), np.hstack([best_indexes, tile_indexes]), n_neighbors)
+          continue
+        #Only the distances smaller than the current K-th distance of the row can enter the top-K
+        rows, columns = np.nonzero(tile < best_distances.max(axis=1)[:, None])
+        if len(rows) == 0:
+          continue
+        counts = np.bincount(rows, minlength=len(queries))
+        positions = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate_distances = np.full((len(queries), counts.max()), np.inf)
+        candidate_indexes = np.zeros((len(queries), counts.max()), dtype=np.intp)
+        candidate_distances[rows, positions] = tile[rows, columns]
+        candidate_indexes[rows, positions] = columns + reference_start
+        best_distances, best_indexes = self._top_k(np.hstack([best_distances, candidate_distances]), np.hstack([best_indexes, candidate_indexes]), n_neighbors)
+      #Sorted by distance, and by index on ties
+      best_distances = best_distances + query_norms
+      order = np.lexsort((best_indexes, best_distances), axis=1)
+      distances[query_start:query_start + len(queries)] = np.take_along_axis(best_distances, order, axis=1)
+      indexes[query_start:query_start + len(queries)] = np.take_along_axis(best_indexes, order, axis=1)
+    if not return_distance:
+      return indexes
+    np.maximum(distances, 0, out=distances) #rounding of the expansion can give small negative values
+    return np.sqrt(distances), indexes
@@ -0,0 +1,112 @@
+import numpy as np
+from sklearn.cluster import KMeans
+from mlpy.neighbors.brute import exclude_self
+
+'''
+Approximate K-NN search with an inverted file (IVF), optionally with product quantization (PQ).
+- fit: the reference points are clustered by KMeans in n_lists cells, every point is stored in the list of its cell
+- kneighbors: a query is compared only with the points of the n_probe cells nearest to it
+With PQ every point is stored as pq_subvectors codes of 1 byte (its residual from the centroid of the cell,
+split in subvectors, quantized by a KMeans of 2**pq_bits centroids for every subvector), and the distances
+are sums of values of a lookup table. With rerank the best rerank_factor*K candidates are re-ranked with the exact distance.
+n_probe (and rerank) trades recall for speed: n_probe=n_lists is the exact search (without PQ).
+'''
+
+class IVFNearestNeighbors:
+  '''
+  fit(X) builds the index, kneighbors(X, n_neighbors) returns (distances, indexes) sorted by distance (euclidean),
+  like sklearn NearestNeighbors (without X the neighbors of every reference point exclude the point itself).
+  '''
+  def __init__(self, n_neighbors=5, n_lists=None, n_probe=8, pq_subvectors=None, pq_bits=8, rerank=True, rerank_factor=4, random_state=0):
+    self.n_neighbors = n_neighbors
+    self.n_lists = n_lists #default sqrt(num of points)
+    self.n_probe = n_probe
+    self.pq_subvectors = pq_subvectors #None = the vectors are stored without compression
+    self.pq_bits = pq_bits
+    self.rerank = rerank
+    self.rerank_factor = rerank_factor
+    self.random_state = random_state
+
+  def fit(self, X, y=None):
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    n_lists = self.n_lists or max(1, int(np.sqrt(X.shape[0])))
+    coarse = KMeans(n_clusters=n_lists, n_init=1, random_state=self.random_state).fit(X)
+    self.centroids_ = coarse.cluster_centers_
+    #The points are sorted by cell, the list of cell i is ids_[offsets_[i]:offsets_[i + 1]]
+    order = np.argsort(coarse.labels_, kind="stable")
+    self.ids_ = order
+    self.offsets_ = np.concatenate([[0], np.cumsum(np.bincount(coarse.labels_, minlength=n_lists))])
+    if self.pq_subvectors is None or self.rerank:
+      self.vectors_ = X[order]
+    if self.pq_subvectors is not None:
+      self._fit_pq(X[order] - self.centroids_[coarse.labels_[order]])
+    return self
+
+  def _fit_pq(self, residuals):
+    num_features = residuals.shape[1]
+    if num_features % self.pq_subvectors:
+      raise ValueError("num of features %d is not a multiple of pq_subvectors=%d" % (num_features, self.pq_subvectors))
+    self.subvector_size_ = num_features // self.pq_subvectors
+    num_codes = min(2**self.pq_bits, residuals.shape[0])
+    self.codebooks_ = np.empty((self.pq_subvectors, num_codes, self.subvector_size_))
+    self.codes_ = np.empty((residuals.shape[0], self.pq_subvectors), dtype=np.uint8 if self.pq_bits <= 8 else np.uint16)
+    for j in range(self.pq_subvectors):
+      subvectors = residuals[:, j * self.subvector_size_:(j + 1) * self.subvector_size_]
+      quantizer = KMeans(n_clusters=num_codes, n_init=1, random_state=self.random_state).fit(subvectors)
+      self.codebooks_[j] = quantizer.cluster_centers_
+      self.codes_[:, j] = quantizer.labels_
+    #‖q − c − r‖² = ‖q − c‖² + (‖r‖² + 2c·r) − 2q·r, with r the decoded residual of the point and c its centroid:
+    #the term in brackets doesn't depend on the query, it's stored as one value for every point
+    cells = np.repeat(np.arange(len(self.centroids_)), np.diff(self.offsets_))
+    decoded = self._decode(self.codes_)
+    self.code_terms_ = (decoded ** 2).sum(axis=1) + 2 * (self.centroids_[cells] * decoded).sum(axis=1)
+
+  def _decode(self, codes):
+    return np.hstack([self.codebooks_[j][codes[:, j]] for j in range(self.pq_subvectors)])
+
+  def _probe(self, query, n_neighbors):
+    #cells in order of distance from the query, at least n_probe and enough points for n_neighbors
+    cells = np.argsort(((self.centroids_ - query) ** 2).sum(axis=1))
+    sizes = np.diff(self.offsets_)[cells]
+    num_cells = max(self.n_probe, int(np.searchsorted(np.cumsum(sizes), n_neighbors)) + 1)
+    return cells[:num_cells]
+
+  def _search(self, query, n_neighbors):
+    cells = self._probe(query, n_neighbors)
+    positions = np.concatenate([np.arange(self.offsets_[cell], self.offsets_[cell + 1]) for cell in cells])
+    if self.pq_subvectors is None:
+      distances = ((self.vectors_[positions] - query) ** 2).sum(axis=1)
+    else:
+      #Asymmetric distance: the query is exact, the points are their codes (q·r is a sum of values of a table)
+      cell_distances = ((self.centroids_[cells] - query) ** 2).sum(axis=1)
+      sizes = self.offsets_[cells + 1] - self.offsets_[cells]
+      table = np.einsum("mkd,md->mk", self.codebooks_, query.reshape(self.pq_subvectors, self.subvector_size_))
+      codes = self.codes_[positions]
+      distances = np.repeat(cell_distances, sizes) + self.code_terms_[positions] - 2 * table[np.arange(self.pq_subvectors), codes].sum(axis=1)
+      if self.rerank:
+        num_candidates = min(len(positions), self.rerank_factor * n_neighbors)
+        best = np.argpartition(distances, num_candidates - 1)[:num_candidates]
+        positions = positions[best]
+        distances = ((self.vectors_[positions] - query) ** 2).sum(axis=1)
+    best = np.argpartition(distances, n_neighbors - 1)[:n_neighbors] if len(distances) > n_neighbors else np.arange(len(distances))
+    best = best[np.lexsort((positions[best], distances[best]))]
+    return distances[best], self.ids_[positions[best]]
+
+  def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+    n_neighbors = n_neighbors or self.n_neighbors
+    if n_neighbors > len(self.ids_):
+      raise ValueError("n_neighbors=%d is greater than the num of reference points %d" % (n_neighbors, len(self.ids_)))
+    if X is None: #the reference points themselves, every one without itself
+      if not hasattr(self, "vectors_"):
+        raise ValueError("the reference points aren't stored with pq_subvectors and rerank=False, pass X")
+      X = np.empty((len(self.ids_), self.centroids_.shape[1]))
+      X[self.ids_] = self.vectors_
+      return exclude_self(*self.kneighbors(X, n_neighbors + 1), return_distance)
+    X = np.asarray(X, dtype=np.float64)
+    distances = np.empty((X.shape[0], n_neighbors))
+    indexes = np.empty((X.shape[0], n_neighbors), dtype=np.intp)
+    for i, query in enumerate(X):
+      distances[i], indexes[i] = self._search(query, n_neighbors)
+    if not return_distance:
+      return indexes
+    return np.sqrt(np.maximum(distances, 0)), indexes
@@ -0,0 +1,96 @@
+import numpy as np
+from mlpy.neighbors.brute import BlockedNearestNeighbors, exclude_self
+
+'''
+Brute-force K-NN engine on reference points stored in a compact dtype (uint8, int8 or float16).
+Every feature j is stored as a code q with x ≈ offset_j + scale_j * q:
+- uint8/int8: offset/scale map the range [min, max] of the feature on the 256 codes (rounded)
+- float16: offset/scale are the mean/std of the feature, the code is the standardized value
+The distances are computed on the codes: with u = x − offset,
+  ‖u − scale*q‖² = ‖u‖² − 2(scale*u)·q + ‖scale*q‖²
+then the query is scaled once and only a tile of codes at a time is converted to float for the matrix product,
+the reference points stay compact (1 or 2 bytes per feature instead of 8).
+With rerank (optional, off by default) the best rerank_factor*K candidates by quantized distance are re-ranked
+with the exact distance: the exact points are only referenced (not copied), they can be a memory map read only
+for the candidates, but save_knn writes them too. Without rerank only the codes are kept (and saved).
+'''
+
+DTYPES = {"uint8": np.uint8, "int8": np.int8, "float16": np.float16}
+
+class QuantizedNearestNeighbors(BlockedNearestNeighbors):
+  '''
+  fit(X) stores the codes of the reference points, kneighbors(X, n_neighbors) returns (distances, indexes) sorted by distance,
+  like BlockedNearestNeighbors (approximate distances without rerank).
+  '''
+  def __init__(self, n_neighbors=5, memory_budget=256 * 2**20, dtype="uint8", rerank=False, rerank_factor=4):
+    super().__init__(n_neighbors, memory_budget)
+    self.dtype = dtype
+    self.rerank = rerank
+    self.rerank_factor = rerank_factor
+
+  def fit(self, X, y=None):
+    if self.dtype not in DTYPES:
+      raise ValueError("dtype %r is not one of %s" % (self.dtype, ", ".join(DTYPES)))
+    dtype = DTYPES[self.dtype]
+    X_exact = np.asarray(X)
+    X = np.asarray(X, dtype=np.float64)
+    if dtype == np.float16:
+      self.offset_ = X.mean(axis=0)
+      self.scale_ = X.std(axis=0)
+    else:
+      info = np.iinfo(dtype)
+      minimum, maximum = X.min(axis=0), X.max(axis=0)
+      self.scale_ = (maximum - minimum) / (info.max - info.min)
+      self.offset_ = minimum - info.min * self.scale_
+    self.scale_[self.scale_ == 0] = 1 #constant features
+    codes = (X - self.offset_) / self.scale_
+    if dtype != np.float16:
+      codes = np.clip(np.rint(codes), np.iinfo(dtype).min, np.iinfo(dtype).max)
+    self.codes_ = np.ascontiguousarray(codes, dtype=dtype)
+    decoded = self.codes_ * self.scale_
+    self.norms_fit_ = np.einsum("ij,ij->i", decoded, decoded)
+    if self.rerank:
+      self.X_fit_ = X_exact
+    else:
+      vars(self).pop("X_fit_", None) #of a previous fit with rerank
+    return self
+
+  def _prepare_queries(self, queries):
+    queries = queries - self.offset_
+    return -2 * self.scale_ * queries, np.einsum("ij,ij->i", queries, queries)[:, None]
+
+  def _references(self, start, stop):
+    return self.codes_[start:stop].astype(np.float64)
+
+  def decode(self):
+    '''
+    The reference points rebuilt from the codes (float64).
+    '''
+    return self.offset_ + self.codes_ * self.scale_
+
+  def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+    n_neighbors = n_neighbors or self.n_neighbors
+    if X is None: #the reference points themselves, every one without itself
+      X = self.X_fit_ if self.rerank else self.decode()
+      return exclude_self(*self.kneighbors(X, n_neighbors + 1), return_distance)
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if not self.rerank:
+      return super().kneighbors(X, n_neighbors, return_distance)
+    num_candidates = min(len(self.norms_fit_), self.rerank_factor * n_neighbors)
+    _, candidates = super().kneighbors(X, num_candidates)
+    #Exact distances of the candidates, in blocks of queries to bound the memory of the gathered points
+    query_rows = max(1, self.memory_budget // (8 * num_candidates * X.shape[1]))
+    distances = np.empty((X.shape[0], n_neighbors))
+    indexes = np.empty((X.shape[0], n_neighbors), dtype=np.intp)
+    for start in range(0, X.shape[0], query_rows):
+      block = candidates[start:start + query_rows]
+      points = np.asarray(self.X_fit_[block.ravel()], dtype=np.float64).reshape(block.shape + (X.shape[1],))
+      differences = points - X[start:start + query_rows, None, :]
+      exact = np.einsum("ijk,ijk->ij", differences, differences)
+      best_distances, best_indexes = self._top_k(exact, block, n_neighbors)
+      order = np.lexsort((best_indexes, best_distances), axis=1)
+      distances[start:start + len(block)] = np.take_along_axis(best_distances, order, axis=1)
+      indexes[start:start + len(block)] = np.take_along_axis(best_indexes, order, axis=1)
+    if not return_distance:
+      return indexes
+    return np.sqrt(distances), indexes
@@ -0,0 +1,50 @@
+import inspect
+import numpy as np
+from mlpy.flatfile import write_arrays, read_arrays
+from mlpy.neighbors.brute import BlockedNearestNeighbors
+from mlpy.neighbors.ivf import IVFNearestNeighbors
+from mlpy.neighbors.quantized import QuantizedNearestNeighbors
+
+'''
+Fitted K-NN model in a flat binary file, loaded by memory map (see mlpy.flatfile).
+A fitted K-NN is only arrays (reference points, their norms, labels, the cells of the index, ...):
+the header has the class, its parameters and the fitted scalars, every fitted array is a raw array of the file.
+Loading is the parse of the header only: the arrays are views of the file mapped in memory, the OS reads
+the pages when the queries touch them, and all the processes on the same node share the same physical pages.
+'''
+
+MAGIC = b"MLPYKNN1"
+
+#Classes that can be saved, by name
+MODELS = {model.__name__: model for model in (BlockedNearestNeighbors, IVFNearestNeighbors, QuantizedNearestNeighbors)}
+
+def save_knn(path, neighbors, labels=None):
+  '''
+  Save the fitted neighbors (BlockedNearestNeighbors, IVFNearestNeighbors or QuantizedNearestNeighbors) and the labels of its reference points in path.
+  The file is written in a temporary file and renamed, so a process loading it never sees a partial file.
+  '''
+  name = type(neighbors).__name__
+  if name not in MODELS:
+    raise TypeError("%s can't be saved, only %s" % (name, ", ".join(MODELS)))
+  parameters = {key: getattr(neighbors, key) for key in inspect.signature(type(neighbors).__init__).parameters if key != "self"}
+  arrays = {key: value for key, value in vars(neighbors).items() if key.endswith("_") and isinstance(value, np.ndarray)}
+  scalars = {key: value for key, value in vars(neighbors).items() if key.endswith("_") and key not in arrays}
+  if not arrays:
+    raise ValueError("%s is not fitted" % name)
+  if labels is not None:
+    arrays["labels"] = np.asarray(labels)
+  write_arrays(path, MAGIC, {"model": name, "parameters": parameters, "scalars": scalars}, arrays)
+
+def load_knn(path, mmap_mode=True):
+  '''
+  Load a K-NN model saved by save_knn, return (neighbors, labels) (labels None if not saved).
+  With mmap_mode the arrays are read-only views of the file mapped in memory, else they are read in memory.
+  '''
+  header, arrays = read_arrays(path, MAGIC, mmap_mode)
+  neighbors = MODELS[header["model"]](**header["parameters"])
+  for key, value in header["scalars"].items():
+    setattr(neighbors, key, value)
+  labels = arrays.pop("labels", None)
+  for key, value in arrays.items():
+    setattr(neighbors, key, value)
+  return neighbors, labels
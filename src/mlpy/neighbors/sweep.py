@@ -0,0 +1,41 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+'''
+Sweep over the num of neighbors K of a K-NN classifier.
+The neighbors of the query points are searched only once with the max K (they are sorted by distance),
+then the prediction of every smaller K is the majority vote of the first K neighbors.
+One distance pass instead of one for every K.
+When more points are at the same distance of the K-th neighbor, the chosen ones can differ
+from a search with n_neighbors=K (the order of ties is not defined), then a few predictions can differ.
+'''
+
+def vote(neighbor_labels, num_classes, n_neighbors):
+  '''
+  Majority vote of the first K neighbors for every K in n_neighbors (increasing), neighbor_labels are class indexes.
+  Returns {K: class indexes}; on ties the smallest class index wins, like KNeighborsClassifier.
+  '''
+  num_queries = neighbor_labels.shape[0]
+  counts = np.zeros((num_queries, num_classes), dtype=np.int32)
+  rows = np.arange(num_queries)
+  predictions = {}
+  wanted = set(n_neighbors)
+  for j in range(max(n_neighbors)):
+    counts[rows, neighbor_labels[:, j]] += 1 #the counts of the first j+1 neighbors
+    if j + 1 in wanted:
+      predictions[j + 1] = np.argmax(counts, axis=1)
+  return predictions
+
+def kneighbors_sweep(X_train, Y_train, X_query, n_neighbors, neighbors=None):
+  '''
+  Predictions of KNeighborsClassifier(n_neighbors=K) fitted on (X_train, Y_train) for X_query, for every K in n_neighbors.
+  neighbors is the fitted search index (default NearestNeighbors(metric='minkowski') on X_train),
+  any object with kneighbors(X, n_neighbors) that returns (distances, indexes) sorted by distance.
+  Returns {K: predictions}.
+  '''
+  classes, Y_indexes = np.unique(Y_train, return_inverse=True)
+  if neighbors is None:
+    neighbors = NearestNeighbors(metric='minkowski').fit(X_train)
+  _, indexes = neighbors.kneighbors(X_query, n_neighbors=max(n_neighbors))
+  predictions = vote(Y_indexes[indexes], len(classes), sorted(n_neighbors))
+  return {K: classes[predictions[K]] for K in n_neighbors}
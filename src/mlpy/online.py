@@ -0,0 +1,205 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.flatfile import write_arrays, read_arrays
+from mlpy.vocabulary import analyzer_parameters
+
+'''
+Online BernoulliNB for texts: the model of bernoulli-nb.py (CountVectorizer(binary=True) + BernoulliNB)
+updated with the new labeled documents only.
+BernoulliNB is only counts: the documents of every class (class_count_) and the documents of every class
+with every term (feature_count_), then partial_fit analyzes the new documents and adds their counts,
+the time is proportional to the new documents, not to the history.
+
+Policy for the terms not in the vocabulary (unseen):
+- "grow": the new terms are new columns (appended, in sorted order), with count 0 for all the previous documents
+  (they didn't have the term): the counts are the ones of a full refit on all the documents, then the same predictions
+  of CountVectorizer + BernoulliNB fitted on all the history (the columns have another order).
+  A vocabulary depending on all the corpus (min_df, max_df, max_features) can't grow, it raises ValueError.
+- "ignore": the vocabulary is the one of the first batch (or of the fitted vectorizer), the new terms are dropped.
+In predict the terms not in the vocabulary are always dropped.
+
+The state (vocabulary, counts, classes, parameters) is saved by save_online/load_online in one flat file (mlpy.flatfile).
+'''
+
+MAGIC = b"MLPYONB1"
+UNSEEN_POLICIES = ("grow", "ignore")
+
+class OnlineBernoulliNB:
+  '''
+  partial_fit(texts, targets) as many times as needed, predict(texts)/predict_proba(texts) with the current counts.
+  vectorizer (CountVectorizer, default the one of bernoulli-nb.py) gives how the documents are split in terms,
+  if it's fitted its vocabulary is the first one.
+  '''
+  def __init__(self, vectorizer=None, alpha=1.0, fit_prior=True, unseen="grow"):
+    if vectorizer is None:
+      vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True)
+    if unseen not in UNSEEN_POLICIES:
+      raise ValueError("unseen must be one of %s" % ", ".join(UNSEEN_POLICIES))
+    if unseen == "grow" and (vectorizer.min_df != 1 or vectorizer.max_df != 1.0 or vectorizer.max_features is not None):
+      raise ValueError("a vocabulary with min_df, max_df or max_features can't grow, use unseen=\"ignore\"")
+    self.vectorizer = vectorizer
+    self.alpha = alpha
+    self.fit_prior = fit_prior
+    self.unseen = unseen
+    self._analyze = vectorizer.build_analyzer()
+    self.classes_ = []
+    self.vocabulary_ = {}
+    self.terms_ = [] #term of every column
+    self.class_count_ = np.zeros(0, dtype=np.float64)
+    self._feature_count = np.zeros((0, 0), dtype=np.float64) #with free columns for the new terms
+    self._weights = None
+    if hasattr(vectorizer, "vocabulary_"):
+      self._add_terms(sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get))
+
+  @classmethod
+  def from_fitted(cls, vectorizer, model, unseen="grow"):
+    '''
+    Online model with the vocabulary of the fitted vectorizer and the counts of the fitted BernoulliNB
+    (e.g. the ones of bernoulli-nb.py), to be updated with the next documents.
+    '''
+    online = cls(vectorizer, alpha=model.alpha, fit_prior=model.fit_prior, unseen=unseen)
+    online._add_classes(model.classes_)
+    online.class_count_[:] = model.class_count_
+    online._feature_count[:, :len(online.terms_)] = model.feature_count_
+    return online
+
+  @property
+  def feature_count_(self):
+    return self._feature_count[:, :len(self.terms_)]
+
+  @property
+  def num_documents_(self):
+    return int(self.class_count_.sum())
+
+  def _add_classes(self, classes):
+    #classes_ stay sorted like the ones of BernoulliNB, the rows of the counts follow them
+    new_classes = [value for value in classes if value not in self.classes_]
+    if new_classes:
+      classes = sorted(self.classes_ + new_classes)
+      rows = [classes.index(value) for value in self.classes_]
+      class_count = np.zeros(len(classes))
+      feature_count = np.zeros((len(classes), self._feature_count.shape[1]))
+      class_count[rows], feature_count[rows] = self.class_count_, self._feature_count
+      self.classes_, self.class_count_, self._feature_count = classes, class_count, feature_count
+
+  def _add_terms(self, terms):
+    for term in terms:
+      self.vocabulary_[term] = len(self.terms_)
+      self.terms_.append(term)
+    if len(self.terms_) > self._feature_count.shape[1]: #the capacity doubles, then the copies are amortized
+      capacity = max(len(self.terms_), 2 * self._feature_count.shape[1])
+      feature_count = np.zeros((self._feature_count.shape[0], capacity))
+      feature_count[:, :self._feature_count.shape[1]] = self._feature_count
+      self._feature_count = feature_count
+
+  def _columns(self, documents):
+    #documents (sets of terms) => (rows, columns) of the terms in the vocabulary
+    rows = np.repeat(np.arange(len(documents)), [len(terms) for terms in documents])
+    columns = np.fromiter((self.vocabulary_.get(term, -1) for terms in documents for term in terms), dtype=np.int64, count=len(rows))
+    found = columns >= 0
+    return rows[found], columns[found]
+
+  def partial_fit(self, texts, targets):
+    '''
+    Add the counts of the new labeled documents.
+    '''
+    documents = [set(self._analyze(text)) for text in texts]
+    if not self.terms_ and self.unseen == "ignore":
+      #the first vocabulary: the vectorizer fitted on the first batch (with its min_df, max_df, max_features)
+      vocabulary = CountVectorizer(**self.vectorizer.get_params()).fit(texts).vocabulary_
+      self._add_terms(sorted(vocabulary, key=vocabulary.get))
+    elif self.unseen == "grow":
+      self._add_terms(sorted(set().union(*documents).difference(self.vocabulary_)))
+    targets = list(targets)
+    self._add_classes(list(set(targets)))
+    class_index = {value: index for index, value in enumerate(self.classes_)}
+    classes = np.fromiter((class_index[target] for target in targets), dtype=np.int64, count=len(targets))
+    self.class_count_ += np.bincount(classes, minlength=len(self.classes_))
+    rows, columns = self._columns(documents)
+    np.add.at(self._feature_count, (classes[rows], columns), 1)
+    self._weights = None
+    return self
+
+  def transform(self, texts):
+    '''
+    Binary CSR matrix of the texts on the current vocabulary.
+    '''
+    rows, columns = self._columns([set(self._analyze(text)) for text in texts])
+    return sp.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(texts), len(self.terms_)))
+
+  def _update_weights(self):
+    #the same smoothing and priors of BernoulliNB: log P(c|x) ∝ bias + x·w
+    feature_log_prob = np.log(self.feature_count_ + self.alpha) - np.log(self.class_count_ + 2 * self.alpha)[:, None]
+    negative = np.log1p(-np.exp(feature_log_prob))
+    if self.fit_prior:
+      class_log_prior = np.log(self.class_count_) - np.log(self.class_count_.sum())
+    else:
+      class_log_prior = np.full(len(self.classes_), -np.log(len(self.classes_)))
+    self._weights = (np.ascontiguousarray((feature_log_prob - negative).T), class_log_prior + negative.sum(axis=1))
+
+  def joint_log_likelihood(self, texts):
+    if self._weights is None:
+      self._update_weights()
+    weights, bias = self._weights
+    return self.transform(texts) @ weights + bias
+
+  def predict(self, texts):
+    return np.asarray(self.classes_)[np.argmax(self.joint_log_likelihood(texts), axis=1)]
+
+  def predict_proba(self, texts):
+    jll = self.joint_log_likelihood(texts)
+    probabilities = np.exp(jll - jll.max(axis=1, keepdims=True))
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+  def to_sklearn(self):
+    '''
+    (CountVectorizer, BernoulliNB) fitted with the current vocabulary and counts,
+    for the code that uses the sklearn objects (save_vectorizer, NaiveBayesScorer, ...).
+    '''
+    vectorizer = CountVectorizer(**dict(self.vectorizer.get_params(), vocabulary=None))
+    vectorizer.vocabulary_ = dict(self.vocabulary_)
+    model = BernoulliNB(alpha=self.alpha, fit_prior=self.fit_prior)
+    model.classes_ = np.asarray(self.classes_)
+    model.class_count_ = self.class_count_.copy()
+    model.feature_count_ = self.feature_count_.copy()
+    model.n_features_in_ = len(self.terms_)
+    model._update_feature_log_prob(model.alpha)
+    model._update_class_log_prior()
+    return vectorizer, model
+
+def save_online(path, online):
+  '''
+  Save the state of an OnlineBernoulliNB in path (vocabulary, counts, classes and parameters).
+  '''
+  if callable(online.vectorizer.analyzer) or online.vectorizer.tokenizer is not None or online.vectorizer.preprocessor is not None:
+    raise ValueError("a vectorizer with a custom analyzer, tokenizer or preprocessor can't be saved")
+  encoded = [term.encode("utf-8") for term in online.terms_]
+  header = {
+    "parameters": analyzer_parameters(online.vectorizer), "binary": online.vectorizer.binary,
+    "alpha": online.alpha, "fit_prior": online.fit_prior, "unseen": online.unseen,
+    "classes": np.asarray(online.classes_).tolist()
+  }
+  arrays = {
+    "terms": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    "offsets": np.concatenate([[0], np.cumsum([len(term) for term in encoded], dtype=np.int64)]),
+    "class_count": online.class_count_,
+    "feature_count": online.feature_count_
+  }
+  write_arrays(path, MAGIC, header, arrays)
+
+def load_online(path):
+  '''
+  OnlineBernoulliNB saved by save_online, ready for the next partial_fit.
+  '''
+  header, arrays = read_arrays(path, MAGIC, mmap_mode=False)
+  parameters = dict(header["parameters"], ngram_range=tuple(header["parameters"]["ngram_range"]))
+  online = OnlineBernoulliNB(CountVectorizer(binary=header["binary"], **parameters),
+    alpha=header["alpha"], fit_prior=header["fit_prior"], unseen=header["unseen"])
+  terms, offsets = arrays["terms"].tobytes(), arrays["offsets"]
+  online._add_terms(terms[start:stop].decode("utf-8") for start, stop in zip(offsets[:-1], offsets[1:]))
+  online._add_classes(header["classes"])
+  online.class_count_[:] = arrays["class_count"]
+  online._feature_count[:, :len(online.terms_)] = arrays["feature_count"]
+  return online
@@ -0,0 +1,77 @@
+import os
+import contextlib
+import multiprocessing
+import numpy as np
+from multiprocessing import shared_memory
+
+'''
+Process pool helpers shared by mlpy.model_selection, mlpy.ensemble, mlpy.inspection and mlpy.tokenizers
+(numpy only, no sklearn import).
+The arrays are copied once in shared memory by the parent (sharing), the workers of the pool attach to them
+in the initializer (init_worker) and find them in shared by name, without a copy for every task.
+'''
+
+shared = {} #in the worker: name => (SharedMemory, numpy.ndarray)
+
+def process_context():
+  '''
+  "fork" where available: the scripts have no if __name__ == "__main__", with "spawn" the workers would execute them again.
+  '''
+  if "fork" in multiprocessing.get_all_start_methods():
+    return multiprocessing.get_context("fork")
+  return multiprocessing.get_context()
+
+def effective_n_jobs(n_jobs, num_tasks=None):
+  '''
+  Processes for n_jobs like joblib: None = num of CPUs, -1 = all the CPUs, -2 = all but one, ..., at most num_tasks.
+  '''
+  if n_jobs == 0:
+    raise ValueError("n_jobs == 0 has no meaning")
+  num_cpus = os.cpu_count() or 1
+  if n_jobs is None:
+    n_jobs = num_cpus
+  elif n_jobs < 0:
+    n_jobs = max(num_cpus + 1 + n_jobs, 1)
+  return max(min(n_jobs, num_tasks), 1) if num_tasks is not None else n_jobs
+
+def share(array):
+  '''
+  Copy array in a new shared memory block, returns (SharedMemory, spec), spec is what attach needs.
+  '''
+  array = np.ascontiguousarray(array)
+  memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+  np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+  return memory, (memory.name, array.shape, array.dtype.str)
+
+def attach(spec):
+  '''
+  (SharedMemory, numpy.ndarray) of the array shared by share, without copy.
+  '''
+  name, shape, dtype = spec
+  memory = shared_memory.SharedMemory(name=name)
+  return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+def init_worker(X_spec, Y_spec):
+  '''
+  Initializer of the pool: shared["X"] and shared["Y"] in the worker.
+  '''
+  shared["X"] = attach(X_spec)
+  shared["Y"] = attach(Y_spec)
+
+@contextlib.contextmanager
+def sharing(*arrays):
+  '''
+  with sharing(X, Y) as (X_spec, Y_spec): the arrays in shared memory, released (closed and unlinked) at the end.
+  '''
+  memories = []
+  try:
+    specs = []
+    for array in arrays:
+      memory, spec = share(array)
+      memories.append(memory)
+      specs.append(spec)
+    yield specs
+  finally:
+    for memory in memories:
+      memory.close()
+      memory.unlink()
@@ -0,0 +1,92 @@
+import os
+import time
+import pickle
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from mlpy.datasets import get_data_home, _publish
+from mlpy.instrument import stage
+
+'''
+Content-addressed cache of the fitted scalers.
+The key is a hash of the scaler (class and parameters) and of the train/test arrays,
+that already depend on the input data and on the split parameters (test_size, random_state).
+Every entry is a folder with the fitted scaler and the scaled arrays; when the cache is bigger than
+max_bytes (MLPY_CACHE_MAX_BYTES, default 1GB) the least recently used entries are removed.
+'''
+
+MAX_BYTES = int(os.environ.get("MLPY_CACHE_MAX_BYTES", 2**30))
+
+def cache_key(estimator, *arrays):
+  '''
+  sha256 of the estimator parameters and of dtype/shape/bytes of the arrays.
+  '''
+  key = hashlib.sha256()
+  key.update(type(estimator).__qualname__.encode())
+  key.update(repr(sorted(estimator.get_params().items())).encode())
+  for array in arrays:
+    array = np.ascontiguousarray(array)
+    key.update(("%s%s" % (array.dtype.str, array.shape)).encode())
+    key.update(array.data)
+  return key.hexdigest()
+
+def _folder_size(folder):
+  return sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+
+def evict(cache_home, max_bytes=MAX_BYTES):
+  '''
+  Remove the least recently used entries (oldest mtime) until the cache is not bigger than max_bytes.
+  '''
+  entries = []
+  for name in os.listdir(cache_home):
+    folder = os.path.join(cache_home, name)
+    if not os.path.exists(os.path.join(folder, "scaler.pkl")): #temporary folder being written
+      continue
+    try:
+      entries.append((os.path.getmtime(folder), _folder_size(folder), folder))
+    except OSError: #removed by another process
+      continue
+  entries.sort()
+  total_bytes = sum(size for _, size, _ in entries)
+  for _, size, folder in entries:
+    if total_bytes <= max_bytes:
+      break
+    shutil.rmtree(folder, ignore_errors=True)
+    total_bytes -= size
+
+def fit_transform_cached(scaler, X_train, X_test, data_home=None, max_bytes=MAX_BYTES):
+  '''
+  Same result of scaler.fit_transform(X_train) and scaler.transform(X_test),
+  returns (X_train_scaled, X_test_scaled, fitted scaler) from the cache when possible.
+  '''
+  with stage("scale", scaler=type(scaler).__name__):
+    return _fit_transform_cached(scaler, X_train, X_test, data_home, max_bytes)
+
+def _fit_transform_cached(scaler, X_train, X_test, data_home, max_bytes):
+  if X_train.dtype.kind == 'O' or X_test.dtype.kind == 'O': #bytes of python objects are not their content
+    return scaler.fit_transform(X_train), scaler.transform(X_test), scaler
+  cache_home = os.path.join(get_data_home(data_home), "preprocessing")
+  os.makedirs(cache_home, exist_ok=True)
+  folder = os.path.join(cache_home, cache_key(scaler, X_train, X_test))
+  if os.path.exists(os.path.join(folder, "scaler.pkl")):
+    try:
+      with open(os.path.join(folder, "scaler.pkl"), "rb") as f:
+        fitted_scaler = pickle.load(f)
+      X_train_scaled = np.load(os.path.join(folder, "X_train.npy"))
+      X_test_scaled = np.load(os.path.join(folder, "X_test.npy"))
+      now = time.time()
+      os.utime(folder, (now, now)) #most recently used
+      return X_train_scaled, X_test_scaled, fitted_scaler
+    except OSError: #evicted by another process in the meantime
+      pass
+  X_train_scaled = scaler.fit_transform(X_train)
+  X_test_scaled = scaler.transform(X_test)
+  tmp_folder = tempfile.mkdtemp(dir=cache_home)
+  np.save(os.path.join(tmp_folder, "X_train.npy"), X_train_scaled)
+  np.save(os.path.join(tmp_folder, "X_test.npy"), X_test_scaled)
+  with open(os.path.join(tmp_folder, "scaler.pkl"), "wb") as f:
+    pickle.dump(scaler, f)
+  _publish(tmp_folder, folder)
+  evict(cache_home, max_bytes)
+  return X_train_scaled, X_test_scaled, scaler
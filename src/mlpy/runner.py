@@ -0,0 +1,137 @@
+import os
+import re
+import sys
+import json
+import time
+import signal
+import fnmatch
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+'''
+Runner of the script collection (smoke suite).
+Every script is executed in its own python process, at most "jobs" processes at the same time.
+The process is waited with os.wait4, that gives its CPU time and peak RSS, and the metrics printed
+by the script (ACCURACY SCORE: 0.95, R2 SCORE: ..., LOG LOSS: ...) are parsed from its output.
+With trace (or MLPY_TRACE) the scripts are executed by python -m mlpy trace: the stages of all the scripts
+(split, fit, predict, metric, ... see mlpy.instrument) are appended to the same JSON lines file.
+'''
+
+SRC_HOME = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#"ACCURACY SCORE:  0.95" => ("ACCURACY SCORE", 0.95)
+METRIC_LINE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9 _\-]*?)\s*:\s+(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*$")
+
+def discover(pattern="*", src_home=SRC_HOME):
+  '''
+  Paths (relative to src) of the scripts matching pattern, the mlpy package excluded.
+  '''
+  scripts = []
+  for folder, folders, files in os.walk(src_home):
+    folders[:] = sorted(name for name in folders if name not in ("mlpy", "__pycache__"))
+    for name in sorted(files):
+      if name.endswith(".py"):
+        path = os.path.relpath(os.path.join(folder, name), src_home).replace(os.sep, "/")
+        if fnmatch.fnmatch(path, pattern):
+          scripts.append(path)
+  return scripts
+
+def parse_metrics(output):
+  '''
+  Metrics printed by a script as [section, name, value], section is the last line that is not a metric
+  (e.g. "Model overfitting evaluation", "Model evaluation").
+  '''
+  metrics = []
+  section = None
+  for line in output.splitlines():
+    match = METRIC_LINE.match(line)
+    if match:
+      metrics.append([section, match.group(1), float(match.group(2))])
+    elif line.strip():
+      section = line.strip()
+  return metrics
+
+def run_script(script, bench=True, timeout=None, src_home=SRC_HOME, trace=None):
+  '''
+  Execute one script and return its record: returncode, wall_time, cpu_time (s), peak_rss (bytes), metrics.
+  '''
+  env = dict(os.environ)
+  env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_home, env.get("PYTHONPATH")]))
+  env["MPLBACKEND"] = "Agg"
+  if bench:
+    env["MLPY_BENCH"] = "1"
+  trace = trace or env.get("MLPY_TRACE")
+  command = [sys.executable, os.path.join(src_home, script)]
+  if trace:
+    env["MLPY_TRACE"] = os.path.abspath(trace)
+    command = [sys.executable, "-m", "mlpy", "trace", command[1]]
+  with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=stdout, stderr=stderr, env=env)
+    #The process is killed by a timer with os.kill (process.kill would poll, and could reap it before os.wait4).
+    #The exit is waited without reaping (WNOWAIT): until os.wait4 the pid can't be reused, and after "exited"
+    #is set under the lock the timer doesn't kill anymore, so it never signals a reaped pid
+    lock = threading.Lock()
+    state = {"exited": False, "timed_out": False}
+    def kill():
+      with lock:
+        if not state["exited"]:
+          state["timed_out"] = True
+          os.kill(process.pid, signal.SIGKILL)
+    timer = threading.Timer(timeout, kill) if timeout is not None else None
+    if timer is not None:
+      timer.start()
+    os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+    with lock:
+      state["exited"] = True
+    if timer is not None:
+      timer.cancel()
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    timed_out = state["timed_out"]
+    stdout.seek(0)
+    stderr.seek(0)
+    output = stdout.read().decode(errors="replace")
+    errors = stderr.read().decode(errors="replace")
+  record = {
+    "script": script,
+    "returncode": process.returncode,
+    "timed_out": timed_out,
+    "wall_time": wall_time,
+    "cpu_time": usage.ru_utime + usage.ru_stime,
+    "peak_rss": usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024), #KB on Linux
+    "metrics": parse_metrics(output)
+  }
+  if process.returncode != 0:
+    record["stderr"] = errors[-2000:]
+  return record
+
+def run(pattern="*", jobs=None, bench=True, timeout=None, src_home=SRC_HOME, trace=None):
+  '''
+  Execute all scripts matching pattern in parallel (at most jobs processes) and return the JSON report.
+  '''
+  scripts = discover(pattern, src_home)
+  jobs = jobs or os.cpu_count()
+  start = time.perf_counter()
+  #Threads only wait the child processes, the work is done by at most "jobs" processes
+  with ThreadPoolExecutor(max_workers=jobs) as executor:
+    records = list(executor.map(lambda script: run_script(script, bench, timeout, src_home, trace), scripts))
+  return {
+    "pattern": pattern,
+    "jobs": jobs,
+    "bench": bench,
+    "wall_time": time.perf_counter() - start,
+    "failed": sum(1 for record in records if record["returncode"] != 0),
+    "scripts": records
+  }
+
+def write_report(report, output=None):
+  if output is None:
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+  else:
+    with open(output, "w") as f:
+      json.dump(report, f, indent=2)
@@ -0,0 +1,143 @@
+import time
+import asyncio
+import collections
+import numpy as np
+from sklearn.naive_bayes import BernoulliNB, MultinomialNB
+
+'''
+Local inference service for a fitted text vectorizer + naive Bayes model.
+The concurrent requests are gathered in micro-batches: a batch takes the requests queued while the previous
+batch was scored (up to max_batch_size, waiting at most max_delay seconds for more), then it's vectorized
+with one transform and scored with one sparse matrix product against the feature log-probabilities
+of the model (NaiveBayesScorer), instead of one transform + predict (and their Python overhead) for every request.
+The service runs in an asyncio loop: in process (MicroBatcher.predict) or on TCP with a line protocol (serve),
+and it keeps the latency of every request (from the arrival to the answer) for the percentiles.
+'''
+
+class NaiveBayesScorer:
+  '''
+  predict(texts) of vectorizer + model (MultinomialNB or BernoulliNB) as X @ weights + bias, with X the sparse
+  matrix of the texts: the same joint log likelihood of the model, then the same predictions (and predict_proba).
+  '''
+  def __init__(self, vectorizer, model):
+    self.vectorizer = vectorizer
+    self.classes = model.classes_
+    if isinstance(model, BernoulliNB):
+      #log P(x|c) = Σ x log p + (1 − x) log(1 − p) = x·(log p − log(1 − p)) + Σ log(1 − p)
+      negative = np.log1p(-np.exp(model.feature_log_prob_))
+      self.weights = np.ascontiguousarray((model.feature_log_prob_ - negative).T)
+      self.bias = model.class_log_prior_ + negative.sum(axis=1)
+      self.binarize = model.binarize
+    elif isinstance(model, MultinomialNB):
+      self.weights = np.ascontiguousarray(model.feature_log_prob_.T)
+      self.bias = model.class_log_prior_
+      self.binarize = None
+    else:
+      raise TypeError("%s is not MultinomialNB or BernoulliNB" % type(model).__name__)
+
+  def joint_log_likelihood(self, texts):
+    X = self.vectorizer.transform(texts)
+    if self.binarize is not None:
+      X = (X > self.binarize).astype(np.float64)
+    return X @ self.weights + self.bias
+
+  def predict(self, texts):
+    return self.classes[np.argmax(self.joint_log_likelihood(texts), axis=1)]
+
+  def predict_proba(self, texts):
+    jll = self.joint_log_likelihood(texts)
+    probabilities = np.exp(jll - jll.max(axis=1, keepdims=True))
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+class MicroBatcher:
+  '''
+  await batcher.predict(text) inside a running loop, after await batcher.start().
+  A batch is scored in a thread of the loop's executor, so new requests are queued for the next batch meanwhile.
+  '''
+  def __init__(self, scorer, max_batch_size=64, max_delay=0.0, max_latencies=100000):
+    self.scorer = scorer
+    self.max_batch_size = max_batch_size
+    self.max_delay = max_delay #seconds the first request of a batch can wait for others (for sparse arrivals)
+    self.latencies = collections.deque(maxlen=max_latencies) #seconds, of the last max_latencies requests
+    self.batch_sizes = collections.deque(maxlen=max_latencies)
+    self._queue = None
+    self._task = None
+
+  async def start(self):
+    self._queue = asyncio.Queue()
+    self._task = asyncio.get_running_loop().create_task(self._run())
+    return self
+
+  async def stop(self):
+    self._task.cancel()
+    try:
+      await self._task
+    except asyncio.CancelledError:
+      pass
+
+  async def predict(self, text):
+    future = asyncio.get_running_loop().create_future()
+    await self._queue.put((text, future, time.perf_counter()))
+    return await future
+
+  async def _next_batch(self, loop):
+    batch = [await self._queue.get()]
+    deadline = loop.time() + self.max_delay
+    while len(batch) < self.max_batch_size:
+      if not self._queue.empty():
+        batch.append(self._queue.get_nowait())
+        continue
+      timeout = deadline - loop.time()
+      if timeout <= 0:
+        break
+      try:
+        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+      except asyncio.TimeoutError:
+        break
+    return batch
+
+  async def _run(self):
+    loop = asyncio.get_running_loop()
+    while True:
+      batch = await self._next_batch(loop)
+      try:
+        predictions = await loop.run_in_executor(None, self.scorer.predict, [text for text, _, _ in batch])
+      except Exception as error:
+        for _, future, _ in batch:
+          if not future.done():
+            future.set_exception(error)
+        continue
+      end = time.perf_counter()
+      self.batch_sizes.append(len(batch))
+      for (_, future, start), prediction in zip(batch, predictions):
+        self.latencies.append(end - start)
+        if not future.done():
+          future.set_result(prediction)
+
+  def latency_percentiles(self, percentiles=(50, 99)):
+    '''
+    {"p50": seconds, "p99": seconds, ...} of the last requests.
+    '''
+    if not self.latencies:
+      return {}
+    values = np.percentile(np.fromiter(self.latencies, dtype=np.float64), percentiles)
+    return {"p%g" % percentile: float(value) for percentile, value in zip(percentiles, values)}
+
+async def serve(batcher, host="127.0.0.1", port=8765):
+  '''
+  TCP service: every line received is a text, the answer is a line with its predicted class.
+  The connections are served concurrently, then their requests share the micro-batches.
+  Returns the asyncio server (await server.serve_forever() to run it).
+  '''
+  async def handle(reader, writer):
+    try:
+      while True:
+        line = await reader.readline()
+        if not line:
+          break
+        prediction = await batcher.predict(line.decode("utf-8").rstrip("\n"))
+        writer.write(("%s\n" % prediction).encode("utf-8"))
+        await writer.drain()
+    finally:
+      writer.close()
+  return await asyncio.start_server(handle, host, port)
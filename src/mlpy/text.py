@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.metrics import log_loss
+
+'''
+Out-of-core helpers for the text classifiers.
+The CSV is read in chunks of rows, every chunk is vectorized with a stateless vectorizer
+(HashingVectorizer, it has no vocabulary to build) and given to the partial_fit of the model,
+so the memory depends on chunksize and not on the number of rows.
+For tf-idf the document frequencies are the only state: they are counted in a first pass over the chunks
+(HashingTfidfVectorizer.partial_fit), then the second pass weights the chunks and trains the model.
+'''
+
+def iter_text_chunks(path, text_column, target_column, chunksize=10000, subset=None, test_size=0.3, random_state=42):
+  '''
+  Yield (texts, targets) numpy arrays for every chunk of the CSV.
+  With subset="train" or subset="test" every row goes in the test rows with probability test_size,
+  the random generator is restarted at every call, then two passes over the same file give the same split.
+  '''
+  random_generator = np.random.RandomState(random_state)
+  for chunk in pd.read_csv(path, usecols=[text_column, target_column], chunksize=chunksize):
+    texts = chunk[text_column].values
+    targets = chunk[target_column].values
+    if subset is not None:
+      test_mask = random_generator.random_sample(len(chunk)) < test_size
+      mask = test_mask if subset == "test" else ~test_mask
+      texts, targets = texts[mask], targets[mask]
+    if len(texts):
+      yield texts, targets
+
+def iter_chunks(texts, targets, chunksize=10000):
+  '''
+  Yield (texts, targets) of chunksize rows from sequences already in memory (e.g. a dataset of sklearn).
+  '''
+  for start in range(0, len(texts), chunksize):
+    yield texts[start:start + chunksize], targets[start:start + chunksize]
+
+class HashingTfidfVectorizer:
+  '''
+  Streaming TfidfVectorizer: HashingVectorizer counts weighted by the idf of the documents seen by partial_fit.
+  The state is only the document frequency of every column (n_features integers) and the num of documents,
+  then it doesn't grow with the corpus. With the same parameters the weights are the ones of TfidfVectorizer
+  (smooth idf = ln((1 + n) / (1 + df)) + 1, l2 norm, the words never seen by partial_fit are ignored),
+  except for the collisions of the hash.
+  '''
+  def __init__(self, n_features=2**20, lowercase=True, stop_words=None, tokenizer=None, norm="l2", smooth_idf=True, sublinear_tf=False):
+    self.n_features = n_features
+    self.norm = norm
+    self.smooth_idf = smooth_idf
+    self.sublinear_tf = sublinear_tf
+    self.hashing_vectorizer = HashingVectorizer(
+      n_features=n_features, lowercase=lowercase, stop_words=stop_words, tokenizer=tokenizer,
+      alternate_sign=False, norm=None #raw counts, the weights are applied after
+    )
+    self.document_frequency_ = np.zeros(n_features, dtype=np.int64)
+    self.num_documents_ = 0
+
+  def partial_fit(self, texts, y=None):
+    counts = self.hashing_vectorizer.transform(texts)
+    counts.sum_duplicates()
+    self.document_frequency_ += np.bincount(counts.indices, minlength=self.n_features)
+    self.num_documents_ += counts.shape[0]
+    return self
+
+  @property
+  def idf_(self):
+    #The columns never seen by partial_fit are not in the vocabulary of TfidfVectorizer: idf 0 drops them
+    smooth = int(self.smooth_idf)
+    seen = self.document_frequency_ > 0
+    idf = np.zeros(self.n_features)
+    idf[seen] = np.log((self.num_documents_ + smooth) / (self.document_frequency_[seen] + smooth)) + 1
+    return idf
+
+  def transform(self, texts):
+    if self.num_documents_ == 0:
+      raise ValueError("HashingTfidfVectorizer has seen no documents, call partial_fit first")
+    X = self.hashing_vectorizer.transform(texts).astype(np.float64)
+    X.sum_duplicates()
+    if self.sublinear_tf:
+      np.log(X.data, out=X.data)
+      X.data += 1
+    X.data *= self.idf_[X.indices]
+    X.eliminate_zeros()
+    if self.norm is not None:
+      X = normalize(X, norm=self.norm, copy=False)
+    return X
+
+def partial_fit_chunks(classifier, vectorizer, chunks, classes):
+  '''
+  Train classifier chunk by chunk (classes must be known in advance, the first chunk could not have all).
+  '''
+  for texts, targets in chunks:
+    classifier.partial_fit(vectorizer.transform(texts), targets, classes=classes)
+  return classifier
+
+def score_chunks(classifier, vectorizer, chunks):
+  '''
+  Accuracy and log loss of classifier over all chunks, without keeping predictions in memory.
+  '''
+  num_samples = 0
+  num_correct = 0
+  log_loss_sum = 0.0
+  for texts, targets in chunks:
+    if len(targets) == 0:
+      continue
+    X = vectorizer.transform(texts)
+    probabilities = classifier.predict_proba(X)
+    predicted = classifier.classes_[np.argmax(probabilities, axis=1)]
+    num_samples += len(targets)
+    num_correct += np.sum(predicted == targets)
+    log_loss_sum += log_loss(targets, probabilities, labels=classifier.classes_, normalize=False)
+  if num_samples == 0:
+    raise ValueError("score_chunks has seen no samples, the chunks are empty")
+  return num_correct / num_samples, log_loss_sum / num_samples
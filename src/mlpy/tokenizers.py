@@ -0,0 +1,83 @@
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from mlpy.pool import process_context, effective_n_jobs
+
+'''
+Lemmatize/stem tokenizer of the news classifier (it needs nltk and gensim, and nltk.download('wordnet')).
+Every document is split by gensim simple_preprocess (lowercase words), and every word is replaced by
+the Snowball stem of its WordNet lemma (as verb). Lemma and stem are the slow part, but the words of a corpus
+repeat continuously (few distinct words are most of the tokens), then the normalization of every distinct
+word is memoized in a bounded LRU (cache_size words).
+tokenize_documents splits the documents in shards for a pool of processes: every worker has its own LRU,
+and the WordNet corpus is loaded before the fork, then the workers share its pages.
+'''
+
+CACHE_SIZE = 2**16 #distinct words memoized by every process
+
+class LemmaStemTokenizer:
+  '''
+  tokenizer(text) returns the list of stems of the lemmas of the words of text, without stop words.
+  The stop words are removed after lemma and stem, like TfidfVectorizer(tokenizer=..., stop_words=...) does
+  ("does", "having", "was" become "do", "have", "be"). It can be given to TfidfVectorizer(tokenizer=...), or used by tokenize_documents.
+  '''
+  def __init__(self, cache_size=CACHE_SIZE, lemmatize=True, stop_words=ENGLISH_STOP_WORDS):
+    self.cache_size = cache_size #0 = no cache
+    self.lemmatize = lemmatize
+    self.stop_words = frozenset(stop_words or ())
+    self._build()
+
+  def _build(self):
+    import nltk #optional dependencies, imported only by who uses the tokenizer
+    from gensim.utils import simple_preprocess
+    self._simple_preprocess = simple_preprocess
+    lemmatizer = nltk.stem.WordNetLemmatizer() if self.lemmatize else None #words in third person, verbs in past/future, ...
+    stemmer = nltk.stem.SnowballStemmer("english") #to map different forms of the same word to a stem
+    def normalize(token):
+      if lemmatizer is not None:
+        token = lemmatizer.lemmatize(token, pos='v')
+      return stemmer.stem(token)
+    self.normalize = functools.lru_cache(maxsize=self.cache_size)(normalize) if self.cache_size else normalize
+
+  #The cache is not sent to the workers: every worker builds its own LRU
+  def __getstate__(self):
+    return {"cache_size": self.cache_size, "lemmatize": self.lemmatize, "stop_words": self.stop_words}
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._build()
+
+  def __call__(self, text):
+    normalize = self.normalize
+    stop_words = self.stop_words
+    tokens = [normalize(token) for token in self._simple_preprocess(text)]
+    return [token for token in tokens if token not in stop_words]
+
+def pretokenized(tokens):
+  '''
+  Analyzer for the documents already tokenized: TfidfVectorizer(analyzer=pretokenized).
+  '''
+  return tokens
+
+_worker = {} #in the worker: "tokenizer"
+
+def _init_worker(tokenizer):
+  _worker["tokenizer"] = tokenizer
+
+def _tokenize_shard(texts):
+  tokenizer = _worker["tokenizer"]
+  return [tokenizer(text) for text in texts]
+
+def tokenize_documents(texts, tokenizer=None, n_jobs=None, shard_size=500):
+  '''
+  [tokenizer(text) for text in texts] (default LemmaStemTokenizer()), computed by shards of shard_size documents
+  in a pool of n_jobs processes (default: num of CPUs, 1 = in this process). The order of texts is kept.
+  '''
+  tokenizer = tokenizer or LemmaStemTokenizer()
+  n_jobs = effective_n_jobs(n_jobs)
+  if n_jobs == 1 or len(texts) <= shard_size:
+    return [tokenizer(text) for text in texts]
+  tokenizer("loaded before the fork") #the WordNet corpus is loaded at first use
+  shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+  with ProcessPoolExecutor(n_jobs, mp_context=process_context(), initializer=_init_worker, initargs=(tokenizer,)) as executor:
+    return [tokens for shard in executor.map(_tokenize_shard, shards) for tokens in shard]
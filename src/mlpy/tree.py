@@ -0,0 +1,215 @@
+import numpy as np
+
+'''
+Decision tree on binned features (histogram split finding).
+DecisionTreeClassifier of sklearn sorts the values of every feature at every node to find the best threshold;
+here every feature is binned once (Binner): at most max_bins (≤ 256) bins, uint8 codes,
+with a bin for every distinct value when there are no more than max_bins (the digits pixels have 17 values,
+Pclass/Sex/Age of Titanic few tens), else by quantiles.
+Then the split of a node is found from its histogram: the count of the samples of every class in every bin
+of every feature (one bincount), its cumulative sum over the bins gives the class counts on the left of every
+threshold, and the gini (or entropy) of all the thresholds of all the features is computed at once.
+Sibling subtraction: only the histogram of the smaller child is counted, the other one is parent − smaller,
+then every level of the tree costs at most half of the samples.
+The thresholds are the ones of the original values (midpoints between the bins), so predict works on X not binned,
+and with a bin for every distinct value the candidate splits are the same ones of DecisionTreeClassifier.
+'''
+
+class Binner:
+  '''
+  fit(X) finds the thresholds of every feature, transform(X) gives the uint8 bins (bin b is thresholds[b − 1] < x <= thresholds[b]).
+  '''
+  def __init__(self, max_bins=256):
+    if not 2 <= max_bins <= 256:
+      raise ValueError("max_bins must be between 2 and 256")
+    self.max_bins = max_bins
+
+  def fit(self, X):
+    X = np.asarray(X, dtype=np.float64)
+    self.thresholds_ = []
+    for column in X.T:
+      column = np.sort(column)
+      values = column[np.concatenate([[True], column[1:] != column[:-1]])]
+      if len(values) <= self.max_bins:
+        thresholds = (values[:-1] + values[1:]) / 2 #a bin for every distinct value
+      else:
+        quantiles = column[(np.arange(1, self.max_bins) * len(column)) // self.max_bins]
+        #the thresholds are midpoints between distinct values, as the ones of DecisionTreeClassifier
+        positions = np.unique(np.searchsorted(values, quantiles, side="right"))
+        positions = positions[(positions > 0) & (positions < len(values))]
+        thresholds = (values[positions - 1] + values[positions]) / 2
+      self.thresholds_.append(thresholds)
+    self.n_bins_ = np.array([len(thresholds) + 1 for thresholds in self.thresholds_])
+    return self
+
+  def transform(self, X):
+    columns = np.asarray(X, dtype=np.float64).T.copy() #contiguous columns for searchsorted
+    binned = np.empty(columns.shape[::-1], dtype=np.uint8, order="F") #by columns, like the histograms
+    for index, thresholds in enumerate(self.thresholds_):
+      binned[:, index] = np.searchsorted(thresholds, columns[index], side="left")
+    return binned
+
+  def fit_transform(self, X):
+    return self.fit(X).transform(X)
+
+class HistogramTreeClassifier:
+  '''
+  Decision tree classifier (criterion "gini" or "entropy") grown on the histograms of the binned features.
+  The fitted tree is in flat arrays: feature_ (−1 for the leaves), threshold_ (original values), threshold_bin_,
+  children_left_/children_right_, value_ (fraction of every class in the node).
+  '''
+  def __init__(self, criterion="gini", max_depth=None, min_samples_split=2, min_samples_leaf=1,
+    max_features=None, max_bins=256, subtract=True, random_state=None):
+    if criterion not in ("gini", "entropy"):
+      raise ValueError("criterion must be \"gini\" or \"entropy\"")
+    self.criterion = criterion
+    self.max_depth = max_depth
+    self.min_samples_split = min_samples_split
+    self.min_samples_leaf = min_samples_leaf
+    self.max_features = max_features #None, "sqrt", "log2", int or float: features tried at every node
+    self.max_bins = max_bins
+    self.subtract = subtract #sibling subtraction (False counts the histograms of both children, to compare)
+    self.random_state = random_state
+
+  def _num_features(self, n_features):
+    if self.max_features is None:
+      return n_features
+    if self.max_features == "sqrt":
+      return max(1, int(np.sqrt(n_features)))
+    if self.max_features == "log2":
+      return max(1, int(np.log2(n_features)))
+    if isinstance(self.max_features, float):
+      return max(1, int(self.max_features * n_features))
+    return min(n_features, self.max_features)
+
+  def _histogram(self, binned, classes, rows):
+    #(features, bins, classes) counts of the rows
+    n_features = binned.shape[1]
+    indices = (binned[rows].astype(np.intp) + self._feature_offsets) * self._num_classes + classes[rows, None]
+    return np.bincount(indices.ravel(), minlength=n_features * self._width * self._num_classes).reshape(
+      n_features, self._width, self._num_classes)
+
+  def _score(self, counts, totals):
+    #the split with the max sum of the scores of the children has the min weighted impurity (counts (..., classes), integer):
+    #gini: n·(1 − Σ p²) = n − Σ c²/n, entropy: n·H = n log n − Σ c log c
+    if self.criterion == "gini":
+      return np.einsum("...c,...c->...", counts, counts) / np.maximum(totals, 1)
+    return np.einsum("...c,...c->...", counts, np.log(np.maximum(counts, 1))) - totals * np.log(np.maximum(totals, 1))
+
+  def _best_split(self, histogram, features):
+    #(feature, bin) of the best split of the node, None if no split decreases the impurity
+    if self._width == 1 or not np.any(self._n_bins[features] >= 2): #only constant features, no threshold
+      return None
+    left = np.cumsum(histogram[features], axis=1, dtype=np.float64)[:, :-1] #class counts of bins <= b, for every threshold b
+    parent = histogram[features[0]].sum(axis=0, dtype=np.float64)
+    right = parent - left
+    left_totals = left.sum(axis=2)
+    right_totals = parent.sum() - left_totals
+    scores = self._score(left, left_totals) + self._score(right, right_totals)
+    #the bins after the last one of a feature are empty, then their right side too (excluded by min_samples_leaf >= 1)
+    min_samples_leaf = max(1, self.min_samples_leaf)
+    scores[(left_totals < min_samples_leaf) | (right_totals < min_samples_leaf)] = -np.inf
+    best = np.unravel_index(np.argmax(scores), scores.shape)
+    if scores[best] - self._score(parent, parent.sum()) <= 1e-9 * parent.sum():
+      return None
+    return features[best[0]], best[1]
+
+  def fit(self, X, y):
+    self.binner_ = Binner(self.max_bins).fit(X)
+    binned = self.binner_.transform(X)
+    return self._fit_binned(binned, y)
+
+  def _fit_binned(self, binned, y):
+    random_generator = np.random.default_rng(self.random_state)
+    self.classes_, classes = np.unique(y, return_inverse=True)
+    n_samples, n_features = binned.shape
+    self.n_features_in_ = n_features
+    self._num_classes = len(self.classes_)
+    self._n_bins = self.binner_.n_bins_
+    self._width = int(self._n_bins.max())
+    self._feature_offsets = np.arange(n_features) * self._width
+    num_tried = self._num_features(n_features)
+    max_depth = np.inf if self.max_depth is None else self.max_depth
+
+    feature, threshold_bin, left_children, right_children, values = [], [], [], [], []
+    def add_node(histogram):
+      counts = histogram[0].sum(axis=0)
+      feature.append(-1)
+      threshold_bin.append(0)
+      left_children.append(-1)
+      right_children.append(-1)
+      values.append(counts / counts.sum())
+      return len(feature) - 1
+
+    rows = np.arange(n_samples)
+    histogram = self._histogram(binned, classes, rows)
+    stack = [(add_node(histogram), rows, histogram, 0)] #depth first
+    while stack:
+      node, rows, histogram, depth = stack.pop()
+      counts = histogram[0].sum(axis=0)
+      if depth >= max_depth or len(rows) < self.min_samples_split or np.count_nonzero(counts) <= 1:
+        continue
+      features = np.arange(n_features) if num_tried == n_features else np.sort(random_generator.choice(n_features, num_tried, replace=False))
+      split = self._best_split(histogram, features)
+      if split is None:
+        continue
+      split_feature, split_bin = split
+      goes_left = binned[rows, split_feature] <= split_bin
+      left_rows, right_rows = rows[goes_left], rows[~goes_left]
+      if self.subtract:
+        smaller = left_rows if len(left_rows) <= len(right_rows) else right_rows
+        smaller_histogram = self._histogram(binned, classes, smaller)
+        other_histogram = histogram - smaller_histogram
+        if smaller is left_rows:
+          left_histogram, right_histogram = smaller_histogram, other_histogram
+        else:
+          left_histogram, right_histogram = other_histogram, smaller_histogram
+      else:
+        left_histogram, right_histogram = self._histogram(binned, classes, left_rows), self._histogram(binned, classes, right_rows)
+      feature[node], threshold_bin[node] = split_feature, split_bin
+      left_children[node], right_children[node] = add_node(left_histogram), add_node(right_histogram)
+      stack.append((right_children[node], right_rows, right_histogram, depth + 1))
+      stack.append((left_children[node], left_rows, left_histogram, depth + 1))
+
+    self.feature_ = np.array(feature, dtype=np.intp)
+    self.threshold_bin_ = np.array(threshold_bin, dtype=np.uint8)
+    self.threshold_ = np.array([
+      self.binner_.thresholds_[index][position] if index >= 0 else np.nan for index, position in zip(feature, threshold_bin)
+    ], dtype=np.float64)
+    self.children_left_ = np.array(left_children, dtype=np.intp)
+    self.children_right_ = np.array(right_children, dtype=np.intp)
+    self.value_ = np.array(values)
+    return self
+
+  @property
+  def node_count(self):
+    return len(self.feature_)
+
+  def get_depth(self):
+    depths = np.zeros(self.node_count, dtype=np.intp)
+    for node in range(self.node_count): #the children are always after the parent
+      if self.feature_[node] >= 0:
+        depths[self.children_left_[node]] = depths[self.children_right_[node]] = depths[node] + 1
+    return int(depths.max())
+
+  def apply(self, X):
+    '''
+    Leaf of every sample (all the samples go down one level at a time).
+    '''
+    X = np.asarray(X, dtype=np.float64)
+    nodes = np.zeros(len(X), dtype=np.intp)
+    samples = np.arange(len(X))
+    while len(samples):
+      current = nodes[samples]
+      features = self.feature_[current]
+      internal = features >= 0
+      samples, current, features = samples[internal], current[internal], features[internal]
+      goes_left = X[samples, features] <= self.threshold_[current]
+      nodes[samples] = np.where(goes_left, self.children_left_[current], self.children_right_[current])
+    return nodes
+
+  def predict_proba(self, X):
+    return self.value_[self.apply(X)]
+
+  def predict(self, X):
+    return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
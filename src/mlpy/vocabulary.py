@@ -0,0 +1,173 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from mlpy.flatfile import write_arrays, read_arrays
+
+'''
+Compact export of a fitted CountVectorizer/TfidfVectorizer, loaded by memory map (see mlpy.flatfile).
+The vocabulary dict of sklearn is a Python str and int for every term (pickled, and rebuilt at every load),
+here it's a sorted string table:
+- terms_: the UTF-8 bytes of all the terms, sorted, one after another (offsets_[i]:offsets_[i + 1] is the term i)
+- prefixes_: the first 8 bytes of every term as uint64 (big endian, zero padded: the same order of the terms),
+  for a vectorized binary search
+- ids_: int32 column of every term
+- idf_: float64 idf of every column (TfidfVectorizer)
+A term is found by np.searchsorted of its prefix in prefixes_, then by a binary search on the bytes
+of the few terms with the same prefix (vectorized over all the terms searched).
+Only the distinct terms of the documents to transform are looked up.
+'''
+
+MAGIC = b"MLPYVOC1"
+PREFIX = 8 #bytes of the prefix of the terms, one uint64
+
+#Parameters of the analyzer (how a document is split in terms) and of the weights
+ANALYZER_PARAMETERS = ["analyzer", "lowercase", "strip_accents", "token_pattern", "stop_words", "ngram_range"]
+TFIDF_PARAMETERS = ["norm", "use_idf", "smooth_idf", "sublinear_tf"]
+
+def _prefixes(padded_bytes):
+  #rows of PREFIX zero padded bytes => uint64 with the same order
+  return np.ascontiguousarray(padded_bytes[:, :PREFIX]).view(">u8").ravel().astype(np.uint64)
+
+def analyzer_parameters(vectorizer):
+  '''
+  ANALYZER_PARAMETERS of the vectorizer as a JSON serializable dict (CountVectorizer(**parameters) splits the documents the same way).
+  '''
+  parameters = {key: getattr(vectorizer, key) for key in ANALYZER_PARAMETERS}
+  if parameters["stop_words"] is not None and not isinstance(parameters["stop_words"], str):
+    parameters["stop_words"] = sorted(parameters["stop_words"])
+  parameters["ngram_range"] = list(parameters["ngram_range"])
+  return parameters
+
+def save_vectorizer(path, vectorizer):
+  '''
+  Save the fitted vectorizer (CountVectorizer or TfidfVectorizer, with a string analyzer and without custom callables) in path.
+  '''
+  if not isinstance(vectorizer, CountVectorizer):
+    raise TypeError("%s is not CountVectorizer or TfidfVectorizer" % type(vectorizer).__name__)
+  if callable(vectorizer.analyzer) or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+    raise ValueError("a vectorizer with a custom analyzer, tokenizer or preprocessor can't be saved")
+  header = {
+    "model": type(vectorizer).__name__, "parameters": analyzer_parameters(vectorizer),
+    "binary": vectorizer.binary, "dtype": np.dtype(vectorizer.dtype).str
+  }
+  if isinstance(vectorizer, TfidfVectorizer):
+    header["tfidf"] = {key: getattr(vectorizer, key) for key in TFIDF_PARAMETERS}
+
+  terms = sorted((term.encode("utf-8"), column) for term, column in vectorizer.vocabulary_.items())
+  lengths = np.fromiter((len(term) for term, _ in terms), dtype=np.int64, count=len(terms))
+  arrays = {
+    "terms_": np.frombuffer(b"".join(term for term, _ in terms), dtype=np.uint8),
+    "offsets_": np.concatenate([[0], np.cumsum(lengths)]),
+    "prefixes_": _prefixes(np.array([term[:PREFIX] for term, _ in terms], dtype="S%d" % PREFIX).view(np.uint8).reshape(-1, PREFIX)),
+    "ids_": np.fromiter((column for _, column in terms), dtype=np.int32, count=len(terms))
+  }
+  if "tfidf" in header and vectorizer.use_idf:
+    arrays["idf_"] = np.asarray(vectorizer.idf_, dtype=np.float64)
+  write_arrays(path, MAGIC, header, arrays)
+
+def load_vectorizer(path, mmap_mode=True):
+  '''
+  Load a vectorizer saved by save_vectorizer as CompactVectorizer.
+  '''
+  header, arrays = read_arrays(path, MAGIC, mmap_mode)
+  return CompactVectorizer(header, arrays)
+
+class CompactVectorizer:
+  '''
+  transform(texts) of the saved vectorizer (the same sparse matrix), from the sorted string table.
+  '''
+  def __init__(self, header, arrays):
+    self.header = header
+    for key, value in arrays.items():
+      setattr(self, key, value)
+    parameters = dict(header["parameters"], ngram_range=tuple(header["parameters"]["ngram_range"]))
+    self._analyze = CountVectorizer(**parameters).build_analyzer() #without vocabulary, it only splits the documents
+    self.binary = header["binary"]
+    self.dtype = np.dtype(header["dtype"])
+    self.tfidf = header.get("tfidf")
+
+  def __len__(self):
+    return len(self.ids_)
+
+  def _compare(self, positions, suffixes, query_lengths):
+    #sign of term[positions] − query (bytewise, −1/0/1) for every row, when their first PREFIX bytes are the same:
+    #only the bytes after the prefix are compared (suffixes are the zero padded bytes of the queries after PREFIX)
+    starts = self.offsets_[positions]
+    term_lengths = self.offsets_[positions + 1] - starts
+    compare = np.sign(term_lengths - query_lengths) #when all the bytes compared are the same, the longer term is greater
+    width = suffixes.shape[1]
+    if width == 0:
+      return compare
+    columns = np.arange(width)
+    inside = columns < np.clip(term_lengths - PREFIX, 0, width)[:, None]
+    terms = np.where(inside, self.terms_[np.minimum(starts[:, None] + PREFIX + columns, len(self.terms_) - 1)], 0)
+    different = terms != suffixes
+    rows = np.nonzero(different.any(axis=1))[0]
+    first = different[rows].argmax(axis=1)
+    compare[rows] = np.sign(terms[rows, first].astype(np.int16) - suffixes[rows, first])
+    return compare
+
+  def lookup(self, terms, block_bytes=2**24):
+    '''
+    Column of every term (−1 for the terms not in the vocabulary).
+    The terms are searched all together: np.searchsorted of their prefixes gives the range of the terms
+    with the same prefix, then a binary search in the ranges compares the bytes of all the terms at every step.
+    '''
+    encoded = [term.encode("utf-8") for term in terms]
+    columns = np.full(len(encoded), -1, dtype=np.int32)
+    if not encoded or not len(self):
+      return columns
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    width = max(int(lengths.max()), PREFIX)
+    block_rows = max(1, block_bytes // width)
+    for block_start in range(0, len(encoded), block_rows):
+      block_lengths = lengths[block_start:block_start + block_rows]
+      #the terms of the block as rows of zero padded bytes
+      queries = np.zeros((len(block_lengths), width), dtype=np.uint8)
+      rows = np.repeat(np.arange(len(block_lengths)), block_lengths)
+      positions = np.arange(len(rows)) - np.repeat(np.cumsum(block_lengths) - block_lengths, block_lengths)
+      queries[rows, positions] = np.frombuffer(b"".join(encoded[block_start:block_start + block_rows]), dtype=np.uint8)
+      prefixes = _prefixes(queries)
+      lows = np.searchsorted(self.prefixes_, prefixes, side="left")
+      highs = np.searchsorted(self.prefixes_, prefixes, side="right")
+      active = np.nonzero(highs > lows)[0]
+      lows, highs = lows[active], highs[active]
+      while len(active):
+        middles = (lows + highs) // 2
+        compare = self._compare(middles, queries[active, PREFIX:], block_lengths[active])
+        found = compare == 0
+        columns[block_start + active[found]] = self.ids_[middles[found]]
+        lows = np.where(compare < 0, middles + 1, lows)
+        highs = np.where(compare > 0, middles, highs)
+        searching = ~found & (lows < highs)
+        active, lows, highs = active[searching], lows[searching], highs[searching]
+    return columns
+
+  def transform(self, texts):
+    documents = [self._analyze(text) for text in texts]
+    unique_terms = list(set().union(*documents))
+    columns = dict(zip(unique_terms, self.lookup(unique_terms).tolist())) #only the terms of these documents
+    indices = []
+    for tokens in documents:
+      indices.extend(map(columns.__getitem__, tokens))
+    indices = np.asarray(indices, dtype=np.int32)
+    #the terms not in the vocabulary (−1) are dropped
+    found = indices >= 0
+    rows = np.repeat(np.arange(len(documents)), [len(tokens) for tokens in documents])
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows[found], minlength=len(documents)))])
+    X = sp.csr_matrix((np.ones(found.sum(), dtype=self.dtype), indices[found], indptr), shape=(len(texts), len(self)))
+    X.sum_duplicates()
+    if self.binary:
+      X.data.fill(1)
+    if self.tfidf is not None:
+      #the weights in the dtype of the vectorizer (TfidfVectorizer computes only float32 or float64)
+      X = X.astype(self.dtype if self.dtype in (np.float32, np.float64) else np.float64)
+      if self.tfidf["sublinear_tf"]:
+        np.log(X.data, X.data)
+        X.data += 1
+      if self.tfidf["use_idf"]:
+        X.data *= self.idf_[X.indices].astype(X.dtype)
+      if self.tfidf["norm"] is not None:
+        X = normalize(X, norm=self.tfidf["norm"], copy=False)
+    return X
@@ -0,0 +1,54 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.text import iter_text_chunks, partial_fit_chunks, score_chunks
+
+'''
+Out-of-core version of bernoulli-nb.py, for corpora that don't fit in memory.
+The reviews are never loaded all together: the CSV is read in chunks of rows, and
+- HashingVectorizer replaces CountVectorizer: it maps every word to one of n_features columns with a hash function,
+  then it doesn't need to build the vocabulary in memory (fixed width, stateless)
+- BernoulliNB.partial_fit updates the counts of the model with one chunk at a time
+The peak memory depends on chunksize and n_features, not on the number of reviews.
+'''
+
+reviews_csv = "data/movie_review_imdb.csv"
+chunksize = 5000 #num of reviews in memory at the same time
+
+#BernoulliNB is designed for binary/boolean features, then binary=True (One-hot) and without norm/sign
+hashing_vectorizer = HashingVectorizer(
+  n_features=2**20, #num of columns, collisions are rare with a large value
+  lowercase=True,
+  stop_words='english', #terms to be ignored
+  binary=True, #all non zero values are set to 1
+  alternate_sign=False,
+  norm=None
+)
+
+bernoulli = BernoulliNB(
+  #alpha=2
+)
+
+#The rows are split in train/test while reading (30% test), the same split at every pass over the file
+def reviews(subset):
+  return iter_text_chunks(reviews_csv, "review", "sentiment", chunksize=chunksize, subset=subset, test_size=0.3, random_state=42)
+
+#All classes must be passed at first partial_fit
+partial_fit_chunks(bernoulli, hashing_vectorizer, reviews("train"), classes=np.array(['negative', 'positive']))
+
+#Model overfitting evaluation
+accuracy, loss = score_chunks(bernoulli, hashing_vectorizer, reviews("train"))
+print("\nModel overfitting evaluation")
+print("ACCURACY: ", accuracy)
+print("LOG LOSS: ", loss)
+
+#Model evaluation
+accuracy, loss = score_chunks(bernoulli, hashing_vectorizer, reviews("test"))
+print("\nModel evaluation")
+print("ACCURACY: ", accuracy)
+print("LOG LOSS: ", loss)
+
+#Try to predict a new case
+x1 = ["I loved this movie, beautiful cast and soundtrack."]
+y1 = bernoulli.predict(hashing_vectorizer.transform(x1))
+print("\nSentiment analysis of review: ", y1[0])
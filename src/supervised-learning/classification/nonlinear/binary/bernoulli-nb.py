@@ -1,24 +1,29 @@
+import numpy as np
 import pandas as pd
-import seaborn as sns
 from sklearn.metrics import accuracy_score, log_loss
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import BernoulliNB
 from sklearn.model_selection import cross_val_score,KFold
+from mlpy.bench import BENCH, sns
+from mlpy.instrument import stage
+from mlpy.bitpacked import pack_bits, BitPackedBernoulliNB
 
 #Load data
-reviews_df = pd.read_csv("data/movie_review_imdb.csv")
+with stage("load", dataset="movie_review_imdb"):
+  reviews_df = pd.read_csv("data/movie_review_imdb.csv")
 
-#General info
-reviews_df.head()
-reviews_df.describe() 
-reviews_df.shape #2 columns, 50000 rows
-reviews_df['sentiment'].unique() #array(['positive', 'negative'], dtype=object) => binary classification
-sns.countplot(data=reviews_df, x='sentiment') #Ok, the classes are quite distributed
-reviews_df.isnull().sum() 
+if not BENCH:
+  #General info
+  reviews_df.head()
+  reviews_df.describe() 
+  reviews_df.shape #2 columns, 50000 rows
+  reviews_df['sentiment'].unique() #array(['positive', 'negative'], dtype=object) => binary classification
+  sns.countplot(data=reviews_df, x='sentiment') #Ok, the classes are quite distributed
+  reviews_df.isnull().sum() 
 
-#Correlation between data/target (we assume moderate correlation from 0.5)
-#The column "text" contains phrases in natural language, it's not possible check correlation with corr() that  works only for numbers
+  #Correlation between data/target (we assume moderate correlation from 0.5)
+  #The column "text" contains phrases in natural language, it's not possible check correlation with corr() that  works only for numbers
 
 '''
 The data are phrases in natural language.
@@ -32,7 +37,8 @@ X = reviews_df["review"].values
 Y = reviews_df["sentiment"].values
 
 #Separates data in rows train/test
-X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=42)
+with stage("split"):
+  X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=42)
 
 bernoulli = BernoulliNB(
   #alpha=2
@@ -47,31 +53,76 @@ count_vectorizer = CountVectorizer(
   binary=True #all non zero values are set to 1 (for binary classification)  
 )
 
-X_train_vector = count_vectorizer.fit_transform(X_train)
-X_test_vector = count_vectorizer.transform(X_test)
+with stage("vectorize", vectorizer="CountVectorizer", subset="train"):
+  X_train_vector = count_vectorizer.fit_transform(X_train)
+with stage("vectorize", vectorizer="CountVectorizer", subset="test"):
+  X_test_vector = count_vectorizer.transform(X_test)
 
-bernoulli.fit(X_train_vector, Y_train) #Building model
+with stage("fit", model="BernoulliNB"):
+  bernoulli.fit(X_train_vector, Y_train) #Building model
 
-Y_train_predicted = bernoulli.predict(X_train_vector)
-Y_train_predicted_proba = bernoulli.predict_proba(X_train_vector)
+with stage("predict", subset="train"):
+  Y_train_predicted = bernoulli.predict(X_train_vector)
+with stage("predict_proba", subset="train"):
+  Y_train_predicted_proba = bernoulli.predict_proba(X_train_vector)
 
 #Model overfitting evaluation 
-print("\nModel overfitting evaluation")
-print("ACCURACY: ", accuracy_score(Y_train, Y_train_predicted)) 
-print("LOG LOSS: ", log_loss(Y_train, Y_train_predicted_proba)) 
+with stage("metric", subset="train"):
+  print("\nModel overfitting evaluation")
+  print("ACCURACY: ", accuracy_score(Y_train, Y_train_predicted)) 
+  print("LOG LOSS: ", log_loss(Y_train, Y_train_predicted_proba)) 
 
-Y_test_predicted = bernoulli.predict(X_test_vector)
-Y_test_predicted_proba = bernoulli.predict_proba(X_test_vector)
+with stage("predict", subset="test"):
+  Y_test_predicted = bernoulli.predict(X_test_vector)
+with stage("predict_proba", subset="test"):
+  Y_test_predicted_proba = bernoulli.predict_proba(X_test_vector)
 
 #Model evaluation 
-print("\nModel evaluation")
-print("ACCURACY: ", accuracy_score(Y_test, Y_test_predicted)) 
-print("LOG LOSS: ", log_loss(Y_test, Y_test_predicted_proba)) 
+with stage("metric", subset="test"):
+  print("\nModel evaluation")
+  print("ACCURACY: ", accuracy_score(Y_test, Y_test_predicted)) 
+  print("LOG LOSS: ", log_loss(Y_test, Y_test_predicted_proba)) 
 
 '''
 The model would appear moderately overfitted for this problem.
 '''
 
+'''
+The features are 0/1, then every document can be a bitset (1 bit for every term) instead of CSR (int64 value + int32 index for every term).
+BitPackedBernoulliNB is the same model on the bitsets: the log likelihoods are AND + popcount of the bits of the documents
+with the bits of the quantized weights of every class.
+The bitsets are smaller than CSR only when the vocabulary is small, then here they have only the columns of the 1000 terms
+in most reviews of train (with all the terms of the reviews CSR is smaller and faster, see python -m mlpy.benchmarks.bitpacked_nb).
+'''
+
+with stage("vectorize", step="select", features=1000):
+  frequent_terms = np.argsort(-X_train_vector.sum(axis=0).A1, kind="stable")[:1000]
+  X_train_small = X_train_vector[:, frequent_terms]
+  X_test_small = X_test_vector[:, frequent_terms]
+
+with stage("vectorize", step="pack", subset="train"):
+  X_train_bits = pack_bits(X_train_small)
+with stage("vectorize", step="pack", subset="test"):
+  X_test_bits = pack_bits(X_test_small)
+
+with stage("fit", model="BitPackedBernoulliNB"):
+  bernoulli_bits = BitPackedBernoulliNB().fit(X_train_bits, Y_train)
+
+with stage("predict", subset="test", model="BitPackedBernoulliNB"):
+  Y_test_predicted_bits = bernoulli_bits.predict(X_test_bits)
+
+#The same model of BernoulliNB on the same 1000 terms, for the comparison of the predictions
+with stage("fit", model="BernoulliNB", features=1000):
+  bernoulli_small = BernoulliNB().fit(X_train_small, Y_train)
+with stage("predict", subset="test", model="BernoulliNB", features=1000):
+  Y_test_predicted_small = bernoulli_small.predict(X_test_small)
+
+with stage("metric", subset="test", model="BitPackedBernoulliNB"):
+  print("\nModel evaluation (bit-packed, 1000 terms)")
+  print("ACCURACY: ", accuracy_score(Y_test, Y_test_predicted_bits))
+  print("SAME PREDICTIONS OF BernoulliNB (1000 terms): ", (Y_test_predicted_bits == Y_test_predicted_small).mean())
+  print("BITSETS: ", X_test_bits.nbytes, "bytes, CSR: ", X_test_small.data.nbytes + X_test_small.indices.nbytes + X_test_small.indptr.nbytes, "bytes")
+
 #Try to predict a new case
 
 x1 = ["I liked soundtrack, photography and the cast but the film was really long and it lacked of a good plot."]
@@ -92,4 +143,9 @@ x3 = count_vectorizer.transform(x3)
 y3 = bernoulli.predict(x3)
 print("\nSentiment analysis of review: ", y3[0])
 
-
+'''
+The fitted CountVectorizer can be saved as a compact vocabulary file loaded by memory map (mlpy.vocabulary),
+and the model can be updated with new labeled reviews from its saved counts only, without the full CSV (mlpy.online).
+They write model files, then they are not in the script: the benchmarks run them on held out reviews,
+PYTHONPATH=src python -m mlpy.benchmarks.vectorizer_cold_start and PYTHONPATH=src python -m mlpy.benchmarks.online_nb
+'''
@@ -1,37 +1,38 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pylab as plt
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.bench import BENCH, sns, plt
+from mlpy.neighbors import kneighbors_sweep, BlockedNearestNeighbors
 
 #Load data
 breast_cancer = load_breast_cancer()
 
-#General info
-print(breast_cancer.DESCR) #Cancers 31 columns of informations, e 1 column with the diagnosis
-breast_cancer_df = pd.DataFrame(breast_cancer.data, columns=breast_cancer.feature_names)
-breast_cancer_df['diagnosis'] = breast_cancer.target 
-breast_cancer_df['diagnosis'].unique() #array([0, 1]) => binary classification
-breast_cancer_df.head()
-breast_cancer_df.describe() 
-breast_cancer_df.shape #32 columns, 569 rows
-sns.countplot(data=breast_cancer_df, x='diagnosis') #Ok, the classes are quite distributed
-breast_cancer_df.isnull().sum() 
-np.isnan(breast_cancer_df.drop('diagnosis',axis=1)).any() #Many algorithms do work only with numerical data
-
-#Correlation between features and class diagnosis (we assume moderate correlation from 0.5)
-breast_cancer_df.corr()['diagnosis'].sort_values() #There are many features mildly correlated with target
-
-#Draw correlation between numerical worst concave points, worst perimeter and class diagnosis
-sns.scatterplot(x=breast_cancer_df['worst concave points'], y=breast_cancer_df['worst perimeter'], hue=breast_cancer_df['diagnosis'], palette='viridis')
-plt.title("Correlation between worst concave points, worst perimeter and diagnosis")
-plt.xlabel("worst concave points")
-plt.ylabel("worst perimeter")
-plt.show()
+if not BENCH:
+  #General info
+  print(breast_cancer.DESCR) #Cancers 31 columns of informations, e 1 column with the diagnosis
+  breast_cancer_df = pd.DataFrame(breast_cancer.data, columns=breast_cancer.feature_names)
+  breast_cancer_df['diagnosis'] = breast_cancer.target 
+  breast_cancer_df['diagnosis'].unique() #array([0, 1]) => binary classification
+  breast_cancer_df.head()
+  breast_cancer_df.describe() 
+  breast_cancer_df.shape #32 columns, 569 rows
+  sns.countplot(data=breast_cancer_df, x='diagnosis') #Ok, the classes are quite distributed
+  breast_cancer_df.isnull().sum() 
+  np.isnan(breast_cancer_df.drop('diagnosis',axis=1)).any() #Many algorithms do work only with numerical data
+
+  #Correlation between features and class diagnosis (we assume moderate correlation from 0.5)
+  breast_cancer_df.corr()['diagnosis'].sort_values() #There are many features mildly correlated with target
+
+  #Draw correlation between numerical worst concave points, worst perimeter and class diagnosis
+  sns.scatterplot(x=breast_cancer_df['worst concave points'], y=breast_cancer_df['worst perimeter'], hue=breast_cancer_df['diagnosis'], palette='viridis')
+  plt.title("Correlation between worst concave points, worst perimeter and diagnosis")
+  plt.xlabel("worst concave points")
+  plt.ylabel("worst perimeter")
+  plt.show()
 
 '''
 As you can see as worst concave points and worst perimeter increase, then diagnosis goes towards the value 0.
@@ -54,44 +55,57 @@ Y = breast_cancer.target
 #Separates data in rows train/test
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.1, random_state=0)
 
-#Check if X needs to scaling
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Standardize features (preferred vs. MinMaxScaler, the features upper/lower boundaries aren't known)
 standard_scaler = StandardScaler()
-X_train = standard_scaler.fit_transform(X_train)
-X_test = standard_scaler.transform(X_test)
+X_train, X_test, standard_scaler = fit_transform_cached(standard_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
 
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 num_neighbors = [4, 5, 7, 10, 12, 15, 18, 20, 25] 
 
+'''
+Every K needs the same neighbors search, only the number of neighbors that vote changes.
+Then the neighbors are searched once with the max K (sorted by distance),
+and the prediction of every K is the majority vote of its first K neighbors (see mlpy.neighbors.sweep).
+The search is brute-force in blocks (euclidean distance, i.e. minkowski with p=2): the distances are computed
+for a tile of points at a time, so the memory is bounded by memory_budget also predicting the whole training set.
+'''
+nearest_neighbors = BlockedNearestNeighbors(
+  memory_budget=64 * 2**20 #bytes of distances computed at the same time
+)
+#Approximate search (inverted file, see mlpy.neighbors.ivf) for millions of points: n_probe trades recall for speed
+#from mlpy.neighbors import IVFNearestNeighbors
+#nearest_neighbors = IVFNearestNeighbors(n_lists=32, n_probe=4)
+nearest_neighbors.fit(X_train)
+
+Y_train_predictions = kneighbors_sweep(X_train, Y_train, X_train, num_neighbors, neighbors=nearest_neighbors)
+Y_test_predictions = kneighbors_sweep(X_train, Y_train, X_test, num_neighbors, neighbors=nearest_neighbors)
+
 for K in num_neighbors:
 
   print("K=", str(K))
 
-  kn_classifier = KNeighborsClassifier(
-    n_neighbors=K, #num of neighbors to use
-    metric='minkowski' #to use for distance computation
-  )  
-  kn_classifier.fit(X_train,Y_train)
-
-  Y_train_predicted = kn_classifier.predict(X_train)
+  Y_train_predicted = Y_train_predictions[K]
 
   #Model overfitting evaluation 
   print("\nModel overfitting evaluation")
   print("ACCURACY SCORE: ", accuracy_score(Y_train, Y_train_predicted)) 
   
-  Y_test_predicted = kn_classifier.predict(X_test)
+  Y_test_predicted = Y_test_predictions[K]
   
   #Model evaluation 
   print("\nModel evaluation")
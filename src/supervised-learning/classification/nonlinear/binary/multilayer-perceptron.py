@@ -1,38 +1,44 @@
-import pandas as pd
 import numpy as np
-import seaborn as sns
 from sklearn.discriminant_analysis import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import log_loss
 from sklearn.metrics import accuracy_score
 from sklearn.neural_network import MLPClassifier
 from sklearn.tree import DecisionTreeClassifier
+from mlpy.datasets import load_titanic
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.bench import BENCH, sns
 
 #Load data
-passengers_df = pd.read_csv("https://web.stanford.edu/class/archive/cs/cs109/cs109.1166/stuff/titanic.csv")
+passengers_df = load_titanic() #titanic.csv is downloaded once and cached by columns (see mlpy.datasets)
 
-#General info
-passengers_df.head()
-passengers_df.describe() 
-passengers_df.shape #8 columns, 887 rows
-passengers_df['Survived'].unique() #array([0, 1]) => binary classification (Not Survived, Survived)
-sns.countplot(data=passengers_df, x='Survived') #The 1 class are many more than 0 class
-passengers_df.isnull().sum() 
+if not BENCH:
+  #General info
+  passengers_df.head()
+  passengers_df.describe() 
+  passengers_df.shape #8 columns, 887 rows
+  passengers_df['Survived'].unique() #array([0, 1]) => binary classification (Not Survived, Survived)
+  sns.countplot(data=passengers_df, x='Survived') #The 1 class are many more than 0 class
+  passengers_df.isnull().sum() 
 
 #Correlation between features and class Survived (we assume moderate correlation from 0.5)
 passengers_df= passengers_df.drop("Name",axis=1) #Drop column Name that is clearly irrelevant
 mapping_sex = {'male': 0, 'female': 1}
 passengers_df['Sex'] = passengers_df['Sex'].map(mapping_sex)
-passengers_df.corr()['Survived'].sort_values() #There may be a correlation with Age, Pclass and Sex
+if not BENCH:
+  passengers_df.corr()['Survived'].sort_values() #There may be a correlation with Age, Pclass and Sex
 
-#Draw correlation between classes Sex, Pclass, Age and class Survived
-sns.barplot(data=passengers_df, x='Sex', y='Survived') #The female(1) have survival average more than male(0)
-sns.barplot(data=passengers_df, x='Pclass', y='Survived') #The Pclass(3) flu the survival average 
+#The model uses all columns, also Age_block
 def map_age(age): 
   return round(age / 10)
 passengers_df['Age_block'] = passengers_df['Age'].apply(lambda age: map_age(age))
-sns.barplot(data=passengers_df, x='Age_block', y='Survived')
-sns.barplot(data=passengers_df, x='Age_block', y='Survived', hue='Sex') #The Age flu the survival average
+
+if not BENCH:
+  #Draw correlation between classes Sex, Pclass, Age and class Survived
+  sns.barplot(data=passengers_df, x='Sex', y='Survived') #The female(1) have survival average more than male(0)
+  sns.barplot(data=passengers_df, x='Pclass', y='Survived') #The Pclass(3) flu the survival average 
+  sns.barplot(data=passengers_df, x='Age_block', y='Survived')
+  sns.barplot(data=passengers_df, x='Age_block', y='Survived', hue='Sex') #The Age flu the survival average
 
 '''
 I would try with Multi-layer perceptron classifier and the features Age, Pclass and Sex.
@@ -52,24 +58,25 @@ Y = passengers_df["Survived"].values
 
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=0)
 
-#Check if X needs to scaling
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Standardize features (preferred vs. MinMaxScaler, the features upper/lower boundaries aren't known)
 standard_scaler = StandardScaler()
-X_train = standard_scaler.fit_transform(X_train)
-X_test = standard_scaler.transform(X_test)
-
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+X_train, X_test, standard_scaler = fit_transform_cached(standard_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
+
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 mlp_classifier = MLPClassifier(
   hidden_layer_sizes=(200, 200, 200), #each tupla's element represents the numbers of neurons in its specific layer
@@ -1,34 +1,38 @@
-import pandas as pd
-import seaborn as sns
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.ensemble import EarlyStoppingForest
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
+from mlpy.datasets import load_titanic
+from mlpy.bench import BENCH, sns
 
 #Load data
-passengers_df = pd.read_csv("https://web.stanford.edu/class/archive/cs/cs109/cs109.1166/stuff/titanic.csv")
+passengers_df = load_titanic() #titanic.csv is downloaded once and cached by columns (see mlpy.datasets)
 
-#General info
-passengers_df.head()
-passengers_df.describe() 
-passengers_df.shape #8 columns, 887 rows
-passengers_df['Survived'].unique() #array([0, 1]) => binary classification (Not Survived, Survived)
-sns.countplot(data=passengers_df, x='Survived') #The 1 class are many more than 0 class
-passengers_df.isnull().sum() 
+if not BENCH:
+  #General info
+  passengers_df.head()
+  passengers_df.describe() 
+  passengers_df.shape #8 columns, 887 rows
+  passengers_df['Survived'].unique() #array([0, 1]) => binary classification (Not Survived, Survived)
+  sns.countplot(data=passengers_df, x='Survived') #The 1 class are many more than 0 class
+  passengers_df.isnull().sum() 
 
 #Correlation between features and class Survived (we assume moderate correlation from 0.5)
 passengers_df= passengers_df.drop("Name",axis=1) #Drop column Name that is clearly irrelevant
 mapping_sex = {'male': 0, 'female': 1}
 passengers_df['Sex'] = passengers_df['Sex'].map(mapping_sex)
-passengers_df.corr()['Survived'].sort_values() #There may be a correlation with Age, Pclass and Sex
+if not BENCH:
+  passengers_df.corr()['Survived'].sort_values() #There may be a correlation with Age, Pclass and Sex
 
-#Draw correlation between classes Sex, Pclass, Age and class Survived
-sns.barplot(data=passengers_df, x='Sex', y='Survived') #The female(1) have survival average more than male(0)
-sns.barplot(data=passengers_df, x='Pclass', y='Survived') #The Pclass(3) flu the survival average 
-def map_age(age): 
-  return round(age / 10)
-passengers_df['Age_block'] = passengers_df['Age'].apply(lambda age: map_age(age))
-sns.barplot(data=passengers_df, x='Age_block', y='Survived')
-sns.barplot(data=passengers_df, x='Age_block', y='Survived', hue='Sex') #The Age flu the survival average
+  #Draw correlation between classes Sex, Pclass, Age and class Survived
+  sns.barplot(data=passengers_df, x='Sex', y='Survived') #The female(1) have survival average more than male(0)
+  sns.barplot(data=passengers_df, x='Pclass', y='Survived') #The Pclass(3) flu the survival average 
+  def map_age(age): 
+    return round(age / 10)
+  passengers_df['Age_block'] = passengers_df['Age'].apply(lambda age: map_age(age))
+  sns.barplot(data=passengers_df, x='Age_block', y='Survived')
+  sns.barplot(data=passengers_df, x='Age_block', y='Survived', hue='Sex') #The Age flu the survival average
 
 '''
 I would try with Random Decision Forest and the features Age, Pclass and Sex.
@@ -71,3 +75,21 @@ print("ACCURACY SCORE: ", accuracy_score(Y_test, Y_test_predicted))
 '''
 The model would appear to be appropriate for this problem.
 '''
+
+'''
+Instead of choosing n_estimators up front, the forest can grow in batches of trees (trained in parallel processes)
+until the out-of-bag accuracy (every tree is tested on the samples not in its bootstrap sample) stops improving.
+'''
+
+early_stopping_forest = EarlyStoppingForest(
+  DecisionTreeClassifier(criterion="gini", max_depth=6, max_features="sqrt"), #the trees of RandomForestClassifier
+  batch_size=16, #trees added at every step
+  patience=3, #steps without improvement of the OOB accuracy before stopping
+  random_state=0
+)
+early_stopping_forest.fit(X_train, Y_train)
+
+print("\nEarly stopped forest: ", early_stopping_forest.n_estimators_, "trees")
+for point in early_stopping_forest.oob_curve_:
+  print("TREES: ", point["n_estimators"], "OOB ACCURACY: ", point["oob_accuracy"])
+print("ACCURACY SCORE: ", accuracy_score(Y_test, early_stopping_forest.predict(X_test)))
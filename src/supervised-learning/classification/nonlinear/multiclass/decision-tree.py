@@ -1,25 +1,26 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from sklearn.datasets import load_digits
+from mlpy.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 from sklearn.tree import DecisionTreeClassifier
+from mlpy.bench import BENCH, sns
 
 #Load data
 digits = load_digits()
 
-#General info
-print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
-digits_df = pd.DataFrame(digits.data)
-digits_df['target'] = digits.target
-digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
-digits_df.head()
-digits_df.describe() 
-digits_df.shape #65 columns, 1797 rows
-digits_df.isnull().sum() 
-sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
-np.isnan(digits_df).any() #Many algorithms do work only with numerical data
+if not BENCH:
+  #General info
+  print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
+  digits_df = pd.DataFrame(digits.data)
+  digits_df['target'] = digits.target
+  digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
+  digits_df.head()
+  digits_df.describe() 
+  digits_df.shape #65 columns, 1797 rows
+  digits_df.isnull().sum() 
+  sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
+  np.isnan(digits_df).any() #Many algorithms do work only with numerical data
 
 '''
 The data are points in an hyperspace H of 65 dimensions.
@@ -42,6 +43,10 @@ decision_tree_classifier = DecisionTreeClassifier(
   criterion="gini", #to measure the quality of a split
   max_depth=6 
 )
+#The same tree on the features binned once (uint8), with the splits found from histograms instead of sorting at every node
+#(see mlpy.tree, python -m mlpy.benchmarks.tree_split)
+#from mlpy.tree import HistogramTreeClassifier
+#decision_tree_classifier = HistogramTreeClassifier(criterion="gini", max_depth=6)
 decision_tree_classifier.fit(X_train, Y_train) 
 
 Y_train_predicted = decision_tree_classifier.predict(X_train) 
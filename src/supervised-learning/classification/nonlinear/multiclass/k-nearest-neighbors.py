@@ -1,26 +1,29 @@
+import os
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from sklearn.datasets import load_digits
+from mlpy.datasets import load_digits, get_data_home
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.bench import BENCH, sns
+from mlpy.neighbors import kneighbors_sweep, BlockedNearestNeighbors, save_knn, load_knn
 
 #Load data
 digits = load_digits()
 
-#General info
-print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
-digits_df = pd.DataFrame(digits.data)
-digits_df['target'] = digits.target
-digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
-digits_df.head()
-digits_df.describe() 
-digits_df.shape #65 columns, 1797 rows
-digits_df.isnull().sum() 
-sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
-np.isnan(digits_df).any() #Many algorithms do work only with numerical data
+if not BENCH:
+  #General info
+  print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
+  digits_df = pd.DataFrame(digits.data)
+  digits_df['target'] = digits.target
+  digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
+  digits_df.head()
+  digits_df.describe() 
+  digits_df.shape #65 columns, 1797 rows
+  digits_df.isnull().sum() 
+  sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
+  np.isnan(digits_df).any() #Many algorithms do work only with numerical data
 
 '''
 The data are points in an hyperspace H of 65 dimensions.
@@ -38,44 +41,61 @@ Y = digits.target
 #Separates data in rows train/test
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.1, random_state=0)
 
-#Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Normalize features (preferred vs. StandardScaler, the features upper/lower boundaries are known)
 min_max_scaler = MinMaxScaler()
-X_train = min_max_scaler.fit_transform(X_train)
-X_test = min_max_scaler.transform(X_test)
+X_train, X_test, min_max_scaler = fit_transform_cached(min_max_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
 
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 num_neighbors = [4,5,7,10,12,15,18,20,25] 
 
+'''
+Every K needs the same neighbors search, only the number of neighbors that vote changes.
+Then the neighbors are searched once with the max K (sorted by distance),
+and the prediction of every K is the majority vote of its first K neighbors (see mlpy.neighbors.sweep).
+The search is brute-force in blocks (euclidean distance, i.e. minkowski with p=2): the distances are computed
+for a tile of points at a time, so the memory is bounded by memory_budget also predicting the whole training set.
+'''
+nearest_neighbors = BlockedNearestNeighbors(
+  memory_budget=64 * 2**20 #bytes of distances computed at the same time
+)
+#Approximate search (inverted file, see mlpy.neighbors.ivf) for millions of points: n_probe trades recall for speed
+#from mlpy.neighbors import IVFNearestNeighbors
+#nearest_neighbors = IVFNearestNeighbors(n_lists=32, n_probe=4)
+#The pixels have only 17 values: the reference points can be stored in 1 byte per pixel instead of 8 (see mlpy.neighbors.quantized),
+#the distances are computed on the bytes (rerank=True re-ranks the best candidates with the exact distance, but it keeps also the exact points)
+#from mlpy.neighbors import QuantizedNearestNeighbors
+#nearest_neighbors = QuantizedNearestNeighbors(dtype="uint8")
+nearest_neighbors.fit(X_train)
+
+Y_train_predictions = kneighbors_sweep(X_train, Y_train, X_train, num_neighbors, neighbors=nearest_neighbors)
+Y_test_predictions = kneighbors_sweep(X_train, Y_train, X_test, num_neighbors, neighbors=nearest_neighbors)
+
 for K in num_neighbors:
 
   print("\nK=", str(K))
 
-  kn_classifier = KNeighborsClassifier(
-    n_neighbors=K, #num of neighbors to use
-    metric='minkowski' #to use for distance computation
-  ) 
-  kn_classifier.fit(X_train,Y_train)
-
-  Y_train_predicted = kn_classifier.predict(X_train)
+  Y_train_predicted = Y_train_predictions[K]
 
   #Model overfitting evaluation 
   print("\nModel overfitting evaluation")
   print("ACCURACY SCORE: ", accuracy_score(Y_train, Y_train_predicted)) 
   
-  Y_test_predicted = kn_classifier.predict(X_test)
+  Y_test_predicted = Y_test_predictions[K]
   
   #Model evaluation 
   print("\nModel evaluation")
@@ -85,3 +105,15 @@ for K in num_neighbors:
 The model would appear to be appropriate for this problem.
 '''
 
+'''
+The fitted model is only the reference points with their labels: it's saved in a flat binary file (see mlpy.neighbors.store),
+that a serving process loads by memory map without the data and without fitting again.
+'''
+model_path = os.path.join(get_data_home(), "k-nearest-neighbors-digits.knn")
+save_knn(model_path, nearest_neighbors, Y_train)
+loaded_neighbors, loaded_labels = load_knn(model_path)
+
+K = 5
+Y_test_predicted = kneighbors_sweep(None, loaded_labels, X_test, [K], neighbors=loaded_neighbors)[K]
+print("\nK=", str(K), "loaded from", model_path)
+print("ACCURACY SCORE: ", accuracy_score(Y_test, Y_test_predicted))
@@ -1,27 +1,29 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from sklearn.datasets import load_digits
+from mlpy.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, log_loss
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import MinMaxScaler
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.bench import BENCH, sns
 
 #Load data
 digits = load_digits()
 
-#General info
-print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
-digits_df = pd.DataFrame(digits.data)
-digits_df['target'] = digits.target
-digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
-digits_df.head()
-digits_df.describe() 
-digits_df.shape #65 columns, 1797 rows
-digits_df.isnull().sum() 
-sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
-np.isnan(digits_df).any() #Many algorithms do work only with numerical data
+if not BENCH:
+  #General info
+  print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
+  digits_df = pd.DataFrame(digits.data)
+  digits_df['target'] = digits.target
+  digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
+  digits_df.head()
+  digits_df.describe() 
+  digits_df.shape #65 columns, 1797 rows
+  digits_df.isnull().sum() 
+  sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
+  np.isnan(digits_df).any() #Many algorithms do work only with numerical data
 
 '''
 The data are points in an hyperspace H of 65 dimensions.
@@ -37,24 +39,25 @@ Y = digits.target
 #Separates data in rows train/test
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.1, random_state=0)
 
-#Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Normalize features (preferred vs. StandardScaler, the features upper/lower boundaries are known)
 min_max_scaler = MinMaxScaler()
-X_train = min_max_scaler.fit_transform(X_train)
-X_test = min_max_scaler.transform(X_test)
-
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+X_train, X_test, min_max_scaler = fit_transform_cached(min_max_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
+
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 mlp_classifier = MLPClassifier(
   hidden_layer_sizes=(10), #each tupla's element represents the numbers of neurons in its specific layer
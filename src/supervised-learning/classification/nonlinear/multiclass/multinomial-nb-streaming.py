@@ -0,0 +1,62 @@
+import numpy as np
+from sklearn.datasets import fetch_20newsgroups
+from sklearn.naive_bayes import MultinomialNB
+from mlpy.text import HashingTfidfVectorizer, iter_chunks, partial_fit_chunks, score_chunks
+from mlpy.instrument import stage
+
+'''
+Streaming version of multinomial-nb.py, for corpora of tens of millions of news.
+TfidfVectorizer.fit_transform keeps the whole vocabulary dict and the whole matrix in memory, here instead:
+- HashingTfidfVectorizer maps every word to one of n_features columns with a hash function (no vocabulary),
+  and its only state is the num of documents that contain every column
+- pass 1: the document frequencies are counted chunk by chunk (partial_fit of the vectorizer)
+- pass 2: every chunk is weighted by the idf and given to MultinomialNB.partial_fit
+The peak memory depends on chunksize, n_features and the num of classes, not on the number of news.
+Here the corpus of sklearn is already in memory and only split in chunks, with a larger corpus
+the chunks are read from the files (e.g. mlpy.text.iter_text_chunks for a CSV).
+'''
+
+chunksize = 2000 #num of news vectorized at the same time
+
+#Load data
+with stage("load", dataset="20newsgroups"):
+  news_train = fetch_20newsgroups(subset="train")
+  news_test = fetch_20newsgroups(subset="test")
+
+def news(subset):
+  dataset = news_train if subset == "train" else news_test
+  return iter_chunks(dataset.data, dataset.target, chunksize=chunksize)
+
+tfidf_vectorizer = HashingTfidfVectorizer(
+  n_features=2**18, #num of columns: MultinomialNB keeps 2 float arrays of num of classes x n_features
+  lowercase=True,
+  stop_words='english' #terms to be ignored
+)
+
+multinomial = MultinomialNB()
+
+#Pass 1: document frequencies
+with stage("vectorize", vectorizer="HashingTfidfVectorizer", subset="train"):
+  for texts, _ in news("train"):
+    tfidf_vectorizer.partial_fit(texts)
+
+#Pass 2: tf-idf of every chunk and counts of the model, all classes must be passed at first partial_fit
+with stage("fit", model="MultinomialNB"):
+  partial_fit_chunks(multinomial, tfidf_vectorizer, news("train"), classes=np.arange(len(news_train.target_names)))
+
+#Model overfitting evaluation
+accuracy, loss = score_chunks(multinomial, tfidf_vectorizer, news("train"))
+print("\nModel overfitting evaluation")
+print("ACCURACY: ", accuracy)
+print("LOG LOSS: ", loss)
+
+#Model evaluation
+accuracy, loss = score_chunks(multinomial, tfidf_vectorizer, news("test"))
+print("\nModel evaluation")
+print("ACCURACY: ", accuracy)
+print("LOG LOSS: ", loss)
+
+#Try to predict a new case
+x = ["The Italy will have to vote for the political elections"]
+y = multinomial.predict(tfidf_vectorizer.transform(x))
+print("\nCategory of doc: ", news_train.target_names[y[0]])
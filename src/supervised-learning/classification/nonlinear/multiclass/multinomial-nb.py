@@ -1,26 +1,28 @@
 import pandas as pd
-import seaborn as sns
 from sklearn.metrics import f1_score, log_loss
 from sklearn.datasets import fetch_20newsgroups
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
-
-#import nltk
-#import gensim
+from mlpy.bench import BENCH, sns
+from mlpy.instrument import stage
+from mlpy.serving import NaiveBayesScorer
+from mlpy.tokenizers import LemmaStemTokenizer, tokenize_documents, pretokenized
 
 #Load data
-news = fetch_20newsgroups(random_state=42)
-
-#General info
-print(news.DESCR) #News in 2 columns: 1 with text, and 1 with category
-news_df = pd.DataFrame(news.data)
-news_df['category'] = news.target
-news_df['category'].unique() #array([ 7,  4,  1, 14, 16, 13,  3,  2,  8, 19,  6,  0, 12,  5, 10,  9, 15, 17, 18, 11]) => multi-class classification
-news_df.head()
-news_df.describe() 
-news_df.shape #2 columns, 11314 rows
-sns.countplot(data=news_df, x='category') #Ok, the classes are quite distributed
-news_df.isnull().sum()
+with stage("load", dataset="20newsgroups"):
+  news = fetch_20newsgroups(random_state=42)
+
+if not BENCH:
+  #General info
+  print(news.DESCR) #News in 2 columns: 1 with text, and 1 with category
+  news_df = pd.DataFrame(news.data)
+  news_df['category'] = news.target
+  news_df['category'].unique() #array([ 7,  4,  1, 14, 16, 13,  3,  2,  8, 19,  6,  0, 12,  5, 10,  9, 15, 17, 18, 11]) => multi-class classification
+  news_df.head()
+  news_df.describe() 
+  news_df.shape #2 columns, 11314 rows
+  sns.countplot(data=news_df, x='category') #Ok, the classes are quite distributed
+  news_df.isnull().sum()
 
 '''
 The data are articles in natural language.
@@ -30,12 +32,13 @@ It makes a non-linear multi-class probabilistic classifier.
 '''
 
 #Separates data in rows train/test
-news_train = fetch_20newsgroups(subset="train")
-X_train = news_train.data 
-Y_train = news_train.target
-news_test = fetch_20newsgroups(subset="test")
-X_test = news_test.data 
-Y_test = news_test.target
+with stage("split"):
+  news_train = fetch_20newsgroups(subset="train")
+  X_train = news_train.data 
+  Y_train = news_train.target
+  news_test = fetch_20newsgroups(subset="test")
+  X_test = news_test.data 
+  Y_test = news_test.target
 
 multinomial = MultinomialNB()
 
@@ -48,48 +51,57 @@ multinomial = MultinomialNB()
 
 #I decide to use TfidfVectorizer = CountVectorizer + TfidfTransformer
 
-#I also decided to process and tokenized the news with Stemmer and Lemmatizer
-
-# nltk.download('wordnet') #Import dictionary
-# lemmatizer = nltk.stem.WordNetLemmatizer() #words in third person, verbs in past/future, ...
-# stemmer = nltk.stem.SnowballStemmer("english") #to  map different forms of the same word to a stem
-
-# def tokenizer(text):
-#   tokens = gensim.utils.simple_preprocess(text)
-#   tokens_processed = []
-#   for token in tokens :
-#     token_lemma = lemmatizer.lemmatize(token, pos='v')
-#     token_lemma_stemma = stemmer.stem(token_lemma)
-#     tokens.append(token_lemma_stemma)            
-#   return tokens_processed
-
-#tfidf_vectorizer = TfidfVectorizer(lowercase=True, tokenizer=tokenizer, stop_words='english')
-tfidf_vectorizer = TfidfVectorizer(
-  lowercase=True, 
-  stop_words='english' #terms to be ignored 
-)
-
-X_train_vector = tfidf_vectorizer.fit_transform(X_train) 
-
-multinomial.fit(X_train_vector, Y_train)
-
-Y_train_predicted = multinomial.predict(X_train_vector)
-Y_train_predicted_proba = multinomial.predict_proba(X_train_vector)
+#I also decided to process and tokenized the news with Stemmer and Lemmatizer (see mlpy.tokenizers, it needs nltk and gensim):
+#every news is split by gensim simple_preprocess, and every word is replaced by the stem of its lemma.
+#The news are tokenized once in a pool of processes, and the lemma/stem of every distinct word is memoized in a LRU.
+#It is the slow part of the script, then with MLPY_BENCH the news are vectorized by the words only
+LEMMA_STEM = not BENCH
+
+if LEMMA_STEM:
+  import nltk #optional dependency (with gensim), imported only when the news are tokenized
+  nltk.download('wordnet', quiet=True) #Import dictionary
+  tokenizer = LemmaStemTokenizer()
+  with stage("vectorize", step="tokenize", tokenizer="LemmaStemTokenizer", subset="train"):
+    X_train = tokenize_documents(X_train, tokenizer) #list of tokens of every news (without stop words)
+  with stage("vectorize", step="tokenize", tokenizer="LemmaStemTokenizer", subset="test"):
+    X_test = tokenize_documents(X_test, tokenizer)
+  tfidf_vectorizer = TfidfVectorizer(analyzer=pretokenized) #the news are already tokenized
+else:
+  tfidf_vectorizer = TfidfVectorizer(
+    lowercase=True, 
+    stop_words='english' #terms to be ignored 
+  )
+
+with stage("vectorize", vectorizer="TfidfVectorizer", subset="train"):
+  X_train_vector = tfidf_vectorizer.fit_transform(X_train) 
+
+with stage("fit", model="MultinomialNB"):
+  multinomial.fit(X_train_vector, Y_train)
+
+with stage("predict", subset="train"):
+  Y_train_predicted = multinomial.predict(X_train_vector)
+with stage("predict_proba", subset="train"):
+  Y_train_predicted_proba = multinomial.predict_proba(X_train_vector)
 
 #Model overfitting evaluation 
-print("\nModel overfitting evaluation")
-print("F1 SCORE: ", f1_score(Y_train, Y_train_predicted, average='macro')) 
-print("LOG LOSS: ", log_loss(Y_train, Y_train_predicted_proba)) 
+with stage("metric", subset="train"):
+  print("\nModel overfitting evaluation")
+  print("F1 SCORE: ", f1_score(Y_train, Y_train_predicted, average='macro')) 
+  print("LOG LOSS: ", log_loss(Y_train, Y_train_predicted_proba)) 
 
-X_test_vector = tfidf_vectorizer.transform(X_test)
+with stage("vectorize", vectorizer="TfidfVectorizer", subset="test"):
+  X_test_vector = tfidf_vectorizer.transform(X_test)
 
-Y_test_predicted = multinomial.predict(X_test_vector)
-Y_test_predicted_proba = multinomial.predict_proba(X_test_vector)
+with stage("predict", subset="test"):
+  Y_test_predicted = multinomial.predict(X_test_vector)
+with stage("predict_proba", subset="test"):
+  Y_test_predicted_proba = multinomial.predict_proba(X_test_vector)
 
 #Model evaluation 
-print("\nModel evaluation")
-print("F1 SCORE: ", f1_score(Y_test, Y_test_predicted, average='macro')) 
-print("LOG LOSS: ", log_loss(Y_test, Y_test_predicted_proba)) 
+with stage("metric", subset="test"):
+  print("\nModel evaluation")
+  print("F1 SCORE: ", f1_score(Y_test, Y_test_predicted, average='macro')) 
+  print("LOG LOSS: ", log_loss(Y_test, Y_test_predicted_proba)) 
 
 '''
 The model would appear moderately overfitted for this problem.
@@ -97,8 +109,16 @@ The model would appear moderately overfitted for this problem.
 
 #Try to predict a new case
 x = ["The Italy will have to vote for the political elections"]
+if LEMMA_STEM:
+  x = tokenize_documents(x, tokenizer)
 x_vector = tfidf_vectorizer.transform(x)
 y = multinomial.predict(x_vector)
 print("\nCategory of doc: ", news.target_names[y[0]])
-    
 
+'''
+A service with many concurrent requests gathers them in micro-batches (see mlpy.serving.MicroBatcher),
+and scores every batch with one sparse product of the tf-idf matrix and the log-probabilities of the words:
+'''
+scorer = NaiveBayesScorer(tfidf_vectorizer, multinomial)
+y = scorer.predict(x)
+print("Category of doc (scorer): ", news.target_names[y[0]])
@@ -1,25 +1,29 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from sklearn.datasets import load_digits
+from mlpy.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.ensemble import EarlyStoppingForest
+from mlpy.flatforest import flatten_forest
+from mlpy.bench import BENCH, sns
 
 #Load data
 digits = load_digits()
 
-#General info
-print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
-digits_df = pd.DataFrame(digits.data)
-digits_df['target'] = digits.target
-digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
-digits_df.head()
-digits_df.describe() 
-digits_df.shape #65 columns, 1797 rows
-digits_df.isnull().sum() 
-sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
-np.isnan(digits_df).any() #Many algorithms do work only with numerical data
+if not BENCH:
+  #General info
+  print(digits.DESCR) #Images 8x8 64 columns of pixels (every pixel has a value 0..16), and 1 column with the value integer rapresented
+  digits_df = pd.DataFrame(digits.data)
+  digits_df['target'] = digits.target
+  digits_df['target'].unique() #array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) => multi-class classification
+  digits_df.head()
+  digits_df.describe() 
+  digits_df.shape #65 columns, 1797 rows
+  digits_df.isnull().sum() 
+  sns.countplot(data=digits_df, x='target') #Ok, the classes are quite distributed
+  np.isnan(digits_df).any() #Many algorithms do work only with numerical data
 
 '''
 The data are points in an hyperspace H of 65 dimensions.
@@ -59,3 +63,33 @@ print("ACCURACY SCORE: ", accuracy_score(Y_test, Y_test_predicted))
 '''
 The model would appear to be appropriate for this problem.
 '''
+
+'''
+For the predictions the forest can be flattened in contiguous arrays (feature, threshold, children, leaf values of all the trees):
+all the trees go down one level at a time for a block of rows, instead of a call for every tree.
+It's faster only for single rows and small batches (see python -m mlpy.benchmarks.forest_inference): over 2048 rows
+it's slower than the forest, then the large batches are predicted by the forest (fallback_rows of flatten_forest).
+'''
+
+flat_forest = flatten_forest(random_forest_classifier)
+Y_test_predicted_flat = flat_forest.predict(X_test)
+print("\nFlat forest: ", flat_forest.nbytes, "bytes")
+print("SAME PREDICTIONS OF THE FOREST: ", (Y_test_predicted_flat == Y_test_predicted).mean())
+
+'''
+Instead of choosing n_estimators up front, the forest can grow in batches of trees (trained in parallel processes)
+until the out-of-bag accuracy (every tree is tested on the samples not in its bootstrap sample) stops improving.
+'''
+
+early_stopping_forest = EarlyStoppingForest(
+  DecisionTreeClassifier(criterion="gini", max_depth=10, max_features="sqrt"), #the trees of RandomForestClassifier
+  batch_size=16, #trees added at every step
+  patience=3, #steps without improvement of the OOB accuracy before stopping
+  random_state=0
+)
+early_stopping_forest.fit(X_train, Y_train)
+
+print("\nEarly stopped forest: ", early_stopping_forest.n_estimators_, "trees")
+for point in early_stopping_forest.oob_curve_:
+  print("TREES: ", point["n_estimators"], "OOB ACCURACY: ", point["oob_accuracy"])
+print("ACCURACY SCORE: ", accuracy_score(Y_test, early_stopping_forest.predict(X_test)))
@@ -1,12 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.model_selection import cross_val_score,KFold, train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.datasets import load_diabetes
+from mlpy.datasets import load_diabetes
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.model_selection import cross_validate_parallel, cross_validate_gram
+from mlpy.bench import BENCH, sns, plt
 
 '''
 K-fold Cross Validation splits training in k folders, and at every iteration (k iterations) it will use k-1 folders for training 
@@ -21,33 +22,34 @@ Try to use it with a model previously overfitted.
 #Load data
 diabetes = load_diabetes()
 
-#General info
-print(diabetes.DESCR) #Patients 10 columns of information and 1 column quantitative measure of disease progression one year after
-diabetes_df = pd.DataFrame(diabetes.data, columns=["age","sex","bmi","bp","tc","ldl","hdl","tch","ltg","glu"])
-diabetes_df['progression'] = diabetes.target
-diabetes_df['progression'].unique()
-diabetes_df.head()
-diabetes_df.describe() 
-diabetes_df.shape #11 columns, 442 rows
-diabetes_df.isnull().sum() 
-np.isnan(diabetes_df).any() #Many algorithms do work only with numerical data
-
-#Correlation between features and target (we assume moderate correlation from 0.5)
-diabetes_df.corr()['progression'].sort_values() #Moderate correlation with ltg and bmi 
-
-#Draw correlation and the linear regression model fit between numerical ltg and numerical progression 
-plt.figure(figsize=(6, 6))
-sns.regplot(data=diabetes_df, x='ltg', y='progression', color='yellow', line_kws={"color": "red"})
-plt.title('Correlation and Linear Regression between ltg and progression')
-plt.xlabel('Ltg')
-plt.ylabel('Progression')
-
-#Draw correlation and the linear regression model fit between numerical bmi and numerical progression 
-plt.figure(figsize=(6, 6))
-sns.regplot(data=diabetes_df, x='bmi', y='progression', color='yellow', line_kws={"color": "red"})
-plt.title('Correlation and Linear Regression between bmi and progression')
-plt.xlabel('Bmi')
-plt.ylabel('Progression')
+if not BENCH:
+  #General info
+  print(diabetes.DESCR) #Patients 10 columns of information and 1 column quantitative measure of disease progression one year after
+  diabetes_df = pd.DataFrame(diabetes.data, columns=["age","sex","bmi","bp","tc","ldl","hdl","tch","ltg","glu"])
+  diabetes_df['progression'] = diabetes.target
+  diabetes_df['progression'].unique()
+  diabetes_df.head()
+  diabetes_df.describe() 
+  diabetes_df.shape #11 columns, 442 rows
+  diabetes_df.isnull().sum() 
+  np.isnan(diabetes_df).any() #Many algorithms do work only with numerical data
+
+  #Correlation between features and target (we assume moderate correlation from 0.5)
+  diabetes_df.corr()['progression'].sort_values() #Moderate correlation with ltg and bmi 
+
+  #Draw correlation and the linear regression model fit between numerical ltg and numerical progression 
+  plt.figure(figsize=(6, 6))
+  sns.regplot(data=diabetes_df, x='ltg', y='progression', color='yellow', line_kws={"color": "red"})
+  plt.title('Correlation and Linear Regression between ltg and progression')
+  plt.xlabel('Ltg')
+  plt.ylabel('Progression')
+
+  #Draw correlation and the linear regression model fit between numerical bmi and numerical progression 
+  plt.figure(figsize=(6, 6))
+  sns.regplot(data=diabetes_df, x='bmi', y='progression', color='yellow', line_kws={"color": "red"})
+  plt.title('Correlation and Linear Regression between bmi and progression')
+  plt.xlabel('Bmi')
+  plt.ylabel('Progression')
 
 '''
 The data points are too far from regression lines. 
@@ -67,24 +69,25 @@ Y = diabetes.target
 #Separates data in rows train/test
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=0)
 
-#Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Standardize features (preferred vs. MinMaxScaler, the features upper/lower boundaries aren't known)
 standard_scaler = StandardScaler()
-X_train = standard_scaler.fit_transform(X_train)
-X_test = standard_scaler.transform(X_test)
+X_train, X_test, standard_scaler = fit_transform_cached(standard_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
 
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 print("\nK-fold cross validation..")
 
@@ -126,6 +129,26 @@ for (train_indexes, validation_indexes) in kfold.split(X_train):
 r2score_mean = np.array(r2scores_kfold).mean()
 print("\nR2 SCORE MEAN with 'kfold.split': ", r2score_mean)
 
+'''
+The folds are independent, then they can be executed in parallel by a pool of processes.
+cross_validate_parallel puts X_train and Y_train in shared memory once (they are not sent to every process),
+every process takes the rows of its fold from the indexes and sends back only the score and the model.
+The train rows of a fold are not contiguous, then every process copies them (90% of X_train with 10 folds)
+in a buffer that it reuses for all its folds, and the processes are limited by memory_budget (1 GB).
+'''
+
+r2scores_parallel, linear_regressions = cross_validate_parallel(linear_regression, X_train, Y_train, kfold, scoring=r2_score)
+print("\nR2 SCORE MEAN with 'cross_validate_parallel': ", r2scores_parallel.mean())
+
+'''
+LinearRegression has a Closed-Form solution that depends only on XᵀX and Xᵀy.
+cross_validate_gram computes them once on all rows, and for every fold it subtracts the rows of the validation folder:
+every fold costs a small p×p solve (p = num of features) instead of a new fit on the 90% of the rows.
+'''
+
+r2scores_gram, linear_regressions = cross_validate_gram(linear_regression, X_train, Y_train, kfold, scoring=r2_score)
+print("\nR2 SCORE MEAN with 'cross_validate_gram': ", r2scores_gram.mean())
+
 #Then we can calculate the model scores in the usual way including also Y_test 
 
 Y_train_predicted = linear_regression.predict(X_train)
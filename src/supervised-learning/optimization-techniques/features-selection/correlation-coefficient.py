@@ -1,7 +1,6 @@
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
+from mlpy.bench import sns, plt
 
 '''
 It misures the linear relationship between the features.
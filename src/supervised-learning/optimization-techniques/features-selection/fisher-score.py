@@ -1,8 +1,7 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
 from skfeature.function.similarity_based import fisher_score
+from mlpy.bench import sns, plt
 
 '''
 It is commonly used to select the variable that minimizes the Fisher's score.
@@ -1,8 +1,7 @@
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
 from sklearn.feature_selection import mutual_info_classif
+from mlpy.bench import sns, plt
 
 '''
 It is commonly used to select the variable that maximizes the information gain, 
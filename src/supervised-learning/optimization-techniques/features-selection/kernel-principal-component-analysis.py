@@ -1,11 +1,11 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
 from sklearn.metrics import accuracy_score, log_loss
 from sklearn.datasets import make_circles
 from sklearn.decomposition import KernelPCA
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
+from mlpy.bench import BENCH, sns
 
 '''
 Kernel PCA is an extension of PCA used for nonlinear dimensionality reduction.
@@ -14,15 +14,16 @@ Kernel PCA is an extension of PCA used for nonlinear dimensionality reduction.
 #Creating data: a large circle containing a smaller circle with 1000 points
 X, Y = make_circles(n_samples=1000, noise=0.1, factor=0.2)
 
-#General info
-print("Classes in Y:", np.unique(Y, return_counts=True)) #500 classes => multi-class classification
+if not BENCH:
+  #General info
+  print("Classes in Y:", np.unique(Y, return_counts=True)) #500 classes => multi-class classification
 
-#Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
-print("\nBEFORE scaling")
-print("X min", np.amin(X))
-print("X max", np.amax(X))
+  #Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
+  print("\nBEFORE scaling")
+  print("X min", np.amin(X))
+  print("X max", np.amax(X))
 
-#No scaling is needs
+  #No scaling is needs
 
 kernel_pca = KernelPCA(kernel="rbf", gamma=5) #We use "rbf" when the dataset has a circular shape (non-linear)
 X_kpca = kernel_pca.fit_transform(X)
@@ -1,5 +1,5 @@
 import pandas as pd
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
 from sklearn.feature_selection import SelectFromModel
 from sklearn.linear_model import LogisticRegression
 
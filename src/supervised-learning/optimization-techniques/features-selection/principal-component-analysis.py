@@ -1,12 +1,12 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
 from sklearn.metrics import accuracy_score, log_loss
-from sklearn.datasets import load_wine
+from mlpy.datasets import load_wine
 from sklearn.decomposition import PCA
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
+from mlpy.bench import BENCH, sns
 
 '''
 PCA is unsupervised learning technique to use when your data has linear relationships between features.
@@ -20,34 +20,37 @@ Than it may become more difficult to understand what they are the most significa
 #Load data
 wines = load_wine()
 
-#General info
-print(wines.DESCR) #Wines 13 columns of informations, and 1 value that rapresent a class 
-wines_df = pd.DataFrame(wines.data, columns=wines.feature_names)
-wines_df['target'] = wines.target
-wines_df['target'].unique() #array([0, 1, 2]) => multi-class classification
-wines_df.head()
-wines_df.describe() 
-wines_df.shape #14 columns, 178 rows
-wines_df.isnull().sum() 
-sns.countplot(data=wines_df, x='target') #Ok, the classes are quite distributed
-np.isnan(wines_df).any() #Many algorithms do work only with numerical data
+if not BENCH:
+  #General info
+  print(wines.DESCR) #Wines 13 columns of informations, and 1 value that rapresent a class 
+  wines_df = pd.DataFrame(wines.data, columns=wines.feature_names)
+  wines_df['target'] = wines.target
+  wines_df['target'].unique() #array([0, 1, 2]) => multi-class classification
+  wines_df.head()
+  wines_df.describe() 
+  wines_df.shape #14 columns, 178 rows
+  wines_df.isnull().sum() 
+  sns.countplot(data=wines_df, x='target') #Ok, the classes are quite distributed
+  np.isnan(wines_df).any() #Many algorithms do work only with numerical data
 
 #Separates data in numpy.ndarray columns data/target 
 X = wines.data
 Y = wines.target
 
-#Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
-print("\nBEFORE scaling")
-print("X min", np.amin(X))
-print("X max", np.amax(X))
+if not BENCH:
+  #Check if X needs to scaling (makes it easy for a model to learn and understand the problem)
+  print("\nBEFORE scaling")
+  print("X min", np.amin(X))
+  print("X max", np.amax(X))
 
 #Standardize features (preferred vs. MinMaxScaler, the features upper/lower boundaries aren't known)
 standard_scaler = StandardScaler()
 X = standard_scaler.fit_transform(X)
 
-print("\nAFTER scaling")
-print("X min", np.amin(X))
-print("X max", np.amax(X))
+if not BENCH:
+  print("\nAFTER scaling")
+  print("X min", np.amin(X))
+  print("X max", np.amax(X))
 
 pca = PCA(n_components=2) #Fixed numbers of principal components
 X_pca = pca.fit_transform(X) 
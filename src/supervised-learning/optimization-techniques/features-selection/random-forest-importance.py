@@ -1,11 +1,12 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.datasets import load_digits
+from mlpy.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.inspection import permutation_importance
+from mlpy.bench import sns, plt
 
 '''
 This approach is based on decision trees which causes that the nodes with higher "impurity-decrese"
@@ -25,8 +26,26 @@ random_forest_classifier = RandomForestClassifier(
   criterion="gini", #to measure the quality of a split
   max_depth=10
 )
+#The trees added in batches until the out-of-bag accuracy stops improving, instead of a fixed n_estimators (see mlpy.ensemble)
+#from mlpy.ensemble import EarlyStoppingForest
+#random_forest_classifier = EarlyStoppingForest(DecisionTreeClassifier(criterion="gini", max_depth=10, max_features="sqrt"))
 random_forest_classifier.fit(X, Y)
 
 #Draw the importances of all features
 sns.barplot(x=digits.feature_names, y=random_forest_classifier.feature_importances_, color='#BB0000')
 plt.show()
+
+'''
+The impurity importances are computed on the training data and they are biased toward the features with many distinct values
+(more thresholds to split on). The permutation importance is the drop of the accuracy on data not used for the training
+when the values of a feature are shuffled: the baseline accuracy is computed once, then the features are permuted
+in parallel by a pool of processes, n_repeats times with independent seeds (see mlpy.inspection).
+'''
+X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=0)
+random_forest_classifier.fit(X_train, Y_train)
+permutation_importances = permutation_importance(random_forest_classifier, X_test, Y_test, scoring=accuracy_score, n_repeats=5, random_state=0)
+print("Baseline accuracy: ", permutation_importances.baseline_score)
+
+#Draw the permutation importances of all features
+sns.barplot(x=digits.feature_names, y=permutation_importances.importances_mean, color='#BB0000')
+plt.show()
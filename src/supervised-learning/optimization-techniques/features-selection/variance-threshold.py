@@ -1,8 +1,7 @@
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.datasets import load_breast_cancer
+from mlpy.datasets import load_breast_cancer
 from sklearn.feature_selection import VarianceThreshold
+from mlpy.bench import sns, plt
 
 '''
 It returns the features whose variance does not exceed a certain threshold (default threshold=0). 
@@ -1,43 +1,44 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, PolynomialFeatures
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
-from sklearn.datasets import load_diabetes
+from mlpy.datasets import load_diabetes
+from mlpy.preprocessing import fit_transform_cached
+from mlpy.bench import BENCH, sns, plt
 
 #Load data
 diabetes = load_diabetes() 
 
-#General info
-print(diabetes.DESCR) #Patients 10 columns of information and 1 column quantitative measure of disease progression one year after
-diabetes_df = pd.DataFrame(diabetes.data, columns=["age","sex","bmi","bp","tc","ldl","hdl","tch","ltg","glu"])
-diabetes_df['progression'] = diabetes.target
-diabetes_df.head()
-diabetes_df.describe() 
-diabetes_df.shape #11 columns, 442 rows
-diabetes_df.isnull().sum() 
-np.isnan(diabetes_df).any() #Many algorithms do work only with numerical data
-
-#Correlation between features and target (we assume moderate correlation from 0.5)
-diabetes_df.corr()['progression'].sort_values() #Moderate correlation with ltg and bmi 
-
-#Try to draw the correlation and the linear regression model fit
-plt.figure(figsize=(6, 6))
-sns.regplot(data=diabetes_df, x='ltg', y='progression', color='yellow', line_kws={"color": "red"})
-plt.title('Correlation and Linear Regression between ltg and progression')
-plt.xlabel('Ltg')
-plt.ylabel('Progression')
-
-plt.figure(figsize=(6, 6))
-sns.regplot(data=diabetes_df, x='bmi', y='progression', color='yellow', line_kws={"color": "red"})
-plt.title('Correlation and Linear Regression between bmi and progression')
-plt.xlabel('Bmi')
-plt.ylabel('Progression')
+if not BENCH:
+  #General info
+  print(diabetes.DESCR) #Patients 10 columns of information and 1 column quantitative measure of disease progression one year after
+  diabetes_df = pd.DataFrame(diabetes.data, columns=["age","sex","bmi","bp","tc","ldl","hdl","tch","ltg","glu"])
+  diabetes_df['progression'] = diabetes.target
+  diabetes_df.head()
+  diabetes_df.describe() 
+  diabetes_df.shape #11 columns, 442 rows
+  diabetes_df.isnull().sum() 
+  np.isnan(diabetes_df).any() #Many algorithms do work only with numerical data
+
+  #Correlation between features and target (we assume moderate correlation from 0.5)
+  diabetes_df.corr()['progression'].sort_values() #Moderate correlation with ltg and bmi 
+
+  #Try to draw the correlation and the linear regression model fit
+  plt.figure(figsize=(6, 6))
+  sns.regplot(data=diabetes_df, x='ltg', y='progression', color='yellow', line_kws={"color": "red"})
+  plt.title('Correlation and Linear Regression between ltg and progression')
+  plt.xlabel('Ltg')
+  plt.ylabel('Progression')
+
+  plt.figure(figsize=(6, 6))
+  sns.regplot(data=diabetes_df, x='bmi', y='progression', color='yellow', line_kws={"color": "red"})
+  plt.title('Correlation and Linear Regression between bmi and progression')
+  plt.xlabel('Bmi')
+  plt.ylabel('Progression')
 
 '''
 The data points are too far from regression lines. 
@@ -58,24 +59,25 @@ Y = diabetes.target
 #Separates data in rows train/test
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=0)
 
-#Check if X needs to scaling
-print("\nBEFORE scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+if not BENCH:
+  #Check if X needs to scaling
+  print("\nBEFORE scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 #Standardize features (preferred vs. MinMaxScaler, the features upper/lower boundaries aren't known)
 standard_scaler = StandardScaler()
-X_train = standard_scaler.fit_transform(X_train)
-X_test = standard_scaler.transform(X_test)
-
-#X after scaling
-print("\nAFTER scaling")
-print("X train min", np.amin(X_train))
-print("X test min", np.amin(X_test))
-print("X train max", np.amax(X_train))
-print("X test max", np.amax(X_test))
+X_train, X_test, standard_scaler = fit_transform_cached(standard_scaler, X_train, X_test) #cached by content of X_train/X_test (see mlpy.preprocessing)
+
+if not BENCH:
+  #X after scaling
+  print("\nAFTER scaling")
+  print("X train min", np.amin(X_train))
+  print("X test min", np.amin(X_test))
+  print("X train max", np.amax(X_train))
+  print("X test max", np.amax(X_test))
 
 for degree_current in range (2, 6): #Starts from 2, since 1 is Linear Regression
   
@@ -2,16 +2,16 @@ import numpy as np
 from sklearn.datasets._samples_generator import make_moons
 from sklearn.cluster import DBSCAN
 from sklearn.metrics import calinski_harabasz_score,davies_bouldin_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+from mlpy.bench import BENCH, sns, plt
 
 #It creates 200 points to distribute and nois 0.05 (two interleaving half circles)
 X, Y = make_moons(n_samples=200, noise=0.1) 
 
-#General info
-np.unique(np.array(Y.tolist())) #array([0, 1]) => binary classification
-X.shape #200 rows, 2 columns
-Y.shape #200 row, 1 column
+if not BENCH:
+  #General info
+  np.unique(np.array(Y.tolist())) #array([0, 1]) => binary classification
+  X.shape #200 rows, 2 columns
+  Y.shape #200 row, 1 column
 
 '''
 The data are points in an hyperspace H of 3 dimensions.
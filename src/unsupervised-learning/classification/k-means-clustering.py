@@ -2,16 +2,16 @@ import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.datasets import make_blobs
 from sklearn.metrics import calinski_harabasz_score,davies_bouldin_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+from mlpy.bench import BENCH, sns, plt
 
 #It creates 250 points to distribute in clusters, with 3 features, 5 centroids and 0.8 cluster std deviation
 X, Y = make_blobs(n_samples=250, n_features=3, centers=5, cluster_std=0.8)
 
-#General info
-np.unique(np.array(Y.tolist())) #array([0, 1, 2, 3, 4]) => multi-class classification
-X.shape #250 rows, 3 columns
-Y.shape #250 row, 1 column
+if not BENCH:
+  #General info
+  np.unique(np.array(Y.tolist())) #array([0, 1, 2, 3, 4]) => multi-class classification
+  X.shape #250 rows, 3 columns
+  Y.shape #250 row, 1 column
 
 '''
 The data are points in an hyperspace H of 4 dimensions.
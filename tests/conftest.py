@@ -0,0 +1,5 @@
+import os
+import sys
+
+#The shared helpers are imported from the "src" folder, like the scripts with PYTHONPATH=src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,35 @@
+import numpy as np
+import scipy.sparse as sp
+import pytest
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.bitpacked import pack_bits, BitPackedBernoulliNB
+
+def make_binary_data(n_features, num_rows=600, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  X = (random_generator.random((num_rows, n_features)) < 0.15).astype(np.float64)
+  Y = np.array(["negative", "neutral", "positive"])[random_generator.integers(0, 3, num_rows)]
+  Y[X[:, 0] > 0] = "positive" #a feature correlated with a class
+  return X, Y
+
+@pytest.mark.parametrize("n_features", [1, 63, 64, 65, 300])
+def test_pack_sparse_same_of_dense(n_features):
+  X, _ = make_binary_data(n_features)
+  packed = pack_bits(X, block_rows=100)
+  assert packed.shape == X.shape
+  np.testing.assert_array_equal(packed.unpack(), X)
+  np.testing.assert_array_equal(pack_bits(sp.csr_matrix(X * 3), block_rows=100).words, packed.words)
+  np.testing.assert_array_equal(packed[10:20].unpack(), X[10:20])
+
+@pytest.mark.parametrize("parameters", [{}, {"alpha": 0.1}, {"fit_prior": False}, {"class_prior": [0.2, 0.3, 0.5]}])
+@pytest.mark.parametrize("n_features", [7, 64, 300])
+def test_same_predictions_of_bernoulli_nb(n_features, parameters):
+  X, Y = make_binary_data(n_features)
+  X_test, _ = make_binary_data(n_features, random_state=1)
+  expected = BernoulliNB(**parameters).fit(X, Y)
+  model = BitPackedBernoulliNB(**parameters).fit(pack_bits(sp.csr_matrix(X)), Y)
+  np.testing.assert_array_equal(model.classes_, expected.classes_)
+  np.testing.assert_array_equal(model.feature_count_, expected.feature_count_)
+  np.testing.assert_allclose(model.feature_log_prob_, expected.feature_log_prob_)
+  np.testing.assert_array_equal(model.predict(pack_bits(X_test)), expected.predict(X_test))
+  #the weights are quantized on 16 bits: the probabilities are the same up to the quantization error
+  np.testing.assert_allclose(model.predict_proba(pack_bits(X_test)), expected.predict_proba(X_test), atol=1e-3)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.ensemble import EarlyStoppingForest
+
+@pytest.fixture(scope="module")
+def iris():
+  return load_iris(return_X_y=True)
+
+def tree_arrays(tree):
+  return [tree.tree_.feature, tree.tree_.threshold, tree.tree_.children_left, tree.tree_.value]
+
+def fit_forest(X, Y, batch_size, n_jobs, **parameters):
+  #patience larger than the batches: all the max_estimators trees are grown
+  parameters = dict(dict(max_estimators=24, min_estimators=24, patience=100), **parameters)
+  return EarlyStoppingForest(DecisionTreeClassifier(max_depth=4, max_features="sqrt"), batch_size=batch_size,
+    n_jobs=n_jobs, random_state=0, **parameters).fit(X, Y)
+
+def test_same_trees_for_any_batch_size_and_n_jobs(iris):
+  X, Y = iris
+  expected = fit_forest(X, Y, batch_size=24, n_jobs=1)
+  for batch_size, n_jobs in [(4, 1), (8, 2), (5, 3)]:
+    forest = fit_forest(X, Y, batch_size, n_jobs)
+    assert forest.n_estimators_ == expected.n_estimators_ == 24
+    for tree, expected_tree in zip(forest.estimators_, expected.estimators_):
+      for array, expected_array in zip(tree_arrays(tree), tree_arrays(expected_tree)):
+        np.testing.assert_array_equal(array, expected_array)
+    assert forest.oob_score_ == expected.oob_score_
+    np.testing.assert_array_equal(forest.predict_proba(X), expected.predict_proba(X))
+
+def test_early_stopping(iris):
+  X, Y = iris
+  forest = fit_forest(X, Y, batch_size=4, n_jobs=1, max_estimators=400, min_estimators=8, patience=2, tol=0.01)
+  assert 8 <= forest.n_estimators_ < 400
+  assert [point["n_estimators"] for point in forest.oob_curve_] == list(range(4, forest.n_estimators_ + 1, 4))
+  assert forest.oob_score_ == forest.oob_curve_[-1]["oob_accuracy"]
+  assert np.mean(forest.predict(X) == Y) > 0.9
+  np.testing.assert_allclose(forest.predict_proba(X).sum(axis=1), 1.0)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.ensemble import EarlyStoppingForest
+from mlpy.flatforest import flatten_forest, save_forest, load_forest
+
+LABELS = {
+  "encoded": lambda Y: Y,
+  "shifted": lambda Y: Y + 1,
+  "strings": lambda Y: np.array(["setosa", "versicolor", "virginica"])[Y],
+  "unsorted_strings": lambda Y: np.array(["z", "a", "m"])[Y]
+}
+
+FORESTS = {
+  "random_forest": lambda: RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0),
+  "extra_trees": lambda: ExtraTreesClassifier(n_estimators=20, max_depth=6, random_state=0),
+  #few rows per tree: some bootstrap samples miss a class
+  "early_stopping": lambda: EarlyStoppingForest(DecisionTreeClassifier(max_depth=6), batch_size=8, max_estimators=24,
+    min_estimators=24, n_jobs=1, random_state=0)
+}
+
+@pytest.fixture(scope="module")
+def iris():
+  return load_iris(return_X_y=True)
+
+@pytest.mark.parametrize("labels", LABELS)
+@pytest.mark.parametrize("forest", FORESTS)
+def test_same_predictions_of_the_forest(iris, labels, forest):
+  X, Y = iris
+  Y = LABELS[labels](Y)
+  rows = np.r_[0:2, 50:52, 100:102] if forest == "early_stopping" else slice(None)
+  model = FORESTS[forest]().fit(X[rows], Y[rows])
+  flat_forest = flatten_forest(model)
+  np.testing.assert_array_equal(flat_forest.classes_, model.classes_)
+  np.testing.assert_allclose(flat_forest.predict_proba(X), model.predict_proba(X), atol=1e-6)
+  np.testing.assert_array_equal(flat_forest.predict(X), model.predict(X))
+
+def test_saved_forest(iris, tmp_path):
+  X, Y = iris
+  Y = LABELS["strings"](Y)
+  model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0).fit(X, Y)
+  save_forest(tmp_path / "forest.rff", flatten_forest(model))
+  loaded = load_forest(tmp_path / "forest.rff")
+  np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+def test_large_batches_predicted_by_the_forest(iris, monkeypatch):
+  X, Y = iris
+  model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0).fit(X, Y)
+  flat_forest = flatten_forest(model, fallback_rows=100)
+  monkeypatch.setattr(flat_forest, "apply", lambda X: pytest.fail("large batch traversed by the flat arrays"))
+  np.testing.assert_array_equal(flat_forest.predict_proba(X), model.predict_proba(X))
+  monkeypatch.undo()
+  np.testing.assert_allclose(flat_forest.predict_proba(X[:100]), model.predict_proba(X[:100]), atol=1e-6)
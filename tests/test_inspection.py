@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.inspection import permutation_importance
+from mlpy.pool import effective_n_jobs
+
+@pytest.fixture(scope="module")
+def fitted():
+  X, Y = load_iris(return_X_y=True)
+  return DecisionTreeClassifier(max_depth=3, random_state=0).fit(X, Y), X, Y
+
+def test_effective_n_jobs_like_joblib(monkeypatch):
+  monkeypatch.setattr("os.cpu_count", lambda: 8)
+  assert effective_n_jobs(None) == 8
+  assert effective_n_jobs(-1) == 8
+  assert effective_n_jobs(-2) == 7
+  assert effective_n_jobs(-100) == 1
+  assert effective_n_jobs(-1, num_tasks=3) == 3
+  with pytest.raises(ValueError):
+    effective_n_jobs(0)
+
+@pytest.mark.parametrize("n_jobs", [2, -1])
+def test_same_importances_for_any_n_jobs(fitted, n_jobs):
+  estimator, X, Y = fitted
+  expected = permutation_importance(estimator, X, Y, n_repeats=3, n_jobs=1, random_state=0)
+  result = permutation_importance(estimator, X, Y, n_repeats=3, n_jobs=n_jobs, random_state=0)
+  assert result.importances.shape == (X.shape[1], 3)
+  np.testing.assert_array_equal(result.importances, expected.importances)
+  assert result.baseline_score == expected.baseline_score
+
+def test_input_not_modified(fitted):
+  estimator, X, Y = fitted
+  X_before = X.copy()
+  permutation_importance(estimator, X, Y, n_repeats=2, n_jobs=1, random_state=0)
+  np.testing.assert_array_equal(X, X_before)
@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+import os
+
+SCRIPT = """
+from sklearn.datasets import load_iris
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+X, Y = load_iris(return_X_y=True)
+X_train, X_test, Y_train, Y_test = train_test_split(X, Y, random_state=0)
+forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X_train, Y_train)
+print(accuracy_score(Y_test, forest.predict(X_test)))
+"""
+
+def test_trace_records_the_outermost_stages(tmp_path):
+  script = tmp_path / "script.py"
+  script.write_text(SCRIPT)
+  trace = tmp_path / "trace.jsonl"
+  src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+  env = dict(os.environ, MLPY_TRACE=str(trace), PYTHONPATH=src)
+  subprocess.run([sys.executable, "-m", "mlpy", "trace", str(script)], env=env, check=True, capture_output=True)
+  records = [json.loads(line) for line in trace.read_text().splitlines()]
+  assert [(record["stage"], record.get("model") or record.get("metric")) for record in records] == [
+    ("split", None), ("fit", "RandomForestClassifier"), ("predict", "RandomForestClassifier"), ("metric", "accuracy_score")
+  ]
+  assert records[0]["rows"] == 150 and records[1]["rows"] == 112
+  assert all(record["script"] == "script.py" for record in records)
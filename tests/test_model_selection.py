@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge, Lasso
+from sklearn.metrics import r2_score, make_scorer
+from sklearn.model_selection import KFold, ShuffleSplit, cross_validate
+from mlpy import model_selection
+from mlpy.model_selection import cross_validate_gram, cross_validate_parallel
+
+ESTIMATORS = {
+  "linear_regression": lambda: LinearRegression(),
+  "linear_regression_no_intercept": lambda: LinearRegression(fit_intercept=False),
+  "ridge": lambda: Ridge(alpha=10.0),
+  "ridge_no_intercept": lambda: Ridge(alpha=10.0, fit_intercept=False),
+  #not reproduced by the closed form: fitted on every fold
+  "positive": lambda: LinearRegression(positive=True),
+  "ridge_positive": lambda: Ridge(alpha=1.0, positive=True)
+}
+
+CVS = {
+  "kfold": lambda: KFold(n_splits=5),
+  "shuffled_kfold": lambda: KFold(n_splits=5, shuffle=True, random_state=0),
+  "shuffle_split": lambda: ShuffleSplit(n_splits=4, train_size=0.5, test_size=0.25, random_state=0)
+}
+
+def make_regression_data(collinear=False, num_targets=None, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  X = random_generator.standard_normal((200, 6)) * [1, 2, 3, 4, 5, 6] + 10
+  if collinear: #the last column is a combination of the others
+    X[:, -1] = X[:, 0] - 2 * X[:, 1]
+  weights = random_generator.standard_normal((6, num_targets) if num_targets else 6)
+  Y = X @ weights + 3 + random_generator.standard_normal((200, num_targets) if num_targets else 200)
+  return X, Y
+
+def assert_same_cross_validation(estimator, X, Y, cv):
+  scores, models = cross_validate_gram(estimator, X, Y, cv, scoring=r2_score)
+  expected = cross_validate(estimator, X, Y, cv=cv, scoring=make_scorer(r2_score), return_estimator=True)
+  np.testing.assert_allclose(scores, expected["test_score"], rtol=1e-7, atol=1e-9)
+  for model, expected_model in zip(models, expected["estimator"]):
+    np.testing.assert_allclose(model.coef_, expected_model.coef_, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(model.intercept_, expected_model.intercept_, rtol=1e-6, atol=1e-8)
+
+@pytest.mark.parametrize("cv", CVS)
+@pytest.mark.parametrize("estimator", ESTIMATORS)
+def test_same_folds_of_cross_validate(estimator, cv):
+  X, Y = make_regression_data()
+  assert_same_cross_validation(ESTIMATORS[estimator](), X, Y, CVS[cv]())
+
+@pytest.mark.parametrize("estimator", ["linear_regression", "ridge"])
+def test_collinear_features(estimator):
+  X, Y = make_regression_data(collinear=True)
+  assert_same_cross_validation(ESTIMATORS[estimator](), X, Y, KFold(n_splits=5))
+
+@pytest.mark.parametrize("estimator", ["linear_regression", "ridge"])
+def test_more_targets(estimator):
+  X, Y = make_regression_data(num_targets=3)
+  assert_same_cross_validation(ESTIMATORS[estimator](), X, Y, KFold(n_splits=5))
+
+def test_alpha_for_every_target():
+  X, Y = make_regression_data(num_targets=2)
+  assert_same_cross_validation(Ridge(alpha=np.array([1.0, 100.0])), X, Y, KFold(n_splits=5))
+
+def test_unsupported_estimator():
+  X, Y = make_regression_data()
+  with pytest.raises(TypeError):
+    cross_validate_gram(Lasso(), X, Y, KFold(n_splits=5), scoring=r2_score)
+
+def test_parallel_same_folds_of_cross_validate():
+  X, Y = make_regression_data()
+  cv = KFold(n_splits=4, shuffle=True, random_state=0)
+  scores, models = cross_validate_parallel(Ridge(alpha=10.0), X, Y, cv, scoring=r2_score, n_jobs=2)
+  expected = cross_validate(Ridge(alpha=10.0), X, Y, cv=cv, scoring=make_scorer(r2_score), return_estimator=True)
+  np.testing.assert_allclose(scores, expected["test_score"])
+  for model, expected_model in zip(models, expected["estimator"]):
+    np.testing.assert_allclose(model.coef_, expected_model.coef_)
+
+def test_parallel_within_memory_budget():
+  X, Y = make_regression_data()
+  cv = KFold(n_splits=5, shuffle=True, random_state=0)
+  #a budget smaller than one fold: one worker, its buffer reused by all the folds
+  scores, _ = cross_validate_parallel(LinearRegression(), X, Y, cv, scoring=r2_score, n_jobs=4, memory_budget=1)
+  expected = cross_validate(LinearRegression(), X, Y, cv=cv, scoring=make_scorer(r2_score))
+  np.testing.assert_allclose(scores, expected["test_score"])
+
+def test_train_rows_in_the_buffer_of_the_worker(monkeypatch):
+  monkeypatch.setattr(model_selection, "_buffers", {})
+  X, _ = make_regression_data()
+  (first, _), (second, _) = list(KFold(n_splits=5).split(X))[1:3] #the rows before and after the validation folder
+  rows = model_selection._train_rows("X", X, first)
+  np.testing.assert_array_equal(rows, X[first])
+  buffer = model_selection._buffers["X"]
+  rows = model_selection._train_rows("X", X, second)
+  np.testing.assert_array_equal(rows, X[second])
+  assert model_selection._buffers["X"] is buffer and np.shares_memory(rows, buffer)
+  assert np.shares_memory(model_selection._train_rows("X", X, np.arange(40, 200)), X) #a range is a view
@@ -0,0 +1,57 @@
+import os
+import numpy as np
+import pytest
+from sklearn.datasets import load_digits
+from sklearn.neighbors import NearestNeighbors
+from mlpy.neighbors import BlockedNearestNeighbors, IVFNearestNeighbors, QuantizedNearestNeighbors, save_knn, load_knn
+
+@pytest.fixture(scope="module")
+def digits():
+  X, _ = load_digits(return_X_y=True)
+  return X[:1200], X[1200:1400]
+
+def assert_same_neighbors(X_fit, X_query, distances, indexes, expected_distances):
+  #the digits have integer features, many distances are ties: the indexes are checked by their distances
+  np.testing.assert_allclose(distances, expected_distances, atol=1e-6)
+  np.testing.assert_allclose(np.linalg.norm(X_fit[indexes] - X_query[:, None, :], axis=2), distances, atol=1e-6)
+
+@pytest.mark.parametrize("memory_budget", [2**12, 2**20]) #many tiles, one tile
+def test_blocked_same_neighbors(digits, memory_budget):
+  X_fit, X_query = digits
+  blocked = BlockedNearestNeighbors(n_neighbors=5, memory_budget=memory_budget).fit(X_fit)
+  exact = NearestNeighbors(n_neighbors=5).fit(X_fit)
+  distances, indexes = blocked.kneighbors(X_query)
+  assert_same_neighbors(X_fit, X_query, distances, indexes, exact.kneighbors(X_query)[0])
+  assert blocked.kneighbors(X_query, 3, return_distance=False).shape == (len(X_query), 3)
+
+@pytest.mark.parametrize("neighbors", [
+  lambda: BlockedNearestNeighbors(n_neighbors=5, memory_budget=2**12),
+  lambda: QuantizedNearestNeighbors(n_neighbors=5, dtype="float16", rerank=True),
+  lambda: IVFNearestNeighbors(n_neighbors=5, n_lists=4, n_probe=4)
+])
+def test_reference_points_without_themselves(digits, neighbors):
+  X_fit, _ = digits
+  X_fit = np.vstack([X_fit, X_fit[:10]]) #duplicate points: their neighbor at distance 0 is the other copy
+  distances, indexes = neighbors().fit(X_fit).kneighbors()
+  expected_distances, _ = NearestNeighbors(n_neighbors=5).fit(X_fit).kneighbors()
+  assert not np.any(indexes == np.arange(len(X_fit))[:, None])
+  assert_same_neighbors(X_fit, X_fit, distances, indexes, expected_distances)
+
+def test_quantized_keeps_only_the_codes(digits, tmp_path):
+  X_fit, X_query = digits
+  quantized = QuantizedNearestNeighbors(dtype="uint8").fit(X_fit)
+  assert not hasattr(quantized, "X_fit_")
+  save_knn(tmp_path / "quantized.knn", quantized)
+  save_knn(tmp_path / "blocked.knn", BlockedNearestNeighbors().fit(X_fit))
+  assert os.path.getsize(tmp_path / "quantized.knn") * 4 < os.path.getsize(tmp_path / "blocked.knn")
+  loaded, _ = load_knn(tmp_path / "quantized.knn")
+  np.testing.assert_array_equal(loaded.kneighbors(X_query, 5)[1], quantized.kneighbors(X_query, 5)[1])
+
+def test_quantized_rerank(digits):
+  X_fit, X_query = digits
+  quantized = QuantizedNearestNeighbors(dtype="uint8", rerank=True).fit(X_fit)
+  distances, _ = quantized.kneighbors(X_query, 5)
+  expected, _ = NearestNeighbors(n_neighbors=5).fit(X_fit).kneighbors(X_query)
+  np.testing.assert_allclose(distances, expected)
+  quantized.rerank = False
+  assert not hasattr(quantized.fit(X_fit), "X_fit_")
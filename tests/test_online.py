@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import BernoulliNB
+from mlpy.online import OnlineBernoulliNB, save_online, load_online
+
+def make_reviews(num_reviews, num_words=200, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  words = np.array(["word%d" % index for index in range(num_words + num_reviews // 2)])
+  targets = np.where(random_generator.integers(0, 2, num_reviews) == 1, "positive", "negative")
+  #the positive reviews use more the first words, the words after num_words appear only in the later batches
+  texts = [" ".join(words[(random_generator.zipf(1.3, 20) + (0 if target == "positive" else 7)) % (num_words + index // 2)])
+    for index, target in enumerate(targets)]
+  return texts, targets
+
+def full_refit(texts, targets):
+  vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True)
+  return vectorizer, BernoulliNB().fit(vectorizer.fit_transform(texts), targets)
+
+def by_term(counts, terms):
+  return {term: counts[:, column].tolist() for column, term in enumerate(terms)}
+
+@pytest.mark.parametrize("batch_size", [1, 50, 300])
+def test_grow_same_of_full_refit(batch_size):
+  texts, targets = make_reviews(600)
+  texts_test, _ = make_reviews(200, random_state=1)
+  online = OnlineBernoulliNB()
+  for start in range(0, len(texts), batch_size):
+    online.partial_fit(texts[start:start + batch_size], targets[start:start + batch_size])
+  vectorizer, model = full_refit(texts, targets)
+  np.testing.assert_array_equal(online.classes_, model.classes_)
+  np.testing.assert_array_equal(online.class_count_, model.class_count_)
+  #the columns have another order: the counts are compared by term
+  assert by_term(online.feature_count_, online.terms_) == by_term(model.feature_count_, vectorizer.get_feature_names_out())
+  np.testing.assert_array_equal(online.predict(texts_test), model.predict(vectorizer.transform(texts_test)))
+  np.testing.assert_allclose(online.predict_proba(texts_test), model.predict_proba(vectorizer.transform(texts_test)))
+
+def test_from_fitted_then_grow_same_of_full_refit(tmp_path):
+  texts, targets = make_reviews(600)
+  texts_test, _ = make_reviews(200, random_state=1)
+  vectorizer, model = full_refit(texts[:400], targets[:400])
+  save_online(tmp_path / "model.onb", OnlineBernoulliNB.from_fitted(vectorizer, model))
+  online = load_online(tmp_path / "model.onb").partial_fit(texts[400:], targets[400:])
+  vectorizer, model = full_refit(texts, targets)
+  np.testing.assert_array_equal(online.predict(texts_test), model.predict(vectorizer.transform(texts_test)))
+  vectorizer_online, model_online = online.to_sklearn()
+  np.testing.assert_allclose(model_online.predict_proba(vectorizer_online.transform(texts_test)),
+    model.predict_proba(vectorizer.transform(texts_test)))
+
+def test_ignore_keeps_the_first_vocabulary():
+  texts, targets = make_reviews(600)
+  online = OnlineBernoulliNB(unseen="ignore").partial_fit(texts[:100], targets[:100])
+  terms = list(online.terms_)
+  online.partial_fit(texts[100:], targets[100:])
+  assert online.terms_ == terms
+  vectorizer = CountVectorizer(lowercase=True, stop_words='english', binary=True, vocabulary=terms)
+  model = BernoulliNB().fit(vectorizer.transform(texts), targets)
+  np.testing.assert_array_equal(online.feature_count_, model.feature_count_)
+
+def test_grow_with_limited_vocabulary():
+  with pytest.raises(ValueError):
+    OnlineBernoulliNB(CountVectorizer(binary=True, min_df=2))
@@ -0,0 +1,29 @@
+import time
+from mlpy import runner
+
+def write_script(folder, name, code):
+  (folder / name).write_text(code)
+  return name
+
+def test_timeout_kills_the_script(tmp_path):
+  script = write_script(tmp_path, "slow.py", "import time\ntime.sleep(30)\n")
+  start = time.perf_counter()
+  record = runner.run_script(script, timeout=1, src_home=str(tmp_path))
+  assert time.perf_counter() - start < 10
+  assert record["timed_out"] is True
+  assert record["returncode"] == -9
+
+def test_fast_script_not_timed_out(tmp_path):
+  script = write_script(tmp_path, "fast.py", "print('ACCURACY SCORE:  0.5')\n")
+  record = runner.run_script(script, timeout=0.5, src_home=str(tmp_path))
+  time.sleep(1) #the timer must not fire after the exit
+  assert record["timed_out"] is False
+  assert record["returncode"] == 0
+  assert record["metrics"] == [[None, "ACCURACY SCORE", 0.5]]
+
+def test_slow_script_that_exits_by_itself(tmp_path):
+  #wall_time >= timeout is not a timeout when the script exited before the kill
+  script = write_script(tmp_path, "exits.py", "import time\ntime.sleep(0.3)\nraise SystemExit(3)\n")
+  record = runner.run_script(script, timeout=5, src_home=str(tmp_path))
+  assert record["timed_out"] is False
+  assert record["returncode"] == 3
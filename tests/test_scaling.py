@@ -0,0 +1,28 @@
+import io
+import json
+from mlpy.benchmarks import scaling
+
+def records(output):
+  return [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_quadratic_memory_skipped():
+  assert scaling.estimated_bytes("AgglomerativeClustering", 10**5, 10) > 4e10
+  assert scaling.estimated_bytes("Ridge", 10**5, 10) == 2 * 8 * 10**6
+  output = io.StringIO()
+  scaling.run(["AgglomerativeClustering"], [10**5, 10**6], [10], output, max_bytes=4e9)
+  assert [record["status"] for record in records(output)] == ["skipped: max_bytes"] * 2
+
+def test_sweep_stops_after_memory_error(monkeypatch):
+  calls = []
+  def measure(name, n_rows, n_features, predict_rows):
+    calls.append((n_rows, n_features))
+    if n_rows >= 100:
+      raise MemoryError
+    return {"estimator": name, "n_rows": n_rows, "n_features": n_features, "status": "ok", "fit_time": 0.0}
+  monkeypatch.setattr(scaling, "measure", measure)
+  output = io.StringIO()
+  scaling.run(["KMeans"], [10, 100, 1000], [2, 4], output)
+  assert calls == [(10, 2), (100, 2), (10, 4)]
+  assert [record["status"] for record in records(output)] == [
+    "ok", "failed: MemoryError", "skipped: MemoryError", "ok", "skipped: MemoryError", "skipped: MemoryError"
+  ]
@@ -0,0 +1,69 @@
+import asyncio
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import BernoulliNB, MultinomialNB
+from mlpy.serving import NaiveBayesScorer, MicroBatcher
+
+def make_reviews(num_reviews, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  words = np.array(["good", "great", "bad", "awful", "film", "plot", "actors", "boring", "funny", "long", "music", "ok"])
+  targets = np.array(["negative", "neutral", "positive"])[random_generator.integers(0, 3, num_reviews)]
+  #the positive reviews use more the first words
+  texts = [" ".join(words[(random_generator.zipf(1.5, random_generator.integers(1, 15)) + {"positive": 0, "neutral": 4,
+    "negative": 2}[target]) % len(words)]) for target in targets]
+  return texts, targets
+
+MODELS = {
+  "multinomial": lambda: (TfidfVectorizer(), MultinomialNB()),
+  "bernoulli": lambda: (CountVectorizer(binary=True), BernoulliNB(alpha=0.5)),
+  "bernoulli_counts": lambda: (CountVectorizer(), BernoulliNB(binarize=1.0))
+}
+
+def fit_model(name):
+  texts, targets = make_reviews(500)
+  vectorizer, model = MODELS[name]()
+  model.fit(vectorizer.fit_transform(texts), targets)
+  return vectorizer, model
+
+@pytest.mark.parametrize("name", MODELS)
+def test_scorer_same_of_the_model(name):
+  vectorizer, model = fit_model(name)
+  texts, _ = make_reviews(200, random_state=1)
+  scorer = NaiveBayesScorer(vectorizer, model)
+  X = vectorizer.transform(texts)
+  np.testing.assert_allclose(scorer.joint_log_likelihood(texts), model.predict_joint_log_proba(X))
+  np.testing.assert_array_equal(scorer.predict(texts), model.predict(X))
+  np.testing.assert_allclose(scorer.predict_proba(texts), model.predict_proba(X))
+
+async def predict_concurrently(batcher, texts):
+  await batcher.start()
+  try:
+    return await asyncio.gather(*[batcher.predict(text) for text in texts])
+  finally:
+    await batcher.stop()
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("max_batch_size", [1, 16, 1000])
+def test_micro_batched_same_of_the_model(name, max_batch_size):
+  vectorizer, model = fit_model(name)
+  texts, _ = make_reviews(300, random_state=1)
+  batcher = MicroBatcher(NaiveBayesScorer(vectorizer, model), max_batch_size=max_batch_size, max_delay=0.001)
+  predictions = asyncio.run(predict_concurrently(batcher, texts))
+  #the answers are in the order of the requests, whatever batch they were scored in
+  np.testing.assert_array_equal(predictions, model.predict(vectorizer.transform(texts)))
+  assert sum(batcher.batch_sizes) == len(texts)
+  assert max(batcher.batch_sizes) <= max_batch_size
+  if max_batch_size > 1:
+    assert max(batcher.batch_sizes) > 1
+  assert len(batcher.latencies) == len(texts)
+  percentiles = batcher.latency_percentiles()
+  assert set(percentiles) == {"p50", "p99"}
+  assert 0 <= percentiles["p50"] <= percentiles["p99"]
+
+def test_other_models_not_supported():
+  texts, targets = make_reviews(100)
+  vectorizer = CountVectorizer()
+  with pytest.raises(TypeError):
+    NaiveBayesScorer(vectorizer, LogisticRegression().fit(vectorizer.fit_transform(texts), targets))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import log_loss
+from sklearn.naive_bayes import MultinomialNB
+from mlpy.text import HashingTfidfVectorizer, score_chunks
+
+TRAIN = ["apple banana", "banana cherry", "cherry cherry date", "apple date elderberry"]
+TEST = ["zebra apple", "banana banana fig", "grape", "date apple cherry zebra"]
+
+def dense_by_word(X, words_of_columns):
+  #{document: {word: weight}} of a matrix, to compare matrices with different columns
+  X = X.toarray()
+  return [{word: X[row, column] for word, column in words_of_columns.items() if X[row, column] != 0} for row in range(X.shape[0])]
+
+@pytest.mark.parametrize("smooth_idf", [True, False])
+@pytest.mark.parametrize("sublinear_tf", [False, True])
+def test_same_weights_of_tfidf_vectorizer_on_unseen_words(smooth_idf, sublinear_tf):
+  expected_vectorizer = TfidfVectorizer(smooth_idf=smooth_idf, sublinear_tf=sublinear_tf).fit(TRAIN)
+  vectorizer = HashingTfidfVectorizer(n_features=2**18, smooth_idf=smooth_idf, sublinear_tf=sublinear_tf)
+  vectorizer.partial_fit(TRAIN[:2]).partial_fit(TRAIN[2:])
+  words = set(expected_vectorizer.vocabulary_) | {"zebra", "fig", "grape"}
+  hash_columns = {word: vectorizer.hashing_vectorizer.transform([word]).indices[0] for word in words}
+  assert len(set(hash_columns.values())) == len(words) #no collisions
+  with np.errstate(all="raise"):
+    X = vectorizer.transform(TEST)
+  expected = dense_by_word(expected_vectorizer.transform(TEST), expected_vectorizer.vocabulary_)
+  result = dense_by_word(X, hash_columns)
+  for row, expected_row in zip(result, expected):
+    assert row.keys() == expected_row.keys()
+    np.testing.assert_allclose([row[word] for word in expected_row], list(expected_row.values()))
+  assert np.all(np.isfinite(vectorizer.idf_))
+
+def test_unseen_words_dropped():
+  vectorizer = HashingTfidfVectorizer(n_features=2**18).partial_fit(["apple banana", "banana cherry"])
+  X = vectorizer.transform(["zebra apple"])
+  np.testing.assert_allclose(X.data, [1.0])
+
+def test_score_chunks_same_of_all_rows():
+  vectorizer = HashingTfidfVectorizer(n_features=2**10).partial_fit(TRAIN)
+  Y_train = np.array([0, 1, 1, 0])
+  classifier = MultinomialNB().fit(vectorizer.transform(TRAIN), Y_train)
+  Y_test = np.array([0, 1, 1, 0])
+  chunks = [(TEST[:1], Y_test[:1]), ([], Y_test[:0]), (TEST[1:], Y_test[1:])]
+  accuracy, loss = score_chunks(classifier, vectorizer, chunks)
+  probabilities = classifier.predict_proba(vectorizer.transform(TEST))
+  assert accuracy == pytest.approx(np.mean(classifier.predict(vectorizer.transform(TEST)) == Y_test))
+  assert loss == pytest.approx(log_loss(Y_test, probabilities))
+
+def test_score_chunks_without_samples():
+  vectorizer = HashingTfidfVectorizer(n_features=2**10).partial_fit(TRAIN)
+  classifier = MultinomialNB().fit(vectorizer.transform(TRAIN), [0, 1, 1, 0])
+  with pytest.raises(ValueError, match="no samples"):
+    score_chunks(classifier, vectorizer, iter([]))
@@ -0,0 +1,53 @@
+import pickle
+import numpy as np
+import pytest
+
+pytest.importorskip("nltk")
+pytest.importorskip("gensim")
+
+from mlpy.tokenizers import LemmaStemTokenizer, tokenize_documents
+
+def wordnet_available():
+  import nltk
+  try:
+    nltk.corpus.wordnet.ensure_loaded()
+    return True
+  except LookupError:
+    return False
+
+#Stemming only without the WordNet corpus (it can't be downloaded everywhere)
+LEMMATIZE = [False] + ([True] if wordnet_available() else [])
+
+def make_texts(num_texts, random_state=0):
+  random_generator = np.random.default_rng(random_state)
+  words = np.array(["running", "runs", "ran", "voted", "voting", "elections", "political", "having", "others", "the",
+    "Italy", "studies", "studying", "cats", "was", "were", "computers", "computing", "graphics", "space"])
+  return [" ".join(random_generator.choice(words, random_generator.integers(0, 30))) for _ in range(num_texts)]
+
+@pytest.mark.parametrize("lemmatize", LEMMATIZE)
+def test_same_tokens_with_and_without_cache(lemmatize):
+  texts = make_texts(200)
+  cached = LemmaStemTokenizer(cache_size=8, lemmatize=lemmatize) #smaller than the distinct words: evictions
+  uncached = LemmaStemTokenizer(cache_size=0, lemmatize=lemmatize)
+  assert [cached(text) for text in texts] == [uncached(text) for text in texts]
+  assert cached.normalize.cache_info().hits > 0
+
+@pytest.mark.parametrize("lemmatize", LEMMATIZE)
+def test_sharded_tokenization_same_of_serial(lemmatize):
+  texts = make_texts(1100)
+  tokenizer = LemmaStemTokenizer(lemmatize=lemmatize)
+  expected = [tokenizer(text) for text in texts]
+  assert tokenize_documents(texts, tokenizer, n_jobs=2, shard_size=100) == expected
+  assert tokenize_documents(texts, tokenizer, n_jobs=1) == expected
+
+def test_stop_words_removed_after_stem():
+  tokenizer = LemmaStemTokenizer(lemmatize=False)
+  #"having" and "others" are not stop words, their stems "have" and "other" are
+  assert tokenizer("having others voted") == ["vote"]
+
+def test_pickled_without_cache():
+  tokenizer = LemmaStemTokenizer(lemmatize=False)
+  tokenizer("running voted")
+  loaded = pickle.loads(pickle.dumps(tokenizer))
+  assert loaded.normalize.cache_info().currsize == 0
+  assert loaded("running voted") == tokenizer("running voted")
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_digits
+from sklearn.tree import DecisionTreeClassifier
+from mlpy.tree import HistogramTreeClassifier
+
+@pytest.fixture(scope="module")
+def digits():
+  X, Y = load_digits(return_X_y=True)
+  return X[:1200], Y[:1200], X[1200:], Y[1200:]
+
+#The digits pixels have 17 values: a bin for every value, then the candidate splits are the ones of DecisionTreeClassifier
+@pytest.mark.parametrize("criterion", ["gini", "entropy"])
+@pytest.mark.parametrize("max_depth", [3, 6, None])
+def test_same_tree_of_decision_tree(digits, criterion, max_depth):
+  X_train, Y_train, X_test, Y_test = digits
+  tree = HistogramTreeClassifier(criterion=criterion, max_depth=max_depth).fit(X_train, Y_train)
+  expected = DecisionTreeClassifier(criterion=criterion, max_depth=max_depth, random_state=0).fit(X_train, Y_train)
+  #the ties between splits with the same impurity can be broken in another way, then the trees are compared by their size
+  #(with entropy the ties of the subtrees can give a few nodes more or less)
+  assert tree.node_count == pytest.approx(expected.tree_.node_count, rel=0 if criterion == "gini" else 0.05)
+  assert tree.get_depth() == pytest.approx(expected.get_depth(), abs=0 if criterion == "gini" else 1)
+  assert np.mean(tree.predict(X_train) == Y_train) == pytest.approx(expected.score(X_train, Y_train), abs=0.01)
+  assert np.mean(tree.predict(X_test) == Y_test) == pytest.approx(expected.score(X_test, Y_test), abs=0.03)
+
+def test_first_levels_of_decision_tree(digits):
+  X_train, Y_train, X_test, _ = digits
+  tree = HistogramTreeClassifier(max_depth=3).fit(X_train, Y_train)
+  expected = DecisionTreeClassifier(max_depth=3, random_state=0).fit(X_train, Y_train)
+  assert tree.feature_[0] == expected.tree_.feature[0]
+  assert tree.threshold_[0] == expected.tree_.threshold[0]
+  np.testing.assert_array_equal(tree.predict(X_test), expected.predict(X_test))
+
+def test_sibling_subtraction(digits):
+  X_train, Y_train, X_test, _ = digits
+  subtracted = HistogramTreeClassifier(subtract=True).fit(X_train, Y_train)
+  counted = HistogramTreeClassifier(subtract=False).fit(X_train, Y_train)
+  for name in ("feature_", "threshold_bin_", "children_left_", "children_right_", "value_"):
+    np.testing.assert_array_equal(getattr(subtracted, name), getattr(counted, name))
+  np.testing.assert_array_equal(subtracted.predict_proba(X_test), counted.predict_proba(X_test))
+
+def test_constant_features():
+  Y = np.arange(10) % 2
+  tree = HistogramTreeClassifier().fit(np.zeros((10, 2)), Y)
+  assert tree.node_count == 1
+  np.testing.assert_allclose(tree.predict_proba(np.zeros((3, 2))), 0.5)
+  #only the feature with more values is split
+  X = np.column_stack([np.zeros(10), Y, np.full(10, 3.0)])
+  tree = HistogramTreeClassifier(max_features=1, random_state=0).fit(X, Y)
+  assert set(tree.feature_[tree.feature_ >= 0]) <= {1}
+  np.testing.assert_array_equal(HistogramTreeClassifier().fit(X, Y).predict(X), Y)
+
+def test_single_class():
+  X = np.arange(20, dtype=np.float64).reshape(10, 2)
+  tree = HistogramTreeClassifier().fit(X, np.full(10, "spam"))
+  assert tree.node_count == 1
+  np.testing.assert_array_equal(tree.predict(X), "spam")
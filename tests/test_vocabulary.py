@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from mlpy.vocabulary import save_vectorizer, load_vectorizer
+
+#Terms with the same first 8 bytes (the prefix of the search), terms shorter than the prefix, non ASCII terms
+TRAIN = [
+  "international internationalization internationally internal intern",
+  "the café serves crème brûlée, the naïve reviewer liked it",
+  "a short review: ok ok ok",
+  "representation representative representatives represent",
+  "",
+  "東京 reviews of the 東京 film festival"
+]
+TEST = [
+  "internationalizations internationally intern interns",
+  "crème brûlée and café au lait",
+  "unseen words only: zebra quokka",
+  "",
+  "representative representation ok the 東京"
+]
+
+VECTORIZERS = {
+  "count": lambda: CountVectorizer(),
+  "count_binary": lambda: CountVectorizer(binary=True, stop_words="english"),
+  "count_ngrams": lambda: CountVectorizer(ngram_range=(1, 2), strip_accents="unicode"),
+  "count_char": lambda: CountVectorizer(analyzer="char_wb", ngram_range=(2, 4)),
+  "count_stop_list": lambda: CountVectorizer(stop_words=["the", "ok"], lowercase=False),
+  "tfidf": lambda: TfidfVectorizer(),
+  "tfidf_sublinear": lambda: TfidfVectorizer(sublinear_tf=True, smooth_idf=False, stop_words="english"),
+  "tfidf_l1": lambda: TfidfVectorizer(norm="l1", ngram_range=(1, 2)),
+  "tfidf_without_idf": lambda: TfidfVectorizer(use_idf=False, norm=None),
+  "count_float32": lambda: CountVectorizer(dtype=np.float32),
+  "tfidf_float32": lambda: TfidfVectorizer(dtype=np.float32, sublinear_tf=True),
+  "tfidf_float32_without_idf": lambda: TfidfVectorizer(dtype=np.float32, use_idf=False)
+}
+
+@pytest.mark.parametrize("vectorizer", VECTORIZERS)
+def test_same_matrix_of_the_vectorizer(vectorizer, tmp_path):
+  fitted = VECTORIZERS[vectorizer]().fit(TRAIN)
+  save_vectorizer(tmp_path / "vectorizer.voc", fitted)
+  compact = load_vectorizer(tmp_path / "vectorizer.voc")
+  assert len(compact) == len(fitted.vocabulary_)
+  for texts in (TRAIN, TEST):
+    X = compact.transform(texts)
+    expected = fitted.transform(texts)
+    assert X.shape == expected.shape
+    assert X.dtype == expected.dtype
+    np.testing.assert_allclose(X.toarray(), expected.toarray(), rtol=1e-6 if X.dtype == np.float32 else 1e-7, atol=1e-12)
+
+def test_lookup_of_every_term(tmp_path):
+  fitted = CountVectorizer(ngram_range=(1, 2)).fit(TRAIN)
+  save_vectorizer(tmp_path / "vectorizer.voc", fitted)
+  compact = load_vectorizer(tmp_path / "vectorizer.voc", mmap_mode=False)
+  terms = list(fitted.vocabulary_)
+  np.testing.assert_array_equal(compact.lookup(terms), [fitted.vocabulary_[term] for term in terms])
+  missing = ["internationa", "internationalizations", "", "zebra", "東", "crème brûlé"]
+  np.testing.assert_array_equal(compact.lookup(missing), -1)
+
+def test_custom_tokenizer_not_saved(tmp_path):
+  fitted = CountVectorizer(tokenizer=str.split, token_pattern=None).fit(TRAIN)
+  with pytest.raises(ValueError):
+    save_vectorizer(tmp_path / "vectorizer.voc", fitted)